@@ -37,10 +37,12 @@ Endpoints:
 from fastapi import APIRouter, HTTPException, Query, Depends
 from typing import Optional, List, Literal
 from pydantic import BaseModel, Field
-from datetime import datetime, date
+from datetime import datetime, date, timedelta
 from decimal import Decimal
 import psycopg2
 from psycopg2.extras import RealDictCursor
+from app.database import get_connection, release_connection
+from app.cache import invalidate_bet_caches
 
 # Initialize router
 router = APIRouter(prefix="/bankroll", tags=["Bankroll Manager"])
@@ -238,20 +240,12 @@ class ParlayResponse(BaseModel):
 # =========================================================
 
 def get_db():
-    """Database connection dependency."""
-    import os
-    conn = psycopg2.connect(
-        host=os.environ["PGHOST"],
-        dbname=os.environ["PGDATABASE"],
-        user=os.environ["PGUSER"],
-        password=os.environ["PGPASSWORD"],
-        port=os.environ.get("PGPORT", 5432),
-        cursor_factory=RealDictCursor
-    )
+    """Database connection dependency (borrowed from the shared pool)."""
+    conn = get_connection()
     try:
         yield conn
     finally:
-        conn.close()
+        release_connection(conn)
 
 # =========================================================
 # HELPER FUNCTIONS
@@ -268,6 +262,13 @@ def calculate_payout(odds_american: int, stake: Decimal) -> Decimal:
     
     return stake + profit
 
+def window_start(days: int, from_midnight: bool = True) -> datetime:
+    """Start of a `days`-long analytics window, bound as a query parameter."""
+    start = datetime.now() - timedelta(days=days)
+    if from_midnight:
+        start = start.replace(hour=0, minute=0, second=0, microsecond=0)
+    return start
+
 def get_current_streak(cursor, user_id: int):
     """Calculate current betting streak."""
     cursor.execute("""
@@ -356,7 +357,7 @@ def get_sport_mix(legs: List[ParlayLeg]) -> str:
 # =========================================================
 
 @router.post("/accounts", response_model=BankrollAccount)
-async def create_account(
+def create_account(
     account: BankrollAccountCreate,
     user_id: int = Query(default=1),
     conn = Depends(get_db)
@@ -378,6 +379,7 @@ async def create_account(
         
         result = cursor.fetchone()
         conn.commit()
+        invalidate_bet_caches()
         cursor.close()
         
         return result
@@ -387,7 +389,7 @@ async def create_account(
         raise HTTPException(status_code=500, detail=f"Failed to create account: {str(e)}")
 
 @router.get("/accounts", response_model=List[BankrollAccount])
-async def get_accounts(
+def get_accounts(
     user_id: int = Query(default=1),
     conn = Depends(get_db)
 ):
@@ -412,7 +414,7 @@ async def get_accounts(
     return results
 
 @router.put("/accounts/{account_id}", response_model=BankrollAccount)
-async def update_account(
+def update_account(
     account_id: int,
     account_update: BankrollAccountUpdate,
     conn = Depends(get_db)
@@ -446,6 +448,7 @@ async def update_account(
         """, [account_id, result['user_id'], account_update.current_balance, account_update.current_balance])
         
         conn.commit()
+        invalidate_bet_caches()
         cursor.close()
         
         return result
@@ -457,7 +460,7 @@ async def update_account(
         raise HTTPException(status_code=500, detail=f"Failed to update account: {str(e)}")
 
 @router.delete("/accounts/{account_id}")
-async def delete_account(
+def delete_account(
     account_id: int,
     conn = Depends(get_db)
 ):
@@ -477,6 +480,7 @@ async def delete_account(
             raise HTTPException(status_code=404, detail="Account not found")
         
         conn.commit()
+        invalidate_bet_caches()
         cursor.close()
         
         return {"message": "Account deleted successfully", "account_id": account_id}
@@ -492,7 +496,7 @@ async def delete_account(
 # =========================================================
 
 @router.post("/bets", response_model=Bet)
-async def create_bet(
+def create_bet(
     bet: BetCreate,
     user_id: int = Query(default=1),
     conn = Depends(get_db)
@@ -551,6 +555,7 @@ async def create_bet(
         result = cursor.fetchone()
         
         conn.commit()
+        invalidate_bet_caches()
         cursor.close()
         
         return result
@@ -560,7 +565,7 @@ async def create_bet(
         raise HTTPException(status_code=500, detail=f"Failed to create bet: {str(e)}")
 
 @router.get("/bets", response_model=dict)
-async def get_bets(
+def get_bets(
     user_id: int = Query(default=1),
     status: Optional[Literal["pending", "won", "lost", "push", "cancelled"]] = None,
     account_id: Optional[int] = None,
@@ -656,7 +661,7 @@ async def get_bets(
     }
 
 @router.get("/bets/{bet_id}", response_model=Bet)
-async def get_bet(
+def get_bet(
     bet_id: int,
     conn = Depends(get_db)
 ):
@@ -678,7 +683,7 @@ async def get_bet(
     return result
 
 @router.put("/bets/{bet_id}", response_model=Bet)
-async def update_bet(
+def update_bet(
     bet_id: int,
     bet_update: BetUpdate,
     conn = Depends(get_db)
@@ -751,6 +756,7 @@ async def update_bet(
             raise HTTPException(status_code=404, detail="Bet not found")
         
         conn.commit()
+        invalidate_bet_caches()
         
         # Fetch updated bet
         cursor.execute("SELECT * FROM v_recent_bets WHERE bet_id = %s", [bet_id])
@@ -766,7 +772,7 @@ async def update_bet(
         raise HTTPException(status_code=500, detail=f"Failed to update bet: {str(e)}")
 
 @router.delete("/bets/{bet_id}")
-async def delete_bet(
+def delete_bet(
     bet_id: int,
     conn = Depends(get_db)
 ):
@@ -807,6 +813,7 @@ async def delete_bet(
         cursor.execute("DELETE FROM bets WHERE bet_id = %s", [bet_id])
         
         conn.commit()
+        invalidate_bet_caches()
         cursor.close()
         
         return {"message": "Bet deleted successfully", "bet_id": bet_id}
@@ -818,7 +825,7 @@ async def delete_bet(
         raise HTTPException(status_code=500, detail=f"Failed to delete bet: {str(e)}")
 
 @router.post("/bets/{bet_id}/settle", response_model=Bet)
-async def settle_bet(
+def settle_bet(
     bet_id: int,
     settlement: BetSettle,
     conn = Depends(get_db)
@@ -896,6 +903,7 @@ async def settle_bet(
                 ])
         
         conn.commit()
+        invalidate_bet_caches()
         
         # Check and create alerts after settling
         check_and_create_alerts(cursor, bet['user_id'], bet_id, conn)
@@ -918,7 +926,7 @@ async def settle_bet(
 # =========================================================
 
 @router.get("/analytics/overview", response_model=BankrollOverview)
-async def get_overview(
+def get_overview(
     user_id: int = Query(default=1),
     days: int = Query(default=30, ge=1, le=365),
     conn = Depends(get_db)
@@ -929,6 +937,7 @@ async def get_overview(
     **Use Case:** Main dashboard stats
     **Returns:** All key metrics filtered by date range
     """
+    cutoff = window_start(days)
     cursor = conn.cursor()
     
     cursor.execute("""
@@ -959,8 +968,8 @@ async def get_overview(
             ROUND(COALESCE(AVG(stake_amount), 0), 2) as avg_bet_size
         FROM bets
         WHERE user_id = %s
-        AND placed_at >= CURRENT_DATE - INTERVAL '%s days'
-    """, [user_id, days])
+        AND placed_at >= %s
+    """, [user_id, cutoff])
     
     bet_stats = cursor.fetchone() or {
         'total_bets': 0, 'pending_bets': 0, 'won_bets': 0, 
@@ -975,7 +984,7 @@ async def get_overview(
             WHERE user_id = %s
             AND status IN ('won', 'lost')
             AND settled_at IS NOT NULL
-            AND placed_at >= CURRENT_DATE - INTERVAL '%s days'
+            AND placed_at >= %s
             ORDER BY settled_at DESC
             LIMIT 20
         ),
@@ -997,7 +1006,7 @@ async def get_overview(
         SELECT status, streak_length
         FROM streak_calc
         WHERE streak_num = 1
-    """, [user_id, days])
+    """, [user_id, cutoff])
     
     current_streak = cursor.fetchone()
     
@@ -1021,8 +1030,8 @@ async def get_overview(
         "current_streak": current_streak
     }
 
-@router.get("/analytics/chart-data", response_model=List[ChartDataPoint])
-async def get_chart_data(
+@router.get("/analytics/chart-data")
+def get_chart_data(
     user_id: int = Query(default=1),
     days: int = Query(default=30, ge=1, le=365),
     conn = Depends(get_db)
@@ -1076,8 +1085,8 @@ async def get_chart_data(
     
     return results
 
-@router.get("/analytics/by-bookmaker", response_model=List[BookmakerPerformance])
-async def get_bookmaker_performance(
+@router.get("/analytics/by-bookmaker")
+def get_bookmaker_performance(
     user_id: int = Query(default=1),
     days: int = Query(default=30, ge=1, le=365),
     conn = Depends(get_db)
@@ -1088,6 +1097,7 @@ async def get_bookmaker_performance(
     **Use Case:** Compare bookmaker profitability
     **Returns:** Stats per bookmaker filtered by date range
     """
+    cutoff = window_start(days)
     cursor = conn.cursor()
     
     cursor.execute("""
@@ -1107,20 +1117,20 @@ async def get_bookmaker_performance(
             COALESCE(SUM(b.profit_loss) FILTER (WHERE b.status IN ('won', 'lost', 'push')), 0) as total_profit_loss
         FROM bankroll_accounts ba
         LEFT JOIN bets b ON ba.account_id = b.account_id 
-            AND b.placed_at >= CURRENT_DATE - INTERVAL '%s days'
+            AND b.placed_at >= %s
         WHERE ba.user_id = %s
         GROUP BY ba.bookmaker_name
         HAVING COUNT(b.bet_id) > 0
         ORDER BY total_profit_loss DESC
-    """, [days, user_id])
+    """, [cutoff, user_id])
     
     results = cursor.fetchall()
     cursor.close()
     
     return results
 
-@router.get("/analytics/by-market", response_model=List[MarketPerformance])
-async def get_market_performance(
+@router.get("/analytics/by-market")
+def get_market_performance(
     user_id: int = Query(default=1),
     days: int = Query(default=30, ge=1, le=365),
     conn = Depends(get_db)
@@ -1131,6 +1141,7 @@ async def get_market_performance(
     **Use Case:** Identify best/worst bet types
     **Returns:** Stats per market filtered by date range
     """
+    cutoff = window_start(days)
     cursor = conn.cursor()
     
     cursor.execute("""
@@ -1151,11 +1162,11 @@ async def get_market_performance(
             ROUND(COALESCE(AVG(stake_amount), 0), 2) as avg_stake
         FROM bets
         WHERE user_id = %s
-        AND placed_at >= CURRENT_DATE - INTERVAL '%s days'
+        AND placed_at >= %s
         AND market_key IS NOT NULL
         GROUP BY market_key
         ORDER BY total_profit_loss DESC
-    """, [user_id, days])
+    """, [user_id, cutoff])
     
     results = cursor.fetchall()
     cursor.close()
@@ -1171,8 +1182,8 @@ async def get_market_performance(
 # TRANSACTIONS ENDPOINT
 # =========================================================
 
-@router.get("/transactions", response_model=List[Transaction])
-async def get_transactions(
+@router.get("/transactions")
+def get_transactions(
     user_id: int = Query(default=1),
     account_id: Optional[int] = None,
     transaction_type: Optional[str] = None,
@@ -1213,7 +1224,7 @@ async def get_transactions(
     return results
 
 @router.post("/goals")
-async def create_goal(
+def create_goal(
     goal_data: GoalCreate,
     user_id: int = Query(default=1),
     conn = Depends(get_db)
@@ -1257,7 +1268,7 @@ async def create_goal(
         raise HTTPException(status_code=500, detail=f"Failed to create goal: {str(e)}")
 
 @router.get("/goals")
-async def get_goals(
+def get_goals(
     user_id: int = Query(default=1),
     status: str = Query(default='active'),
     conn = Depends(get_db)
@@ -1294,7 +1305,7 @@ async def get_goals(
         raise HTTPException(status_code=500, detail=f"Failed to get goals: {str(e)}")
 
 @router.get("/goals/{goal_id}")
-async def get_goal(
+def get_goal(
     goal_id: int,
     conn = Depends(get_db)
 ):
@@ -1327,7 +1338,7 @@ async def get_goal(
         raise HTTPException(status_code=500, detail=f"Failed to get goal: {str(e)}")
 
 @router.put("/goals/{goal_id}")
-async def update_goal(
+def update_goal(
     goal_id: int,
     goal_data: GoalUpdate,
     conn = Depends(get_db)
@@ -1341,42 +1352,35 @@ async def update_goal(
     cursor = conn.cursor()
     
     try:
-        update_fields = []
-        params = []
-        
-        if goal_data.goal_amount is not None:
-            update_fields.append("goal_amount = %s")
-            params.append(goal_data.goal_amount)
-        
-        if goal_data.end_date is not None:
-            update_fields.append("end_date = %s")
-            params.append(goal_data.end_date)
-        
-        if goal_data.description is not None:
-            update_fields.append("description = %s")
-            params.append(goal_data.description)
-        
-        if goal_data.status is not None:
-            update_fields.append("status = %s")
-            params.append(goal_data.status)
-            
-            if goal_data.status == 'completed':
-                update_fields.append("completed_at = NOW()")
-        
-        if not update_fields:
+        if all(value is None for value in (
+            goal_data.goal_amount, goal_data.end_date,
+            goal_data.description, goal_data.status
+        )):
             raise HTTPException(status_code=400, detail="No fields to update")
         
-        params.append(goal_id)
-        query = f"""
+        # Single static statement: NULL params keep the current value
+        cursor.execute('''
             UPDATE user_goals 
-            SET {', '.join(update_fields)}
-            WHERE goal_id = %s
+            SET goal_amount = COALESCE(%(goal_amount)s, goal_amount),
+                end_date = COALESCE(%(end_date)s::date, end_date),
+                description = COALESCE(%(description)s, description),
+                status = COALESCE(%(status)s, status),
+                completed_at = CASE 
+                    WHEN %(status)s = 'completed' THEN NOW() 
+                    ELSE completed_at 
+                END,
+                updated_at = NOW()
+            WHERE goal_id = %(goal_id)s
             RETURNING goal_id, user_id, goal_type, goal_amount, 
                       start_date, end_date, status, description, 
                       created_at, completed_at
-        """
-        
-        cursor.execute(query, params)
+        ''', {
+            "goal_id": goal_id,
+            "goal_amount": goal_data.goal_amount,
+            "end_date": goal_data.end_date,
+            "description": goal_data.description,
+            "status": goal_data.status
+        })
         goal = cursor.fetchone()
         
         if not goal:
@@ -1395,7 +1399,7 @@ async def update_goal(
         raise HTTPException(status_code=500, detail=f"Failed to update goal: {str(e)}")
 
 @router.delete("/goals/{goal_id}")
-async def delete_goal(
+def delete_goal(
     goal_id: int,
     conn = Depends(get_db)
 ):
@@ -1432,7 +1436,7 @@ async def delete_goal(
         raise HTTPException(status_code=500, detail=f"Failed to delete goal: {str(e)}")
 
 @router.get("/analytics/time-analysis")
-async def get_time_analysis(
+def get_time_analysis(
     user_id: int = Query(default=1),
     days: int = Query(default=30, ge=7, le=365),
     conn = Depends(get_db)
@@ -1443,6 +1447,7 @@ async def get_time_analysis(
     **Use Case:** Time Analysis section
     **Returns:** Performance breakdown by day/time
     '''
+    cutoff = window_start(days)
     cursor = conn.cursor()
     
     try:
@@ -1474,10 +1479,10 @@ async def get_time_analysis(
                 COALESCE(SUM(stake_amount), 0) as total_staked
             FROM bets
             WHERE user_id = %s
-            AND placed_at >= CURRENT_DATE - INTERVAL '%s days'
+            AND placed_at >= %s
             GROUP BY EXTRACT(DOW FROM placed_at)
             ORDER BY day_of_week
-        ''', [user_id, days])
+        ''', [user_id, cutoff])
         
         day_of_week_data = cursor.fetchall()
         
@@ -1511,7 +1516,7 @@ async def get_time_analysis(
                 COALESCE(SUM(stake_amount), 0) as total_staked
             FROM bets
             WHERE user_id = %s
-            AND placed_at >= CURRENT_DATE - INTERVAL '%s days'
+            AND placed_at >= %s
             GROUP BY 
                 CASE 
                     WHEN EXTRACT(HOUR FROM placed_at) BETWEEN 6 AND 11 THEN 'Morning'
@@ -1526,7 +1531,7 @@ async def get_time_analysis(
                     ELSE 4
                 END
             ORDER BY period_order
-        ''', [user_id, days])
+        ''', [user_id, cutoff])
         
         time_of_day_data = cursor.fetchall()
         
@@ -1547,7 +1552,7 @@ async def get_time_analysis(
                     COUNT(*) as bet_count
                 FROM bets
                 WHERE user_id = %s
-                AND placed_at >= CURRENT_DATE - INTERVAL '%s days'
+                AND placed_at >= %s
                 GROUP BY EXTRACT(DOW FROM placed_at)
             )
             SELECT day_name, profit_loss, bet_count
@@ -1555,7 +1560,7 @@ async def get_time_analysis(
             WHERE bet_count >= 3  -- At least 3 bets for statistical relevance
             ORDER BY profit_loss DESC
             LIMIT 1
-        ''', [user_id, days])
+        ''', [user_id, cutoff])
         
         best_day = cursor.fetchone()
         
@@ -1572,7 +1577,7 @@ async def get_time_analysis(
                     COUNT(*) as bet_count
                 FROM bets
                 WHERE user_id = %s
-                AND placed_at >= CURRENT_DATE - INTERVAL '%s days'
+                AND placed_at >= %s
                 GROUP BY 
                     CASE 
                         WHEN EXTRACT(HOUR FROM placed_at) BETWEEN 6 AND 11 THEN 'Morning'
@@ -1586,7 +1591,7 @@ async def get_time_analysis(
             WHERE bet_count >= 3
             ORDER BY profit_loss DESC
             LIMIT 1
-        ''', [user_id, days])
+        ''', [user_id, cutoff])
         
         best_time = cursor.fetchone()
         
@@ -1606,7 +1611,7 @@ async def get_time_analysis(
         raise HTTPException(status_code=500, detail=f"Failed to get time analysis: {str(e)}")
 
 @router.get("/analytics/market-deep-dive")
-async def get_market_deep_dive(
+def get_market_deep_dive(
     user_id: int = Query(default=1),
     days: int = Query(default=30, ge=7, le=365),
     conn = Depends(get_db)
@@ -1617,6 +1622,7 @@ async def get_market_deep_dive(
     **Use Case:** Market Performance section
     **Returns:** Comprehensive market statistics
     '''
+    cutoff = window_start(days)
     cursor = conn.cursor()
     
     try:
@@ -1655,58 +1661,35 @@ async def get_market_deep_dive(
                 2) as avg_loss_amount
             FROM bets
             WHERE user_id = %s
-            AND placed_at >= CURRENT_DATE - INTERVAL '%s days'
+            AND placed_at >= %s
             AND market_key IS NOT NULL
             GROUP BY market_key
             ORDER BY total_profit_loss DESC
-        ''', [user_id, days])
+        ''', [user_id, cutoff])
         
         markets = cursor.fetchall()
         
-        # Get best/worst markets
-        cursor.execute('''
-            WITH market_stats AS (
-                SELECT 
-                    market_key,
-                    COALESCE(SUM(profit_loss) FILTER (WHERE status IN ('won', 'lost', 'push')), 0) as profit_loss,
-                    COUNT(*) as bet_count
-                FROM bets
-                WHERE user_id = %s
-                AND placed_at >= CURRENT_DATE - INTERVAL '%s days'
-                AND market_key IS NOT NULL
-                GROUP BY market_key
-            )
-            SELECT market_key, profit_loss, bet_count
-            FROM market_stats
-            WHERE bet_count >= 3
-            AND profit_loss > 0  -- Only positive P/L
-            ORDER BY profit_loss DESC
-            LIMIT 3
-        ''', [user_id, days])
-        
-        best_markets = cursor.fetchall()
+        # Derive best/worst markets from the aggregate above (min 3 bets)
+        qualified = [
+            {
+                "market_key": m['market_key'],
+                "profit_loss": m['total_profit_loss'],
+                "bet_count": m['total_bets']
+            }
+            for m in markets
+            if m['total_bets'] >= 3
+        ]
         
-        cursor.execute('''
-            WITH market_stats AS (
-                SELECT 
-                    market_key,
-                    COALESCE(SUM(profit_loss) FILTER (WHERE status IN ('won', 'lost', 'push')), 0) as profit_loss,
-                    COUNT(*) as bet_count
-                FROM bets
-                WHERE user_id = %s
-                AND placed_at >= CURRENT_DATE - INTERVAL '%s days'
-                AND market_key IS NOT NULL
-                GROUP BY market_key
-            )
-            SELECT market_key, profit_loss, bet_count
-            FROM market_stats
-            WHERE bet_count >= 3
-            AND profit_loss < 0  -- Only negative P/L
-            ORDER BY profit_loss ASC
-            LIMIT 3
-        ''', [user_id, days])
+        best_markets = sorted(
+            (m for m in qualified if m['profit_loss'] > 0),  # Only positive P/L
+            key=lambda m: m['profit_loss'],
+            reverse=True
+        )[:3]
         
-        worst_markets = cursor.fetchall()
+        worst_markets = sorted(
+            (m for m in qualified if m['profit_loss'] < 0),  # Only negative P/L
+            key=lambda m: m['profit_loss']
+        )[:3]
         
         cursor.close()
         
@@ -1721,7 +1704,7 @@ async def get_market_deep_dive(
         raise HTTPException(status_code=500, detail=f"Failed to get market analysis: {str(e)}")
 
 @router.get("/analytics/insights")
-async def get_insights(
+def get_insights(
     user_id: int = Query(default=1),
     days: int = Query(default=30, ge=7, le=365),
     conn = Depends(get_db)
@@ -1732,6 +1715,7 @@ async def get_insights(
     **Use Case:** Insights section
     **Returns:** Array of actionable insights
     '''
+    cutoff = window_start(days)
     cursor = conn.cursor()
     insights = []
     
@@ -1753,8 +1737,8 @@ async def get_insights(
                 1) as win_rate
             FROM bets
             WHERE user_id = %s
-            AND placed_at >= CURRENT_DATE - INTERVAL '%s days'
-        ''', [user_id, days])
+            AND placed_at >= %s
+        ''', [user_id, cutoff])
         
         overall = cursor.fetchone()
         
@@ -1852,12 +1836,12 @@ async def get_insights(
                 1) as win_rate
             FROM bets
             WHERE user_id = %s
-            AND placed_at >= CURRENT_DATE - INTERVAL '%s days'
+            AND placed_at >= %s
             GROUP BY EXTRACT(DOW FROM placed_at)
             HAVING COUNT(*) >= 3
             ORDER BY profit_loss DESC
             LIMIT 1
-        ''', [user_id, days])
+        ''', [user_id, cutoff])
         
         best_day = cursor.fetchone()
         
@@ -1886,12 +1870,12 @@ async def get_insights(
                 COUNT(*) as bet_count
             FROM bets
             WHERE user_id = %s
-            AND placed_at >= CURRENT_DATE - INTERVAL '%s days'
+            AND placed_at >= %s
             GROUP BY EXTRACT(DOW FROM placed_at)
             HAVING COUNT(*) >= 3
             ORDER BY profit_loss ASC
             LIMIT 1
-        ''', [user_id, days])
+        ''', [user_id, cutoff])
         
         worst_day = cursor.fetchone()
         
@@ -1920,13 +1904,13 @@ async def get_insights(
                 1) as win_rate
             FROM bets
             WHERE user_id = %s
-            AND placed_at >= CURRENT_DATE - INTERVAL '%s days'
+            AND placed_at >= %s
             AND market_key IS NOT NULL
             GROUP BY market_key
             HAVING COUNT(*) >= 5
             ORDER BY profit_loss DESC
             LIMIT 1
-        ''', [user_id, days])
+        ''', [user_id, cutoff])
         
         best_market = cursor.fetchone()
         
@@ -1960,8 +1944,8 @@ async def get_insights(
             SELECT ROUND(AVG(stake_amount), 2) as avg_stake
             FROM bets
             WHERE user_id = %s
-            AND placed_at >= CURRENT_DATE - INTERVAL '%s days'
-        ''', [user_id, days])
+            AND placed_at >= %s
+        ''', [user_id, cutoff])
         
         avg_stake = cursor.fetchone()
         
@@ -2042,7 +2026,7 @@ async def get_insights(
         raise HTTPException(status_code=500, detail=f"Failed to generate insights: {str(e)}")
     
 @router.get("/alerts")
-async def get_alerts(
+def get_alerts(
     user_id: int = Query(default=1),
     read: str = Query(default='false'),
     limit: int = Query(default=50, le=100),
@@ -2083,7 +2067,7 @@ async def get_alerts(
         raise HTTPException(status_code=500, detail=f"Failed to get alerts: {str(e)}")
 
 @router.get("/alerts/unread-count")
-async def get_unread_count(
+def get_unread_count(
     user_id: int = Query(default=1),
     conn = Depends(get_db)
 ):
@@ -2113,7 +2097,7 @@ async def get_unread_count(
         raise HTTPException(status_code=500, detail=f"Failed to get unread count: {str(e)}")
 
 @router.put("/alerts/{alert_id}/read")
-async def mark_alert_read(
+def mark_alert_read(
     alert_id: int,
     conn = Depends(get_db)
 ):
@@ -2151,7 +2135,7 @@ async def mark_alert_read(
         raise HTTPException(status_code=500, detail=f"Failed to mark alert as read: {str(e)}")
 
 @router.put("/alerts/mark-all-read")
-async def mark_all_read(
+def mark_all_read(
     user_id: int = Query(default=1),
     conn = Depends(get_db)
 ):
@@ -2186,7 +2170,7 @@ async def mark_all_read(
         raise HTTPException(status_code=500, detail=f"Failed to mark all as read: {str(e)}")
 
 @router.delete("/alerts/{alert_id}")
-async def delete_alert(
+def delete_alert(
     alert_id: int,
     conn = Depends(get_db)
 ):
@@ -2403,7 +2387,7 @@ def create_alert(cursor, user_id, alert_type, message, conn):
 # =========================================================
 
 @router.post("/parlays")
-async def create_parlay(
+def create_parlay(
     parlay: ParlayCreate,
     user_id: int = Query(default=1),
     conn = Depends(get_db)
@@ -2498,6 +2482,7 @@ async def create_parlay(
         ])
         
         conn.commit()
+        invalidate_bet_caches()
         
         # Fetch created parlay
         cursor.execute("""
@@ -2520,7 +2505,7 @@ async def create_parlay(
         raise HTTPException(500, f"Failed to create parlay: {str(e)}")
 
 @router.get("/parlays")
-async def get_parlays(
+def get_parlays(
     user_id: int = Query(default=1),
     status: Optional[str] = Query(default=None),
     account_id: Optional[int] = Query(default=None),
@@ -2564,7 +2549,7 @@ async def get_parlays(
 
 
 @router.get("/parlays/{parlay_id}")
-async def get_parlay(
+def get_parlay(
     parlay_id: int,
     conn = Depends(get_db)
 ):
@@ -2593,7 +2578,7 @@ async def get_parlay(
         raise HTTPException(500, f"Failed to fetch parlay: {str(e)}")
 
 @router.post("/parlays/{parlay_id}/settle")
-async def settle_parlay(
+def settle_parlay(
     parlay_id: int,
     leg_results: dict,
     conn = Depends(get_db)
@@ -2710,6 +2695,7 @@ async def settle_parlay(
             ])
         
         conn.commit()
+        invalidate_bet_caches()
         
         # Return updated parlay
         cursor.execute("""
@@ -2733,7 +2719,7 @@ async def settle_parlay(
 
 
 @router.delete("/parlays/{parlay_id}")
-async def delete_parlay(
+def delete_parlay(
     parlay_id: int,
     conn = Depends(get_db)
 ):
@@ -2784,6 +2770,7 @@ async def delete_parlay(
         """, [parlay_id])
         
         conn.commit()
+        invalidate_bet_caches()
         cursor.close()
         
         return {"message": "Parlay deleted", "refunded": float(parlay['stake_amount'])}
@@ -2802,7 +2789,7 @@ async def delete_parlay(
 # =========================================================
 
 @router.get("/analytics/by-sport")
-async def get_analytics_by_sport(
+def get_analytics_by_sport(
     user_id: int = Query(default=1),
     days: int = Query(default=30, le=365),
     conn = Depends(get_db)
@@ -2815,6 +2802,7 @@ async def get_analytics_by_sport(
     - Total staked, profit/loss
     - Best/worst performing sport
     """
+    cutoff = window_start(days, from_midnight=False)
     cursor = None
     try:
         cursor = conn.cursor()
@@ -2855,13 +2843,13 @@ async def get_analytics_by_sport(
                 
             FROM bets
             WHERE user_id = %s
-            AND placed_at >= NOW() - INTERVAL '%s days'
+            AND placed_at >= %s
             AND parlay_id IS NULL  -- Exclude parlay legs
             GROUP BY sport
             ORDER BY profit_loss DESC
         """
         
-        cursor.execute(query, [user_id, days])
+        cursor.execute(query, [user_id, cutoff])
         by_sport = cursor.fetchall()
         
         # Calculate totals
@@ -2917,7 +2905,7 @@ async def get_analytics_by_sport(
 
 
 @router.get("/analytics/parlay-stats")
-async def get_parlay_stats(
+def get_parlay_stats(
     user_id: int = Query(default=1),
     days: int = Query(default=30, le=365),
     conn = Depends(get_db)
@@ -2931,6 +2919,7 @@ async def get_parlay_stats(
     - Single sport vs multi-sport performance
     - Average odds and payouts
     """
+    cutoff = window_start(days, from_midnight=False)
     cursor = None
     try:
         cursor = conn.cursor()
@@ -2961,8 +2950,8 @@ async def get_parlay_stats(
                 
             FROM parlays
             WHERE user_id = %s
-            AND placed_at >= NOW() - INTERVAL '%s days'
-        """, [user_id, days])
+            AND placed_at >= %s
+        """, [user_id, cutoff])
         
         overall = cursor.fetchone()
         
@@ -2983,10 +2972,10 @@ async def get_parlay_stats(
                 COALESCE(SUM(profit_loss), 0) as profit_loss
             FROM parlays
             WHERE user_id = %s
-            AND placed_at >= NOW() - INTERVAL '%s days'
+            AND placed_at >= %s
             GROUP BY total_legs
             ORDER BY total_legs
-        """, [user_id, days])
+        """, [user_id, cutoff])
         
         by_leg_count = cursor.fetchall()
         
@@ -3010,9 +2999,9 @@ async def get_parlay_stats(
                 COALESCE(SUM(profit_loss), 0) as profit_loss
             FROM parlays
             WHERE user_id = %s
-            AND placed_at >= NOW() - INTERVAL '%s days'
+            AND placed_at >= %s
             GROUP BY parlay_type
-        """, [user_id, days])
+        """, [user_id, cutoff])
         
         by_type = cursor.fetchall()
         
@@ -3063,7 +3052,7 @@ async def get_parlay_stats(
 
 
 @router.get("/analytics/sport-trends")
-async def get_sport_trends(
+def get_sport_trends(
     user_id: int = Query(default=1),
     sport: str = Query(default=None),
     days: int = Query(default=90, le=365),
@@ -3074,6 +3063,7 @@ async def get_sport_trends(
     
     Used for sport-specific trend charts.
     """
+    cutoff = window_start(days, from_midnight=False)
     cursor = None
     try:
         cursor = conn.cursor()
@@ -3096,10 +3086,10 @@ async def get_sport_trends(
                 COUNT(*) FILTER (WHERE status = 'won') as won_count
             FROM bets
             WHERE {where_clause}
-            AND placed_at >= NOW() - INTERVAL '%s days'
+            AND placed_at >= %s
             GROUP BY DATE(placed_at), sport
             ORDER BY date DESC, sport
-        """, params + [days])
+        """, params + [cutoff])
         
         trends = cursor.fetchall()
         cursor.close()
@@ -0,0 +1,49 @@
+# smartline-api/app/cache.py
+"""
+In-process TTL caches for read-heavy dashboard endpoints.
+
+Entries are keyed by the request's parameter tuple (user_id first) and are
+dropped wholesale whenever a bet or account is written. The player
+statistics caches only change with the stats ETL, which runs outside this
+process, so they simply expire. export_summary reads mv_bet_summary_daily,
+which pg_cron refreshes every minute, so dropping it on a write would only
+re-cache the same stale roll-up; it expires instead.
+"""
+import threading
+from cachetools import TTLCache
+
+CACHES = {
+    "filter_options": TTLCache(maxsize=2048, ttl=300),
+    # Matches the roll-up's refresh interval: /summary may lag writes ~2 min
+    "export_summary": TTLCache(maxsize=2048, ttl=60),
+    "tax_report": TTLCache(maxsize=256, ttl=60),
+    "player_games": TTLCache(maxsize=1024, ttl=300),
+    "player_rankings": TTLCache(maxsize=1024, ttl=300),
+    "stat_leaders": TTLCache(maxsize=512, ttl=300),
+    "player_summary": TTLCache(maxsize=1024, ttl=300),
+}
+
+# Caches derived from bets / bankroll accounts
+BET_CACHES = ("filter_options", "tax_report")
+
+CACHE_STATS = {name: {"hits": 0, "misses": 0} for name in CACHES}
+
+# Sync endpoints run in FastAPI's threadpool; TTLCache is not thread-safe
+_LOCK = threading.Lock()
+
+def cache_get(name: str, key: tuple):
+    """Return the cached value for key, or None on a miss."""
+    with _LOCK:
+        value = CACHES[name].get(key)
+        CACHE_STATS[name]["hits" if value is not None else "misses"] += 1
+    return value
+
+def cache_set(name: str, key: tuple, value):
+    with _LOCK:
+        CACHES[name][key] = value
+
+def invalidate_bet_caches():
+    """Drop cached bet-derived results after a bet/account write."""
+    with _LOCK:
+        for name in BET_CACHES:
+            CACHES[name].clear()
@@ -1,67 +1,156 @@
-from app.database import get_connection
+import os
+import re
+from psycopg2 import errors
+from app.database import get_connection, release_connection, traced_execute
 
-def backtest_strategy(strategy):
-    filters = strategy.filters
-    stake = strategy.stake
-
-    conditions = []
-    params = []
-
-    if filters.side:
-        conditions.append("side = %s")
-        params.append(filters.side)
-
-    if filters.spread_min is not None:
-        conditions.append("spread >= %s")
-        params.append(filters.spread_min)
-
-    if filters.spread_max is not None:
-        conditions.append("spread <= %s")
-        params.append(filters.spread_max)
-
-    if filters.movement_signal:
-        conditions.append("movement_signal = %s")
-        params.append(filters.movement_signal)
-
-    if filters.injury_diff_min is not None:
-        conditions.append("injury_diff >= %s")
-        params.append(filters.injury_diff_min)
-
-    if filters.injury_diff_max is not None:
-        conditions.append("injury_diff <= %s")
-        params.append(filters.injury_diff_max)
-
-    if filters.book:
-        conditions.append("book = %s")
-        params.append(filters.book)
-
-    where_clause = " AND ".join(conditions)
-    if where_clause:
-        where_clause = "WHERE " + where_clause
-
-    query = f"""
-        SELECT *,
-        CASE
-            WHEN bet_result = 'win' AND price_american < 0
-                THEN %s * (100.0 / ABS(price_american))
-            WHEN bet_result = 'win' AND price_american > 0
-                THEN %s * (price_american / 100.0)
-            WHEN bet_result = 'loss'
-                THEN -%s
-            ELSE 0
-        END AS profit
+# PREPARE/EXECUTE is session state; leave off behind a transaction-mode pooler
+USE_PREPARED = os.getenv("PG_PREPARE_STATEMENTS", "0") == "1"
+
+PROFIT_SQL = """
+    CASE
+        WHEN bet_result = 'win' AND price_american < 0
+            THEN p.stake * (100.0 / ABS(price_american))
+        WHEN bet_result = 'win' AND price_american > 0
+            THEN p.stake * (price_american / 100.0)
+        WHEN bet_result = 'loss'
+            THEN -p.stake
+        ELSE 0
+    END
+"""
+
+# Every filter is always present; a NULL parameter disables it. This keeps
+# the SQL text identical across filter combinations so its plan is reusable.
+STRATEGY_WHERE = """
+    WHERE (%(side)s IS NULL OR side = %(side)s)
+    AND (%(spread_min)s IS NULL OR spread >= %(spread_min)s)
+    AND (%(spread_max)s IS NULL OR spread <= %(spread_max)s)
+    AND (%(movement_signal)s IS NULL OR movement_signal = %(movement_signal)s)
+    AND (%(injury_diff_min)s IS NULL OR injury_diff >= %(injury_diff_min)s)
+    AND (%(injury_diff_max)s IS NULL OR injury_diff <= %(injury_diff_max)s)
+    AND (%(book)s IS NULL OR book = %(book)s)
+"""
+
+SUMMARY_SQL = f"""
+    SELECT
+        COUNT(*) AS bets,
+        COUNT(*) FILTER (WHERE profit > 0) AS wins,
+        COALESCE(SUM(profit), 0) AS total_profit
+    FROM (
+        SELECT {PROFIT_SQL} AS profit
         FROM v_ats_spread_enriched
-        {where_clause}
+        CROSS JOIN (SELECT %(stake)s::numeric AS stake) p
+        {STRATEGY_WHERE}
+    ) t
+"""
+
+# Columns returned per bet in the backtest drill-down (also the ?fields= whitelist)
+BACKTEST_COLUMNS = (
+    "game_id",
+    "side",
+    "spread",
+    "price_american",
+    "bet_result",
+    "book",
+    "movement_signal",
+    "injury_diff",
+)
+
+ROWS_SQL = f"""
+    SELECT {{columns}}, {PROFIT_SQL} AS profit
+    FROM v_ats_spread_enriched v
+    CROSS JOIN (SELECT %(stake)s::numeric AS stake) p
+    {STRATEGY_WHERE}
+    ORDER BY game_id, book, side
+    LIMIT %(limit)s OFFSET %(offset)s
+"""
+
+# Positional order and types for PREPARE
+PARAM_TYPES = {
+    "stake": "numeric",
+    "side": "text",
+    "spread_min": "numeric",
+    "spread_max": "numeric",
+    "movement_signal": "text",
+    "injury_diff_min": "integer",
+    "injury_diff_max": "integer",
+    "book": "text",
+    "limit": "integer",
+    "offset": "integer",
+}
+
+def strategy_params(strategy):
+    filters = strategy.filters
+    return {
+        "stake": strategy.stake,
+        "side": filters.side or None,
+        "spread_min": filters.spread_min,
+        "spread_max": filters.spread_max,
+        "movement_signal": filters.movement_signal or None,
+        "injury_diff_min": filters.injury_diff_min,
+        "injury_diff_max": filters.injury_diff_max,
+        "book": filters.book or None,
+    }
+
+def execute_statement(cur, name, sql, params, param_types=PARAM_TYPES):
+    """Run sql, via a per-connection prepared statement when enabled.
+
+    param_types gives the positional order and types of the %(name)s
+    parameters for PREPARE.
     """
+    if not USE_PREPARED or name is None:
+        traced_execute(cur, sql, params)
+        return
+
+    names = [key for key in param_types if f"%({key})s" in sql]
+    args = ", ".join(f"%({key})s" for key in names)
+    try:
+        cur.execute(f"EXECUTE {name} ({args})", params)
+    except errors.InvalidSqlStatementName:
+        # First use on this connection: prepare, then retry
+        cur.connection.rollback()
+        prepared_sql = re.sub(
+            r"%\((\w+)\)s",
+            lambda m: f"${names.index(m.group(1)) + 1}",
+            sql
+        )
+        types = ", ".join(param_types[key] for key in names)
+        cur.execute(f"PREPARE {name} ({types}) AS {prepared_sql}")
+        cur.execute(f"EXECUTE {name} ({args})", params)
+
+def backtest_strategy_summary(strategy):
+    """Aggregate bet count, wins and profit for a strategy in one row."""
+    conn = get_connection()
+    try:
+        cur = conn.cursor()
+        execute_statement(cur, "bt_summary", SUMMARY_SQL, strategy_params(strategy))
+        summary = cur.fetchone()
+
+        cur.close()
+    finally:
+        release_connection(conn)
+
+    return summary
+
+def backtest_strategy_rows(strategy, limit: int, offset: int = 0, fields=None):
+    """One page of the strategy's matching bets, with per-bet profit."""
+    params = strategy_params(strategy)
+    params.update({"limit": limit, "offset": offset})
 
-    params = [stake, stake, stake] + params
+    columns = [col for col in BACKTEST_COLUMNS if fields and col in fields]
+    if not columns:
+        columns = list(BACKTEST_COLUMNS)
+    # Only the default projection gets a prepared statement
+    name = "bt_rows" if len(columns) == len(BACKTEST_COLUMNS) else None
+    sql = ROWS_SQL.format(columns=", ".join(f"v.{col}" for col in columns))
 
     conn = get_connection()
-    cur = conn.cursor()
-    cur.execute(query, params)
-    rows = cur.fetchall()
+    try:
+        cur = conn.cursor()
+        execute_statement(cur, name, sql, params)
+        rows = cur.fetchall()
 
-    cur.close()
-    conn.close()
+        cur.close()
+    finally:
+        release_connection(conn)
 
     return rows
@@ -1,17 +1,161 @@
 # smartline-api/app/database.py
 import os
-import psycopg2
+import queue
+import random
+import threading
+import time
+from collections import deque
+from psycopg2 import pool
 from psycopg2.extras import RealDictCursor
 from dotenv import load_dotenv
 
 load_dotenv()
 
+# PGHOST/PGPORT are expected to point at a transaction-mode pooler
+# (PgBouncer / Supabase pooler), which multiplexes every worker onto a small
+# set of server backends. Keep the per-process pool small and avoid session
+# state (SET, PREPARE, LISTEN) on pooled connections.
+#
+# At most PG_POOL_MAX connections are borrowed at once per process. Sync
+# handlers run on FastAPI's threadpool (~40 threads), so the rest wait up to
+# PG_POOL_TIMEOUT seconds for one; the CSV export holds its connection for
+# the whole response body. Raise PG_POOL_MAX if requests queue here.
+_POOL = None
+_POOL_LOCK = threading.Lock()
+# ThreadedConnectionPool.getconn() raises PoolError when every connection is
+# out instead of waiting; callers queue on this semaphore for a free slot.
+_POOL_SLOTS = None
+POOL_TIMEOUT = float(os.getenv("PG_POOL_TIMEOUT", 30))
+
+def get_pool():
+    """Process-wide connection pool, created on first use."""
+    global _POOL, _POOL_SLOTS
+    if _POOL is None:
+        with _POOL_LOCK:
+            if _POOL is None:
+                maxconn = int(os.getenv("PG_POOL_MAX", 5))
+                _POOL_SLOTS = threading.BoundedSemaphore(maxconn)
+                _POOL = pool.ThreadedConnectionPool(
+                    minconn=int(os.getenv("PG_POOL_MIN", 2)),
+                    maxconn=maxconn,
+                    host=os.getenv("PGHOST"),
+                    dbname=os.getenv("PGDATABASE"),
+                    user=os.getenv("PGUSER"),
+                    password=os.getenv("PGPASSWORD"),
+                    port=os.getenv("PGPORT", 5432),
+                    cursor_factory=RealDictCursor
+                )
+    return _POOL
+
 def get_connection():
-    return psycopg2.connect(
-        host=os.getenv("PGHOST"),
-        dbname=os.getenv("PGDATABASE"),
-        user=os.getenv("PGUSER"),
-        password=os.getenv("PGPASSWORD"),
-        port=os.getenv("PGPORT", 5432),
-        cursor_factory=RealDictCursor
-    )
+    """Borrow a connection from the pool; hand it back with release_connection().
+
+    Waits up to PG_POOL_TIMEOUT seconds for a free connection, then raises
+    PoolError.
+    """
+    db_pool = get_pool()
+    if not _POOL_SLOTS.acquire(timeout=POOL_TIMEOUT):
+        raise pool.PoolError("connection pool exhausted")
+    try:
+        conn = db_pool.getconn()
+        if conn.closed:
+            # Dropped by the server or pooler; open a fresh one instead
+            db_pool.putconn(conn, close=True)
+            conn = db_pool.getconn()
+    except Exception:
+        _POOL_SLOTS.release()
+        raise
+    return conn
+
+def release_connection(conn, close=False):
+    """Return a borrowed connection to the pool (close=True discards it).
+
+    Connections broken mid-request (an OperationalError marks them closed)
+    are always discarded, so the next borrower never gets a dead one.
+    """
+    try:
+        get_pool().putconn(conn, close=close or bool(conn.closed))
+    finally:
+        _POOL_SLOTS.release()
+
+def warm_pool():
+    """Open the pool's minimum connections and round-trip each one once."""
+    conns = []
+    try:
+        for _ in range(get_pool().minconn):
+            conns.append(get_connection())
+        for conn in conns:
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT 1")
+            conn.rollback()
+    finally:
+        for conn in conns:
+            release_connection(conn)
+
+def close_pool():
+    """Close every pooled connection; the next get_pool() starts a new pool."""
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is not None:
+            _POOL.closeall()
+            _POOL = None
+
+# Query tracing: slow (or randomly sampled) statements get an
+# EXPLAIN (ANALYZE, BUFFERS) plan recorded here; served by /debug/slow.
+# The request only queues the statement; a background thread re-runs it
+# under EXPLAIN on its own pooled connection, rolled back afterwards, so the
+# request's latency and transaction are untouched.
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", 200))
+QUERY_SAMPLE_RATE = float(os.getenv("QUERY_SAMPLE_RATE", 0.001))
+QUERY_TRACES = deque(maxlen=100)
+_TRACE_QUEUE = queue.Queue(maxsize=100)
+_TRACE_WORKER = None
+_TRACE_WORKER_LOCK = threading.Lock()
+
+def _explain_traces():
+    """Background worker: attach a plan to each queued trace, then record it."""
+    while True:
+        trace = _TRACE_QUEUE.get()
+        try:
+            conn = get_connection()
+            try:
+                with conn.cursor() as explain_cursor:
+                    explain_cursor.execute(
+                        "EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) " + trace["query"]
+                    )
+                    trace["plan"] = explain_cursor.fetchone()["QUERY PLAN"]
+            finally:
+                if not conn.closed:
+                    conn.rollback()
+                release_connection(conn)
+        except Exception as e:
+            trace["plan"] = f"EXPLAIN failed: {str(e)}"
+        QUERY_TRACES.append(trace)
+
+def _queue_trace(trace):
+    """Hand a trace to the EXPLAIN worker, starting it on first use."""
+    global _TRACE_WORKER
+    if _TRACE_WORKER is None:
+        with _TRACE_WORKER_LOCK:
+            if _TRACE_WORKER is None:
+                _TRACE_WORKER = threading.Thread(
+                    target=_explain_traces, name="query-trace", daemon=True
+                )
+                _TRACE_WORKER.start()
+    try:
+        _TRACE_QUEUE.put_nowait(trace)
+    except queue.Full:
+        pass  # Worker is behind; drop this sample
+
+def traced_execute(cursor, sql, params=None):
+    """cursor.execute() that records a plan for slow or sampled queries."""
+    started = time.perf_counter()
+    cursor.execute(sql, params)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+
+    if elapsed_ms > SLOW_QUERY_MS or random.random() < QUERY_SAMPLE_RATE:
+        _queue_trace({
+            "recorded_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "elapsed_ms": round(elapsed_ms, 2),
+            "query": cursor.mogrify(sql, params).decode()
+        })
@@ -3,19 +3,30 @@ Export & Reporting Endpoints - Phase 4B
 ========================================
 """
 
-from fastapi import APIRouter, Query, Depends, HTTPException
-from fastapi.responses import StreamingResponse
+from fastapi import APIRouter, Query, Depends, HTTPException, Request, BackgroundTasks
+from fastapi.responses import StreamingResponse, FileResponse, Response
 from typing import Optional, Dict, Any
-from datetime import datetime
+from datetime import datetime, date
 from decimal import Decimal
-import csv
-import io
+from functools import lru_cache
+import gzip
+import hashlib
+import json
+import logging
 import os
+import tempfile
+import threading
+import time
+import uuid
 import psycopg2
 from psycopg2.extras import RealDictCursor
-import traceback
+
+from app.database import get_connection, release_connection, traced_execute
+from app.cache import cache_get, cache_set
+from app.crud import execute_statement
 
 from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
 from openpyxl.utils import get_column_letter
 from openpyxl.chart import BarChart, PieChart, Reference
@@ -24,319 +35,735 @@ from io import BytesIO
 from reportlab.lib.pagesizes import letter, A4
 from reportlab.lib import colors
 from reportlab.lib.units import inch
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, PageBreak
+from reportlab.platypus import SimpleDocTemplate, Table, LongTable, TableStyle, Paragraph, Spacer, PageBreak
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.enums import TA_CENTER, TA_RIGHT
 from reportlab.pdfgen import canvas
 
+logger = logging.getLogger(__name__)
+
 def get_db():
-    """Database connection dependency."""
-    conn = psycopg2.connect(
-        host=os.environ["PGHOST"],
-        dbname=os.environ["PGDATABASE"],
-        user=os.environ["PGUSER"],
-        password=os.environ["PGPASSWORD"],
-        port=os.environ.get("PGPORT", 5432),
-        cursor_factory=RealDictCursor
-    )
+    """Database connection dependency (borrowed from the shared pool)."""
+    conn = get_connection()
     try:
         yield conn
-    finally:
-        conn.close()
+    except Exception:
+        # Failed exports may leave the connection broken; don't recycle it
+        release_connection(conn, close=True)
+        raise
+    else:
+        release_connection(conn)
 
 
 router = APIRouter(prefix="/bankroll/export", tags=["Export & Reports"])
 
+# Decode NUMERIC columns straight to float on export cursors (display only)
+DEC2FLOAT = psycopg2.extensions.new_type(
+    psycopg2.extensions.DECIMAL.values,
+    "DEC2FLOAT",
+    lambda value, curs: float(value) if value is not None else None
+)
+
+COPY_CHUNK_SIZE = 64 * 1024
+
+
+def iter_chunks(file_obj, chunk_size: int = COPY_CHUNK_SIZE):
+    """Yield a file's contents in fixed-size chunks, then close it."""
+    try:
+        while chunk := file_obj.read(chunk_size):
+            yield chunk
+    finally:
+        file_obj.close()
+
+
+def gzip_chunks(chunks, compresslevel: int = 1):
+    """Gzip-compress a byte-chunk iterator on the fly."""
+    buffer = BytesIO()
+    with gzip.GzipFile(fileobj=buffer, mode="wb", compresslevel=compresslevel) as gz:
+        for chunk in chunks:
+            gz.write(chunk)
+            gz.flush()
+            data = buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            if data:
+                yield data
+    yield buffer.getvalue()
+
+
+def accepts_gzip(request: Request) -> bool:
+    """True if Accept-Encoding allows gzip (explicitly or via *) with q > 0."""
+    qvalues = {}
+    for coding in request.headers.get("accept-encoding", "").split(","):
+        name, *coding_params = coding.split(";")
+        q = 1.0
+        for param in coding_params:
+            key, _, value = param.partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        qvalues[name.strip().lower()] = q
+    return qvalues.get("gzip", qvalues.get("*", 0.0)) > 0
+
+
+# Write-only sheets take column widths up front, before the first row.
+# These cover the fixed-width columns; export_excel sizes the free-text
+# ones from MAX(LENGTH(...)) gathered in its by-bookmaker aggregate.
+BETS_COLUMN_WIDTHS = (10, 21, 18, 10, 8, 20, 22, 8, 8, 10, 11, 10, 10, 13, 21, 50)
+
+
+# Excel number formats: cells hold raw numbers, Excel does the formatting
+MONEY_FORMAT = '$#,##0.00'
+PERCENT_FORMAT = '0.0"%"'
+
+
+def number_cell(ws, value, number_format):
+    """Numeric write-only cell displayed with an Excel number format."""
+    cell = WriteOnlyCell(ws, value=value)
+    cell.number_format = number_format
+    return cell
+
+
+def header_cells(ws, titles, fill, font, alignment=None):
+    """Styled header row for a write-only worksheet."""
+    cells = []
+    for title in titles:
+        cell = WriteOnlyCell(ws, value=title)
+        cell.fill = fill
+        cell.font = font
+        if alignment:
+            cell.alignment = alignment
+        cells.append(cell)
+    return cells
+
+
+# Optional export filters as (parameter, predicate), one bit each in the
+# filter mask. NOTE: keep the date filters as DATE(b.placed_at) so they
+# match the bets_user_day_idx expression index (sql/migrations/002);
+# wrapping placed_at in any other function forces a sequential scan.
+BET_FILTERS = (
+    ("start_date", "DATE(b.placed_at) >= %(start_date)s"),
+    ("end_date", "DATE(b.placed_at) <= %(end_date)s"),
+    ("bookmaker", "b.bookmaker_name = %(bookmaker)s"),
+    ("market", "b.market_key = %(market)s"),
+    ("status", "b.status = %(status)s"),
+    ("search", "(b.notes ILIKE %(search)s OR b.bet_side ILIKE %(search)s)"),
+)
+
+# The same filters against the daily roll-up behind /summary
+SUMMARY_FILTERS = (
+    ("start_date", "s.day >= %(start_date)s"),
+    ("end_date", "s.day <= %(end_date)s"),
+    ("bookmaker", "ba.bookmaker_name = %(bookmaker)s"),
+    ("market", "s.market_key = %(market)s"),
+    ("status", "s.status = %(status)s"),
+)
+
+# Positional order and types for PREPARE (see crud.execute_statement)
+BET_FILTER_TYPES = {
+    "user_id": "integer",
+    "start_date": "date",
+    "end_date": "date",
+    "bookmaker": "text",
+    "market": "text",
+    "status": "text",
+    "search": "text",
+}
+
+def _filter_params(user_id: int, filters: dict, spec=BET_FILTERS):
+    """Named params for the set filters and their bit mask within spec."""
+    mask = 0
+    params = {"user_id": user_id}
+    for bit, (key, _) in enumerate(spec):
+        value = filters.get(key)
+        if value:
+            mask |= 1 << bit
+            params[key] = f"%{value}%" if key == "search" else value
+    return params, mask
+
+
+@lru_cache(maxsize=128)
+def _export_sql(template: str, mask: int, spec=BET_FILTERS, user_column="b.user_id") -> str:
+    """
+    A statement template with its WHERE clause filled in.
+    
+    Built once per (statement, filter mask); every export query goes through
+    here, so statements can also be prepared per mask.
+    """
+    clauses = [f"{user_column} = %(user_id)s"] + [
+        clause for bit, (_, clause) in enumerate(spec) if mask & (1 << bit)
+    ]
+    return template.format(where="WHERE " + " AND ".join(clauses))
+
+
+# Column aliases become the CSV header; money columns are written as plain
+# floats with zero left blank, as the csv.writer export did
+CSV_EXPORT_SQL = """
+    SELECT 
+        b.bet_id AS "Bet ID",
+        date_trunc('second', b.placed_at) AS "Date Placed",
+        COALESCE(b.bookmaker_name, 'N/A') AS "Bookmaker",
+        b.bet_type AS "Bet Type",
+        b.sport AS "Sport",
+        b.market_key AS "Market",
+        b.bet_side AS "Side",
+        b.line_value AS "Line",
+        b.odds_american AS "Odds (American)",
+        NULLIF(b.stake_amount, 0)::float8 AS "Stake",
+        NULLIF(b.potential_payout, 0)::float8 AS "Potential Payout",
+        b.status AS "Status",
+        NULLIF(b.actual_payout, 0)::float8 AS "Actual Payout",
+        NULLIF(b.profit_loss, 0)::float8 AS "Profit/Loss",
+        date_trunc('second', b.settled_at) AS "Settled Date",
+        b.notes AS "Notes"
+    FROM bets b
+    {where}
+    ORDER BY b.placed_at DESC
+"""
+
+
+def copy_bets_csv(cursor, user_id: int, filters: dict, sink):
+    """COPY the filtered bets export as CSV into a binary file-like sink."""
+    params, mask = _filter_params(user_id, filters)
+    
+    # ISO DateStyle renders the truncated timestamps as YYYY-MM-DD HH:MM:SS
+    # without a per-row TO_CHAR (SET LOCAL ends with the transaction).
+    cursor.execute("SET LOCAL DateStyle = 'ISO, YMD'")
+    select_sql = cursor.mogrify(_export_sql(CSV_EXPORT_SQL, mask), params).decode()
+    cursor.copy_expert(
+        f"COPY ({select_sql}) TO STDOUT WITH (FORMAT CSV, HEADER TRUE, ENCODING 'UTF8')",
+        sink
+    )
+
+
+def stream_bets_csv(user_id: int, filters: dict):
+    """
+    Yield the CSV export while COPY is still producing it.
+    
+    COPY runs on a worker thread writing into a pipe; this generator reads
+    the other end, so memory stays at one pipe buffer and the first bytes go
+    out before the query finishes. Owns its connection: the response body
+    outlives the request dependencies.
+    
+    A failed COPY raises here after the partial body, so the client sees an
+    aborted download instead of a short file.
+    """
+    read_fd, write_fd = os.pipe()
+    reader = os.fdopen(read_fd, "rb")
+    failures = []
+    
+    def produce():
+        # Opened first so every exit below closes it and the reader gets EOF
+        sink = os.fdopen(write_fd, "wb")
+        conn = None
+        finished = False
+        try:
+            conn = get_connection()
+            with conn.cursor() as cursor:
+                copy_bets_csv(cursor, user_id, filters, sink)
+            finished = True
+        except BrokenPipeError:
+            pass  # client went away
+        except Exception as e:
+            logger.exception("CSV export failed")
+            failures.append(e)
+        finally:
+            try:
+                sink.close()
+            except BrokenPipeError:
+                pass
+            if conn is not None:
+                # An interrupted COPY OUT leaves the connection unusable
+                release_connection(conn, close=not finished)
+    
+    producer = threading.Thread(target=produce, daemon=True)
+    producer.start()
+    try:
+        yield from iter_chunks(reader)
+    finally:
+        reader.close()
+        producer.join()
+    if failures:
+        raise RuntimeError("CSV export failed") from failures[0]
+
+
+# Background CSV export jobs. State lives in this process, so job polling
+# must reach the same worker that accepted the job. Finished jobs (and their
+# files) are dropped EXPORT_JOB_TTL seconds after they complete.
+EXPORT_JOB_DIR = os.getenv("EXPORT_JOB_DIR", tempfile.gettempdir())
+EXPORT_JOB_TTL = int(os.getenv("EXPORT_JOB_TTL", 3600))
+EXPORT_JOBS: Dict[str, Dict[str, Any]] = {}
+_EXPORT_JOBS_LOCK = threading.Lock()
+
+
+def _remove_file(path: str):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def expire_export_jobs():
+    """Forget finished jobs older than EXPORT_JOB_TTL and delete their files."""
+    cutoff = time.time() - EXPORT_JOB_TTL
+    with _EXPORT_JOBS_LOCK:
+        expired = [
+            job_id for job_id, job in EXPORT_JOBS.items()
+            if job.get("finished_at", cutoff) < cutoff
+        ]
+        jobs = [EXPORT_JOBS.pop(job_id) for job_id in expired]
+    for job in jobs:
+        _remove_file(job["path"])
+
+
+def run_csv_export_job(job_id: str, user_id: int, filters: dict):
+    """Write a gzipped CSV export to EXPORT_JOB_DIR for later download."""
+    job = EXPORT_JOBS[job_id]
+    conn = None
+    finished = False
+    try:
+        conn = get_connection()
+        with conn.cursor() as cursor, gzip.open(job["path"], "wb", compresslevel=1) as sink:
+            copy_bets_csv(cursor, user_id, filters, sink)
+        finished = True
+        job["status"] = "ready"
+        
+    except Exception as e:
+        logger.exception("Export job %s failed", job_id)
+        _remove_file(job["path"])
+        job["status"] = "failed"
+        job["error"] = str(e)
+    finally:
+        job["finished_at"] = time.time()
+        if conn is not None:
+            # An interrupted COPY OUT leaves the connection unusable
+            release_connection(conn, close=not finished)
+
 
 @router.get("/csv")
-async def export_csv(
+def export_csv(
+    request: Request,
     user_id: int = Query(default=1),
-    start_date: Optional[str] = Query(default=None),
-    end_date: Optional[str] = Query(default=None),
+    start_date: Optional[date] = Query(default=None),
+    end_date: Optional[date] = Query(default=None),
     bookmaker: Optional[str] = Query(default=None),
     market: Optional[str] = Query(default=None),
     status: Optional[str] = Query(default=None),
-    search: Optional[str] = Query(default=None),
-    conn = Depends(get_db)
+    search: Optional[str] = Query(default=None)
 ):
     """Export bets to CSV format with optional filtering."""
-    cursor = None
-    try:
-        cursor = conn.cursor()
-        
-        # Build dynamic WHERE clause
-        where_clauses = ["b.user_id = %s"]
-        params = [user_id]
-        
-        if start_date:
-            where_clauses.append("DATE(b.placed_at) >= %s")
-            params.append(start_date)
-        
-        if end_date:
-            where_clauses.append("DATE(b.placed_at) <= %s")
-            params.append(end_date)
-        
-        if bookmaker:
-            where_clauses.append("ba.bookmaker_name = %s")
-            params.append(bookmaker)
-        
-        if market:
-            where_clauses.append("b.market_key = %s")
-            params.append(market)
-        
-        if status:
-            where_clauses.append("b.status = %s")
-            params.append(status)
-        
-        if search:
-            where_clauses.append("(b.notes ILIKE %s OR b.bet_side ILIKE %s)")
-            search_pattern = f"%{search}%"
-            params.extend([search_pattern, search_pattern])
-        
-        where_clause = " AND ".join(where_clauses)
-        
-        # Fetch bets with all details
-        query = f"""
-            SELECT 
-                b.bet_id,
-                TO_CHAR(b.placed_at, 'YYYY-MM-DD HH24:MI:SS') as placed_at,
-                ba.bookmaker_name,
-                b.bet_type,
-                b.sport,
-                b.market_key,
-                b.bet_side,
-                b.line_value,
-                b.odds_american,
-                b.stake_amount,
-                b.potential_payout,
-                b.status,
-                b.actual_payout,
-                b.profit_loss,
-                TO_CHAR(b.settled_at, 'YYYY-MM-DD HH24:MI:SS') as settled_at,
-                b.notes
-            FROM bets b
-            LEFT JOIN bankroll_accounts ba ON b.account_id = ba.account_id
-            WHERE {where_clause}
-            ORDER BY b.placed_at DESC
-        """
-        
-        cursor.execute(query, params)
-        bets = cursor.fetchall()
-        
-        # Create CSV in memory
-        output = io.StringIO()
-        writer = csv.writer(output)
-        
-        # Write header (removed Odds Decimal)
-        writer.writerow([
-            'Bet ID', 'Date Placed', 'Bookmaker', 'Bet Type', 'Sport', 
-            'Market', 'Side', 'Line', 'Odds (American)',
-            'Stake', 'Potential Payout', 'Status', 'Actual Payout', 
-            'Profit/Loss', 'Settled Date', 'Notes'
-        ])
-        
-        # Write data
-        for bet in bets:
-            writer.writerow([
-                bet['bet_id'],
-                bet['placed_at'],
-                bet['bookmaker_name'] or 'N/A',
-                bet['bet_type'],
-                bet['sport'],
-                bet['market_key'],
-                bet['bet_side'],
-                bet['line_value'] or '',
-                bet['odds_american'] or '',
-                float(bet['stake_amount']) if bet['stake_amount'] else '',
-                float(bet['potential_payout']) if bet['potential_payout'] else '',
-                bet['status'],
-                float(bet['actual_payout']) if bet['actual_payout'] else '',
-                float(bet['profit_loss']) if bet['profit_loss'] else '',
-                bet['settled_at'] or '',
-                bet['notes'] or ''
-            ])
-        
-        output.seek(0)
-        filename = f"bets_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
-        
-        if cursor:
-            cursor.close()
-        
-        return StreamingResponse(
-            iter([output.getvalue()]),
-            media_type="text/csv",
-            headers={
-                "Content-Disposition": f"attachment; filename={filename}"
-            }
-        )
-        
-    except Exception as e:
-        print(f"❌ Export CSV Error: {str(e)}")
-        traceback.print_exc()
-        if cursor:
-            try:
-                cursor.close()
-            except:
-                pass
-        raise HTTPException(status_code=500, detail=f"Export failed: {str(e)}")
+    filters = {
+        "start_date": start_date,
+        "end_date": end_date,
+        "bookmaker": bookmaker,
+        "market": market,
+        "status": status,
+        "search": search
+    }
+    filename = f"bets_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
+    
+    body = stream_bets_csv(user_id, filters)
+    headers = {
+        "Content-Disposition": f"attachment; filename={filename}",
+        "Vary": "Accept-Encoding"
+    }
+    if accepts_gzip(request):
+        body = gzip_chunks(body)
+        headers["Content-Encoding"] = "gzip"
+    
+    return StreamingResponse(
+        body,
+        media_type="text/csv; charset=utf-8",
+        headers=headers
+    )
+
+
+@router.post("/csv/job", status_code=202)
+def create_csv_export_job(
+    background_tasks: BackgroundTasks,
+    user_id: int = Query(default=1),
+    start_date: Optional[date] = Query(default=None),
+    end_date: Optional[date] = Query(default=None),
+    bookmaker: Optional[str] = Query(default=None),
+    market: Optional[str] = Query(default=None),
+    status: Optional[str] = Query(default=None),
+    search: Optional[str] = Query(default=None)
+):
+    """
+    Queue a CSV export for large result sets.
+    
+    **Use Case:** Exports too large to stream within one request
+    **Returns:** Job ID to poll at /csv/job/{job_id}
+    """
+    expire_export_jobs()
+    
+    job_id = uuid.uuid4().hex
+    with _EXPORT_JOBS_LOCK:
+        EXPORT_JOBS[job_id] = {
+            "status": "pending",
+            "path": os.path.join(EXPORT_JOB_DIR, f"bets_export_{job_id}.csv.gz"),
+            "created_at": datetime.now().isoformat()
+        }
+    
+    filters = {
+        "start_date": start_date,
+        "end_date": end_date,
+        "bookmaker": bookmaker,
+        "market": market,
+        "status": status,
+        "search": search
+    }
+    background_tasks.add_task(run_csv_export_job, job_id, user_id, filters)
+    
+    return {"job_id": job_id, "status": "pending"}
+
+
+@router.get("/csv/job/{job_id}")
+def get_csv_export_job(job_id: str):
+    """Poll a queued CSV export."""
+    expire_export_jobs()
+    job = EXPORT_JOBS.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Export job not found")
+    
+    result = {"job_id": job_id, "status": job["status"]}
+    if job["status"] == "ready":
+        result["download_url"] = f"{router.prefix}/csv/job/{job_id}/download"
+    elif job["status"] == "failed":
+        result["error"] = job["error"]
+    
+    return result
+
+
+@router.get("/csv/job/{job_id}/download")
+def download_csv_export_job(job_id: str):
+    """Download a finished CSV export (gzip-compressed)."""
+    expire_export_jobs()
+    job = EXPORT_JOBS.get(job_id)
+    if not job or job["status"] != "ready":
+        raise HTTPException(status_code=404, detail="Export not ready")
+    
+    return FileResponse(
+        job["path"],
+        media_type="application/gzip",
+        filename=os.path.basename(job["path"])
+    )
+
+
+# Daily roll-up aggregate behind /summary (sql/migrations/003). s.day is
+# DATE(placed_at), so earliest_bet/latest_bet are the same dates the
+# bets-table query returned (MIN/MAX(DATE(b.placed_at))).
+EXPORT_SUMMARY_SQL = """
+    SELECT 
+        COALESCE(SUM(s.n), 0)::bigint as total_bets,
+        COALESCE(SUM(s.n) FILTER (WHERE s.status = 'won'), 0)::bigint as won_bets,
+        COALESCE(SUM(s.n) FILTER (WHERE s.status = 'lost'), 0)::bigint as lost_bets,
+        COALESCE(SUM(s.n) FILTER (WHERE s.status = 'push'), 0)::bigint as push_bets,
+        COALESCE(SUM(s.n) FILTER (WHERE s.status = 'pending'), 0)::bigint as pending_bets,
+        COALESCE(SUM(s.stake_sum), 0)::float8 as total_staked,
+        COALESCE(SUM(s.pl_sum) FILTER (WHERE s.status IN ('won', 'lost', 'push')), 0)::float8 as total_profit_loss,
+        ROUND(
+            CASE 
+                WHEN SUM(s.n) FILTER (WHERE s.status IN ('won', 'lost')) > 0 THEN
+                    (COALESCE(SUM(s.n) FILTER (WHERE s.status = 'won'), 0)::numeric / 
+                     SUM(s.n) FILTER (WHERE s.status IN ('won', 'lost')) * 100)
+                ELSE 0
+            END,
+        1)::float8 as win_rate,
+        MIN(s.day) as earliest_bet,
+        MAX(s.day) as latest_bet
+    FROM mv_bet_summary_daily s
+    LEFT JOIN bankroll_accounts ba ON s.account_id = ba.account_id
+    {where}
+"""
 
 
 @router.get("/summary")
-async def get_export_summary(
+def get_export_summary(
     user_id: int = Query(default=1),
-    start_date: Optional[str] = Query(default=None),
-    end_date: Optional[str] = Query(default=None),
+    start_date: Optional[date] = Query(default=None),
+    end_date: Optional[date] = Query(default=None),
     bookmaker: Optional[str] = Query(default=None),
     market: Optional[str] = Query(default=None),
     status: Optional[str] = Query(default=None),
     conn = Depends(get_db)
 ):
-    """Get summary statistics for export preview."""
-    cursor = None
+    """
+    Get summary statistics for export preview.
+    
+    Read from a roll-up refreshed every minute and cached for another
+    minute, so new or settled bets can take up to ~2 minutes to show.
+    """
+    cache_key = (user_id, start_date, end_date, bookmaker, market, status)
+    cached = cache_get("export_summary", cache_key)
+    if cached is not None:
+        return cached
+    
     try:
-        cursor = conn.cursor()
-        
-        where_clauses = ["b.user_id = %s"]
-        params = [user_id]
-        
-        if start_date:
-            where_clauses.append("DATE(b.placed_at) >= %s")
-            params.append(start_date)
-        
-        if end_date:
-            where_clauses.append("DATE(b.placed_at) <= %s")
-            params.append(end_date)
-        
-        if bookmaker:
-            where_clauses.append("ba.bookmaker_name = %s")
-            params.append(bookmaker)
-        
-        if market:
-            where_clauses.append("b.market_key = %s")
-            params.append(market)
-        
-        if status:
-            where_clauses.append("b.status = %s")
-            params.append(status)
-        
-        where_clause = " AND ".join(where_clauses)
-        
-        query = f"""
-            SELECT 
-                COUNT(*) as total_bets,
-                COUNT(*) FILTER (WHERE b.status = 'won') as won_bets,
-                COUNT(*) FILTER (WHERE b.status = 'lost') as lost_bets,
-                COUNT(*) FILTER (WHERE b.status = 'push') as push_bets,
-                COUNT(*) FILTER (WHERE b.status = 'pending') as pending_bets,
-                COALESCE(SUM(b.stake_amount), 0) as total_staked,
-                COALESCE(SUM(b.profit_loss) FILTER (WHERE b.status IN ('won', 'lost', 'push')), 0) as total_profit_loss,
-                ROUND(
-                    CASE 
-                        WHEN COUNT(*) FILTER (WHERE b.status IN ('won', 'lost')) > 0 THEN
-                            (COUNT(*) FILTER (WHERE b.status = 'won')::numeric / 
-                             COUNT(*) FILTER (WHERE b.status IN ('won', 'lost')) * 100)
-                        ELSE 0
-                    END,
-                1) as win_rate,
-                MIN(DATE(b.placed_at)) as earliest_bet,
-                MAX(DATE(b.placed_at)) as latest_bet
-            FROM bets b
-            LEFT JOIN bankroll_accounts ba ON b.account_id = ba.account_id
-            WHERE {where_clause}
-        """
-        
-        cursor.execute(query, params)
-        summary = cursor.fetchone()
-        
-        if cursor:
-            cursor.close()
+        # Aggregated from the daily roll-up (sql/migrations/003), refreshed
+        # every minute, rather than scanning bets
+        params, mask = _filter_params(
+            user_id,
+            {
+                "start_date": start_date,
+                "end_date": end_date,
+                "bookmaker": bookmaker,
+                "market": market,
+                "status": status
+            },
+            SUMMARY_FILTERS
+        )
         
-        return {
+        with conn.cursor() as cursor:
+            execute_statement(
+                cursor,
+                f"export_summary_{mask}",
+                _export_sql(EXPORT_SUMMARY_SQL, mask, SUMMARY_FILTERS, "s.user_id"),
+                params,
+                BET_FILTER_TYPES
+            )
+            summary = cursor.fetchone()
+        
+        result = {
             "total_bets": summary['total_bets'],
             "won_bets": summary['won_bets'],
             "lost_bets": summary['lost_bets'],
             "push_bets": summary['push_bets'],
             "pending_bets": summary['pending_bets'],
-            "total_staked": float(summary['total_staked']),
-            "total_profit_loss": float(summary['total_profit_loss']),
-            "win_rate": float(summary['win_rate']),
+            "total_staked": summary['total_staked'],
+            "total_profit_loss": summary['total_profit_loss'],
+            "win_rate": summary['win_rate'],
             "earliest_bet": str(summary['earliest_bet']) if summary['earliest_bet'] else None,
             "latest_bet": str(summary['latest_bet']) if summary['latest_bet'] else None,
             "date_range_days": (summary['latest_bet'] - summary['earliest_bet']).days if summary['earliest_bet'] and summary['latest_bet'] else 0
         }
+        cache_set("export_summary", cache_key, result)
+        
+        return result
         
     except Exception as e:
-        print(f"❌ Summary Error: {str(e)}")
-        traceback.print_exc()
-        if cursor:
-            try:
-                cursor.close()
-            except:
-                pass
+        logger.exception("Export summary failed")
         raise HTTPException(status_code=500, detail=f"Summary failed: {str(e)}")
 
 
+BET_STATUSES = ("pending", "won", "lost", "push", "cancelled")
+
+
+def json_etag(value) -> str:
+    """Strong ETag for a JSON-serialisable response body."""
+    body = json.dumps(value, sort_keys=True, separators=(",", ":")).encode()
+    return '"' + hashlib.blake2b(body, digest_size=8).hexdigest() + '"'
+
+
 @router.get("/filter-options")
-async def get_filter_options(
+def get_filter_options(
+    request: Request,
+    response: Response,
     user_id: int = Query(default=1),
     conn = Depends(get_db)
 ):
-    """Get available filter options."""
-    cursor = None
-    try:
-        cursor = conn.cursor()
-        
-        # Get unique bookmakers
-        cursor.execute("""
-            SELECT DISTINCT ba.bookmaker_name
-            FROM bankroll_accounts ba
-            WHERE ba.user_id = %s
-            ORDER BY ba.bookmaker_name
-        """, [user_id])
-        bookmakers = [row['bookmaker_name'] for row in cursor.fetchall()]
-        
-        # Get unique markets
-        cursor.execute("""
-            SELECT DISTINCT market_key
-            FROM bets
-            WHERE user_id = %s
-            AND market_key IS NOT NULL
-            ORDER BY market_key
-        """, [user_id])
-        markets = [row['market_key'] for row in cursor.fetchall()]
-        
-        # Get unique sports
-        cursor.execute("""
-            SELECT DISTINCT sport
-            FROM bets
-            WHERE user_id = %s
-            AND sport IS NOT NULL
-            ORDER BY sport
-        """, [user_id])
-        sports = [row['sport'] for row in cursor.fetchall()]
-        
-        if cursor:
-            cursor.close()
-        
-        return {
-            "bookmakers": bookmakers,
-            "markets": markets,
-            "sports": sports,
-            "statuses": ["pending", "won", "lost", "push", "cancelled"]
-        }
-        
-    except Exception as e:
-        print(f"❌ Filter Options Error: {str(e)}")
-        traceback.print_exc()
-        if cursor:
-            try:
-                cursor.close()
-            except:
-                pass
-        raise HTTPException(status_code=500, detail=f"Filter options failed: {str(e)}")
+    """
+    Get available filter options.
+    
+    Sends an ETag; a matching If-None-Match gets an empty 304.
+    """
+    cached = cache_get("filter_options", (user_id,))
+    if cached is None:
+        try:
+            with conn.cursor() as cursor:
+                # Maintained by triggers on bets/bankroll_accounts (sql/migrations/004)
+                cursor.execute("""
+                    SELECT kind, value
+                    FROM bet_filter_values
+                    WHERE user_id = %s
+                    ORDER BY kind, value
+                """, [user_id])
+                
+                options = {"bookmaker": [], "market": [], "sport": []}
+                for row in cursor:
+                    options[row['kind']].append(row['value'])
+            
+            result = {
+                "bookmakers": options["bookmaker"],
+                "markets": options["market"],
+                "sports": options["sport"],
+                "statuses": BET_STATUSES
+            }
+            cached = (json_etag(result), result)
+            cache_set("filter_options", (user_id,), cached)
+            
+        except Exception as e:
+            logger.exception("Filter options failed")
+            raise HTTPException(status_code=500, detail=f"Filter options failed: {str(e)}")
+    
+    etag, result = cached
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    
+    response.headers["ETag"] = etag
+    return result
+
+
+# The year's bets are scanned once (CTE) and every section of the tax
+# report is aggregated from that, returned as one JSON document. The year
+# is a placed_at range, not EXTRACT(YEAR ...), so it can use
+# bets_user_placed_idx (sql/migrations/006).
+TAX_REPORT_SQL = """
+    WITH y AS (
+        SELECT 
+            b.status,
+            b.is_won,
+            b.is_lost,
+            b.is_settled,
+            b.stake_amount,
+            b.actual_payout,
+            b.profit_loss,
+            b.sport,
+            b.placed_at,
+            b.bookmaker_name
+        FROM bets b
+        WHERE b.user_id = %(user_id)s
+        AND b.placed_at >= make_date(%(year)s, 1, 1)
+        AND b.placed_at < make_date(%(year)s + 1, 1, 1)
+    )
+    SELECT json_build_object(
+        'summary', (
+            SELECT row_to_json(s) FROM (
+                SELECT 
+                    COUNT(*) as total_bets,
+                    COUNT(*) FILTER (WHERE is_won) as winning_bets,
+                    COUNT(*) FILTER (WHERE is_lost) as losing_bets,
+                    COUNT(*) FILTER (WHERE status = 'push') as push_bets,
+                    COALESCE(SUM(stake_amount), 0) as total_wagered,
+                    COALESCE(SUM(actual_payout) FILTER (WHERE is_won), 0) as total_winnings,
+                    COALESCE(SUM(stake_amount) FILTER (WHERE is_lost), 0) as total_losses,
+                    COALESCE(SUM(profit_loss) FILTER (WHERE is_settled), 0) as net_profit_loss
+                FROM y
+            ) s
+        ),
+        'by_bookmaker', (
+            SELECT COALESCE(json_agg(bm ORDER BY bm.net DESC), '[]'::json) FROM (
+                SELECT 
+                    bookmaker_name,
+                    COUNT(*) as bets,
+                    COALESCE(SUM(stake_amount), 0) as wagered,
+                    COALESCE(SUM(actual_payout) FILTER (WHERE is_won), 0) as winnings,
+                    COALESCE(SUM(stake_amount) FILTER (WHERE is_lost), 0) as losses,
+                    COALESCE(SUM(profit_loss) FILTER (WHERE is_settled), 0) as net
+                FROM y
+                GROUP BY bookmaker_name
+            ) bm
+        ),
+        'by_month', (
+            SELECT COALESCE(json_agg(m ORDER BY m.month_num), '[]'::json) FROM (
+                SELECT 
+                    TO_CHAR(placed_at, 'Month') as month,
+                    EXTRACT(MONTH FROM placed_at) as month_num,
+                    COUNT(*) as bets,
+                    COALESCE(SUM(profit_loss) FILTER (WHERE is_settled), 0) as profit_loss
+                FROM y
+                GROUP BY TO_CHAR(placed_at, 'Month'), EXTRACT(MONTH FROM placed_at)
+            ) m
+        ),
+        'by_sport', (
+            SELECT COALESCE(json_agg(sp ORDER BY sp.profit_loss DESC), '[]'::json) FROM (
+                SELECT 
+                    sport,
+                    COUNT(*) as bets,
+                    COALESCE(SUM(profit_loss) FILTER (WHERE is_settled), 0) as profit_loss,
+                    ROUND(COALESCE(
+                        100.0 * COUNT(*) FILTER (WHERE is_won) /
+                        NULLIF(COUNT(*) FILTER (WHERE is_won OR is_lost), 0),
+                    0), 1) as win_rate
+                FROM y
+                WHERE sport IS NOT NULL
+                GROUP BY sport
+            ) sp
+        )
+    ) AS report
+"""
+
+TAX_REPORT_PARAM_TYPES = {"user_id": "integer", "year": "integer"}
+
+
+def _compute_tax_report(conn, user_id: int, year: int) -> dict:
+    """Tax report data for a user/year, shared by the JSON and PDF endpoints."""
+    # Cached briefly: the UI typically asks for the JSON, then the PDF
+    cached = cache_get("tax_report", (user_id, year))
+    if cached is not None:
+        return cached
+    
+    with conn.cursor() as cursor:
+        # Summary and breakdowns in one round trip over a single scan
+        execute_statement(
+            cursor, "export_tax_report", TAX_REPORT_SQL,
+            {"user_id": user_id, "year": year}, TAX_REPORT_PARAM_TYPES
+        )
+        report = cursor.fetchone()['report']
+    
+    summary = report['summary']
+    by_bookmaker = report['by_bookmaker']
+    by_month = report['by_month']
+    by_sport = report['by_sport']
+    
+    # Format for IRS Schedule C
+    result = {
+        "year": year,
+        "summary": {
+            "total_bets": summary['total_bets'],
+            "winning_bets": summary['winning_bets'],
+            "losing_bets": summary['losing_bets'],
+            "push_bets": summary['push_bets'],
+            "total_wagered": float(summary['total_wagered']),
+            "total_winnings": float(summary['total_winnings']),
+            "total_losses": float(summary['total_losses']),
+            "net_profit_loss": float(summary['net_profit_loss']),
+            "win_rate": round((summary['winning_bets'] / summary['total_bets'] * 100), 1) if summary['total_bets'] > 0 else 0
+        },
+        "schedule_c": {
+            "line_1_gross_receipts": float(summary['total_winnings']),
+            "line_28_total_expenses": float(summary['total_losses']),
+            "line_31_net_profit": float(summary['net_profit_loss'])
+        },
+        "by_bookmaker": [
+            {
+                "bookmaker": row['bookmaker_name'] or 'Unknown',
+                "bets": row['bets'],
+                "wagered": float(row['wagered']),
+                "winnings": float(row['winnings']),
+                "losses": float(row['losses']),
+                "net": float(row['net'])
+            }
+            for row in by_bookmaker
+        ],
+        "by_month": [
+            {
+                "month": row['month'].strip(),
+                "month_num": row['month_num'],
+                "bets": row['bets'],
+                "profit_loss": float(row['profit_loss'])
+            }
+            for row in by_month
+        ],
+        "by_sport": [
+            {
+                "sport": row['sport'],
+                "bets": row['bets'],
+                "profit_loss": float(row['profit_loss']),
+                "win_rate": float(row['win_rate'])
+            }
+            for row in by_sport
+        ]
+    }
+    
+    cache_set("tax_report", (user_id, year), result)
+    return result
+
 
 @router.get("/tax-report")
-async def get_tax_report(
+def get_tax_report(
     user_id: int = Query(default=1),
     year: int = Query(default=2024),
     conn = Depends(get_db)
@@ -347,153 +774,82 @@ async def get_tax_report(
     **Use Case:** Year-end tax preparation
     **Returns:** Comprehensive tax summary
     """
-    cursor = None
     try:
-        cursor = conn.cursor()
-        
-        # Get yearly summary
-        cursor.execute("""
-            SELECT 
-                COUNT(*) as total_bets,
-                COUNT(*) FILTER (WHERE status = 'won') as winning_bets,
-                COUNT(*) FILTER (WHERE status = 'lost') as losing_bets,
-                COUNT(*) FILTER (WHERE status = 'push') as push_bets,
-                COALESCE(SUM(stake_amount), 0) as total_wagered,
-                COALESCE(SUM(actual_payout) FILTER (WHERE status = 'won'), 0) as total_winnings,
-                COALESCE(SUM(stake_amount) FILTER (WHERE status = 'lost'), 0) as total_losses,
-                COALESCE(SUM(profit_loss) FILTER (WHERE status IN ('won', 'lost', 'push')), 0) as net_profit_loss
-            FROM bets
-            WHERE user_id = %s
-            AND EXTRACT(YEAR FROM placed_at) = %s
-        """, [user_id, year])
-        
-        summary = cursor.fetchone()
-        
-        # Get breakdown by bookmaker
-        cursor.execute("""
-            SELECT 
-                ba.bookmaker_name,
-                COUNT(*) as bets,
-                COALESCE(SUM(b.stake_amount), 0) as wagered,
-                COALESCE(SUM(b.actual_payout) FILTER (WHERE b.status = 'won'), 0) as winnings,
-                COALESCE(SUM(b.stake_amount) FILTER (WHERE b.status = 'lost'), 0) as losses,
-                COALESCE(SUM(b.profit_loss) FILTER (WHERE b.status IN ('won', 'lost', 'push')), 0) as net
-            FROM bets b
-            LEFT JOIN bankroll_accounts ba ON b.account_id = ba.account_id
-            WHERE b.user_id = %s
-            AND EXTRACT(YEAR FROM b.placed_at) = %s
-            GROUP BY ba.bookmaker_name
-            ORDER BY net DESC
-        """, [user_id, year])
-        
-        by_bookmaker = cursor.fetchall()
-        
-        # Get breakdown by month
-        cursor.execute("""
-            SELECT 
-                TO_CHAR(placed_at, 'Month') as month,
-                EXTRACT(MONTH FROM placed_at) as month_num,
-                COUNT(*) as bets,
-                COALESCE(SUM(profit_loss) FILTER (WHERE status IN ('won', 'lost', 'push')), 0) as profit_loss
-            FROM bets
-            WHERE user_id = %s
-            AND EXTRACT(YEAR FROM placed_at) = %s
-            GROUP BY TO_CHAR(placed_at, 'Month'), EXTRACT(MONTH FROM placed_at)
-            ORDER BY month_num
-        """, [user_id, year])
-        
-        by_month = cursor.fetchall()
-        
-        # Get breakdown by sport
-        cursor.execute("""
-            SELECT 
-                sport,
-                COUNT(*) as bets,
-                COALESCE(SUM(profit_loss) FILTER (WHERE status IN ('won', 'lost', 'push')), 0) as profit_loss,
-                ROUND(
-                    CASE 
-                        WHEN COUNT(*) FILTER (WHERE status IN ('won', 'lost')) > 0 THEN
-                            (COUNT(*) FILTER (WHERE status = 'won')::numeric / 
-                             COUNT(*) FILTER (WHERE status IN ('won', 'lost')) * 100)
-                        ELSE 0
-                    END,
-                1) as win_rate
-            FROM bets
-            WHERE user_id = %s
-            AND EXTRACT(YEAR FROM placed_at) = %s
-            AND sport IS NOT NULL
-            GROUP BY sport
-            ORDER BY profit_loss DESC
-        """, [user_id, year])
-        
-        by_sport = cursor.fetchall()
-        
-        if cursor:
-            cursor.close()
-        
-        # Format for IRS Schedule C
-        return {
-            "year": year,
-            "summary": {
-                "total_bets": summary['total_bets'],
-                "winning_bets": summary['winning_bets'],
-                "losing_bets": summary['losing_bets'],
-                "push_bets": summary['push_bets'],
-                "total_wagered": float(summary['total_wagered']),
-                "total_winnings": float(summary['total_winnings']),
-                "total_losses": float(summary['total_losses']),
-                "net_profit_loss": float(summary['net_profit_loss']),
-                "win_rate": round((summary['winning_bets'] / summary['total_bets'] * 100), 1) if summary['total_bets'] > 0 else 0
-            },
-            "schedule_c": {
-                "line_1_gross_receipts": float(summary['total_winnings']),
-                "line_28_total_expenses": float(summary['total_losses']),
-                "line_31_net_profit": float(summary['net_profit_loss'])
-            },
-            "by_bookmaker": [
-                {
-                    "bookmaker": row['bookmaker_name'] or 'Unknown',
-                    "bets": row['bets'],
-                    "wagered": float(row['wagered']),
-                    "winnings": float(row['winnings']),
-                    "losses": float(row['losses']),
-                    "net": float(row['net'])
-                }
-                for row in by_bookmaker
-            ],
-            "by_month": [
-                {
-                    "month": row['month'].strip(),
-                    "month_num": row['month_num'],
-                    "bets": row['bets'],
-                    "profit_loss": float(row['profit_loss'])
-                }
-                for row in by_month
-            ],
-            "by_sport": [
-                {
-                    "sport": row['sport'],
-                    "bets": row['bets'],
-                    "profit_loss": float(row['profit_loss']),
-                    "win_rate": float(row['win_rate'])
-                }
-                for row in by_sport
-            ]
-        }
+        return _compute_tax_report(conn, user_id, year)
         
     except Exception as e:
-        print(f"❌ Tax Report Error: {str(e)}")
-        traceback.print_exc()
-        if cursor:
-            try:
-                cursor.close()
-            except:
-                pass
+        logger.exception("Tax report failed")
         raise HTTPException(status_code=500, detail=f"Tax report failed: {str(e)}")
 
 
+# PDF paragraph styles, built once and shared by every request
+PDF_STYLES = getSampleStyleSheet()
+
+PDF_TITLE_STYLE = ParagraphStyle(
+    'CustomTitle',
+    parent=PDF_STYLES['Heading1'],
+    fontSize=24,
+    textColor=colors.HexColor('#1e40af'),
+    spaceAfter=30,
+    alignment=TA_CENTER
+)
+
+TAX_TITLE_STYLE = ParagraphStyle(
+    'TaxTitle',
+    parent=PDF_STYLES['Heading1'],
+    fontSize=22,
+    textColor=colors.HexColor('#1e40af'),
+    spaceAfter=20,
+    alignment=TA_CENTER
+)
+
+PDF_FOOTER_STYLE = ParagraphStyle(
+    'Footer',
+    parent=PDF_STYLES['Normal'],
+    fontSize=8,
+    textColor=colors.grey,
+    alignment=TA_CENTER
+)
+
+# Table styles for the PDFs: every colour is parsed once here, not per request
+PDF_HEADER_BLUE = colors.HexColor('#3b82f6')
+
+TAX_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), PDF_HEADER_BLUE),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('BOTTOMPADDING', (0, 0), (-1, 0), 8),
+    ('ALIGN', (1, 0), (-1, -1), 'RIGHT'),
+    ('GRID', (0, 0), (-1, -1), 1, colors.black),
+    ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.lightgrey]),
+])
+
+PDF_SUMMARY_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), PDF_HEADER_BLUE),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, 0), 12),
+    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+    ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+    ('GRID', (0, 0), (-1, -1), 1, colors.black),
+    ('FONTNAME', (0, 1), (0, -1), 'Helvetica-Bold'),
+])
+
+PDF_BOOKMAKER_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), PDF_HEADER_BLUE),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+    ('ALIGN', (1, 0), (-1, -1), 'CENTER'),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, 0), 11),
+    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+    ('GRID', (0, 0), (-1, -1), 1, colors.black),
+    ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.lightgrey]),
+])
+
+
 @router.get("/tax-report/pdf")
-async def download_tax_report_pdf(
+def download_tax_report_pdf(
     user_id: int = Query(default=1),
     year: int = Query(default=2024),
     conn = Depends(get_db)
@@ -505,113 +861,174 @@ async def download_tax_report_pdf(
     **Returns:** PDF file download
     """
     # Get the tax report data
-    tax_data = await get_tax_report(user_id, year, conn)
+    try:
+        tax_data = _compute_tax_report(conn, user_id, year)
+    except Exception as e:
+        logger.exception("Tax report PDF failed")
+        raise HTTPException(status_code=500, detail=f"Tax report failed: {str(e)}")
     
-    # Create simple text-based PDF (we'll upgrade this later)
-    from io import BytesIO
+    summary = tax_data['summary']
+    schedule_c = tax_data['schedule_c']
     
-    # For now, create a formatted text file
     output = BytesIO()
-    content = f"""
-=====================================
-BETTING TAX REPORT - {year}
-=====================================
-
-SUMMARY
--------
-Total Bets: {tax_data['summary']['total_bets']}
-Winning Bets: {tax_data['summary']['winning_bets']}
-Losing Bets: {tax_data['summary']['losing_bets']}
-Win Rate: {tax_data['summary']['win_rate']}%
-
-Total Wagered: ${tax_data['summary']['total_wagered']:,.2f}
-Total Winnings: ${tax_data['summary']['total_winnings']:,.2f}
-Total Losses: ${tax_data['summary']['total_losses']:,.2f}
-Net Profit/Loss: ${tax_data['summary']['net_profit_loss']:,.2f}
-
-=====================================
-IRS SCHEDULE C (Form 1040)
-=====================================
-
-Line 1 - Gross Receipts (Winnings):
-    ${tax_data['schedule_c']['line_1_gross_receipts']:,.2f}
-
-Line 28 - Total Expenses (Losses):
-    ${tax_data['schedule_c']['line_28_total_expenses']:,.2f}
-
-Line 31 - Net Profit (or Loss):
-    ${tax_data['schedule_c']['line_31_net_profit']:,.2f}
-
-=====================================
-BREAKDOWN BY BOOKMAKER
-=====================================
-
-"""
+    doc = SimpleDocTemplate(output, pagesize=letter)
+    story = []
     
-    for bm in tax_data['by_bookmaker']:
-        content += f"""
-{bm['bookmaker']}:
-    Bets: {bm['bets']}
-    Wagered: ${bm['wagered']:,.2f}
-    Winnings: ${bm['winnings']:,.2f}
-    Losses: ${bm['losses']:,.2f}
-    Net: ${bm['net']:,.2f}
-"""
+    def section(heading, data, col_widths):
+        story.append(Paragraph(f"<b>{heading}</b>", PDF_STYLES['Heading2']))
+        story.append(Spacer(1, 0.1*inch))
+        story.append(LongTable(data, colWidths=col_widths, style=TAX_TABLE_STYLE, repeatRows=1))
+        story.append(Spacer(1, 0.3*inch))
     
-    content += """
-=====================================
-MONTHLY BREAKDOWN
-=====================================
-
-"""
+    story.append(Paragraph(f"Betting Tax Report - {year}", TAX_TITLE_STYLE))
     
-    for month in tax_data['by_month']:
-        content += f"{month['month']:12s} - {month['bets']:3d} bets - ${month['profit_loss']:,.2f}\n"
+    section("Summary", [
+        ['Metric', 'Value'],
+        ['Total Bets', str(summary['total_bets'])],
+        ['Winning Bets', str(summary['winning_bets'])],
+        ['Losing Bets', str(summary['losing_bets'])],
+        ['Win Rate', f"{summary['win_rate']}%"],
+        ['Total Wagered', f"${summary['total_wagered']:,.2f}"],
+        ['Total Winnings', f"${summary['total_winnings']:,.2f}"],
+        ['Total Losses', f"${summary['total_losses']:,.2f}"],
+        ['Net Profit/Loss', f"${summary['net_profit_loss']:,.2f}"],
+    ], [3*inch, 2*inch])
     
-    content += """
-=====================================
-BREAKDOWN BY SPORT
-=====================================
-
-"""
+    section("IRS Schedule C (Form 1040)", [
+        ['Line', 'Amount'],
+        ['Line 1 - Gross Receipts (Winnings)', f"${schedule_c['line_1_gross_receipts']:,.2f}"],
+        ['Line 28 - Total Expenses (Losses)', f"${schedule_c['line_28_total_expenses']:,.2f}"],
+        ['Line 31 - Net Profit (or Loss)', f"${schedule_c['line_31_net_profit']:,.2f}"],
+    ], [3.5*inch, 2*inch])
     
-    for sport in tax_data['by_sport']:
-        content += f"""
-{sport['sport']}:
-    Bets: {sport['bets']}
-    Win Rate: {sport['win_rate']}%
-    Net: ${sport['profit_loss']:,.2f}
-"""
+    if tax_data['by_bookmaker']:
+        section("Breakdown by Bookmaker", [
+            ['Bookmaker', 'Bets', 'Wagered', 'Winnings', 'Losses', 'Net']
+        ] + [
+            [
+                bm['bookmaker'],
+                str(bm['bets']),
+                f"${bm['wagered']:,.2f}",
+                f"${bm['winnings']:,.2f}",
+                f"${bm['losses']:,.2f}",
+                f"${bm['net']:,.2f}"
+            ]
+            for bm in tax_data['by_bookmaker']
+        ], [1.7*inch, 0.6*inch, 1.1*inch, 1.1*inch, 1.1*inch, 1.1*inch])
     
-    content += f"""
-
-=====================================
-Generated: {datetime.now().strftime('%B %d, %Y at %I:%M %p')}
-=====================================
-
-DISCLAIMER: This report is for informational purposes only.
-Please consult with a tax professional for proper tax filing.
-The IRS requires reporting of all gambling winnings and losses.
-"""
+    if tax_data['by_month']:
+        section("Monthly Breakdown", [
+            ['Month', 'Bets', 'Profit/Loss']
+        ] + [
+            [month['month'], str(month['bets']), f"${month['profit_loss']:,.2f}"]
+            for month in tax_data['by_month']
+        ], [2*inch, 1*inch, 1.5*inch])
     
-    output.write(content.encode('utf-8'))
-    output.seek(0)
+    if tax_data['by_sport']:
+        section("Breakdown by Sport", [
+            ['Sport', 'Bets', 'Win Rate', 'Net']
+        ] + [
+            [
+                sport['sport'],
+                str(sport['bets']),
+                f"{sport['win_rate']}%",
+                f"${sport['profit_loss']:,.2f}"
+            ]
+            for sport in tax_data['by_sport']
+        ], [2*inch, 1*inch, 1*inch, 1.5*inch])
     
-    filename = f"tax_report_{year}_{datetime.now().strftime('%Y%m%d')}.txt"
+    # Footer
+    story.append(Paragraph(
+        f"Generated on {datetime.now().strftime('%B %d, %Y at %I:%M %p')}<br/>"
+        "This report is for informational purposes only. Please consult with a "
+        "tax professional for proper tax filing. The IRS requires reporting of "
+        "all gambling winnings and losses.",
+        PDF_FOOTER_STYLE
+    ))
+    
+    doc.build(story)
+    output.seek(0)
     
     return StreamingResponse(
-        output,
-        media_type="text/plain",
+        iter_chunks(output),
+        media_type="application/pdf",
         headers={
-            "Content-Disposition": f"attachment; filename={filename}"
+            "Content-Disposition": f'attachment; filename="tax_report_{year}.pdf"'
         }
     )
 
+
+# /excel statements over the filtered bets; WHERE filled in per mask by
+# _export_sql(). The bets sheet's widths come from the by-bookmaker lengths.
+EXCEL_BETS_SQL = """
+    SELECT 
+        b.bet_id,
+        TO_CHAR(b.placed_at, 'YYYY-MM-DD HH24:MI:SS') as placed_at,
+        b.bookmaker_name,
+        b.bet_type,
+        b.sport,
+        b.market_key,
+        b.bet_side,
+        b.line_value,
+        b.odds_american,
+        b.stake_amount,
+        b.potential_payout,
+        b.status,
+        b.actual_payout,
+        b.profit_loss,
+        TO_CHAR(b.settled_at, 'YYYY-MM-DD HH24:MI:SS') as settled_at,
+        b.notes
+    FROM bets b
+    {where}
+    ORDER BY b.placed_at DESC
+"""
+
+EXCEL_BY_BOOKMAKER_SQL = """
+    SELECT 
+        b.bookmaker_name,
+        COUNT(*) as total_bets,
+        COUNT(*) FILTER (WHERE b.is_won) as won_bets,
+        COUNT(*) FILTER (WHERE b.is_lost) as lost_bets,
+        COALESCE(SUM(b.stake_amount), 0)::float8 as total_staked,
+        COALESCE(SUM(b.profit_loss), 0)::float8 as profit_loss,
+        ROUND(COALESCE(
+            100.0 * COUNT(*) FILTER (WHERE b.is_won) /
+            NULLIF(COUNT(*) FILTER (WHERE b.is_won OR b.is_lost), 0),
+        0), 1)::float8 as win_rate,
+        MAX(LENGTH(b.bet_type)) as bet_type_len,
+        MAX(LENGTH(b.sport)) as sport_len,
+        MAX(LENGTH(b.market_key)) as market_len,
+        MAX(LENGTH(b.bet_side)) as side_len,
+        MAX(LENGTH(b.notes)) as notes_len
+    FROM bets b
+    {where}
+    GROUP BY b.bookmaker_name
+    ORDER BY profit_loss DESC
+"""
+
+EXCEL_BY_MARKET_SQL = """
+    SELECT 
+        b.market_key,
+        COUNT(*) as total_bets,
+        COUNT(*) FILTER (WHERE b.is_won) as won_bets,
+        COALESCE(SUM(b.profit_loss), 0)::float8 as profit_loss,
+        ROUND(COALESCE(
+            100.0 * COUNT(*) FILTER (WHERE b.is_won) /
+            NULLIF(COUNT(*) FILTER (WHERE b.is_won OR b.is_lost), 0),
+        0), 1)::float8 as win_rate
+    FROM bets b
+    {where}
+    AND b.market_key IS NOT NULL
+    GROUP BY b.market_key
+    ORDER BY profit_loss DESC
+"""
+
+
 @router.get("/excel")
-async def export_excel(
+def export_excel(
     user_id: int = Query(default=1),
-    start_date: Optional[str] = Query(default=None),
-    end_date: Optional[str] = Query(default=None),
+    start_date: Optional[date] = Query(default=None),
+    end_date: Optional[date] = Query(default=None),
     bookmaker: Optional[str] = Query(default=None),
     market: Optional[str] = Query(default=None),
     status: Optional[str] = Query(default=None),
@@ -623,123 +1040,44 @@ async def export_excel(
     **Use Case:** Advanced analysis with Excel
     **Returns:** Excel (.xlsx) file download
     """
-    cursor = None
     try:
-        cursor = conn.cursor()
-        
-        # Build WHERE clause (same as CSV)
-        where_clauses = ["b.user_id = %s"]
-        params = [user_id]
-        
-        if start_date:
-            where_clauses.append("DATE(b.placed_at) >= %s")
-            params.append(start_date)
-        
-        if end_date:
-            where_clauses.append("DATE(b.placed_at) <= %s")
-            params.append(end_date)
-        
-        if bookmaker:
-            where_clauses.append("ba.bookmaker_name = %s")
-            params.append(bookmaker)
-        
-        if market:
-            where_clauses.append("b.market_key = %s")
-            params.append(market)
-        
-        if status:
-            where_clauses.append("b.status = %s")
-            params.append(status)
-        
-        where_clause = " AND ".join(where_clauses)
-        
-        # Fetch all bets
-        query = f"""
-            SELECT 
-                b.bet_id,
-                TO_CHAR(b.placed_at, 'YYYY-MM-DD HH24:MI:SS') as placed_at,
-                ba.bookmaker_name,
-                b.bet_type,
-                b.sport,
-                b.market_key,
-                b.bet_side,
-                b.line_value,
-                b.odds_american,
-                b.stake_amount,
-                b.potential_payout,
-                b.status,
-                b.actual_payout,
-                b.profit_loss,
-                TO_CHAR(b.settled_at, 'YYYY-MM-DD HH24:MI:SS') as settled_at,
-                b.notes
-            FROM bets b
-            LEFT JOIN bankroll_accounts ba ON b.account_id = ba.account_id
-            WHERE {where_clause}
-            ORDER BY b.placed_at DESC
-        """
-        
-        cursor.execute(query, params)
-        bets = cursor.fetchall()
-        
-        # Get summary by bookmaker
-        cursor.execute(f"""
-            SELECT 
-                ba.bookmaker_name,
-                COUNT(*) as total_bets,
-                COUNT(*) FILTER (WHERE b.status = 'won') as won_bets,
-                COUNT(*) FILTER (WHERE b.status = 'lost') as lost_bets,
-                COALESCE(SUM(b.stake_amount), 0) as total_staked,
-                COALESCE(SUM(b.profit_loss), 0) as profit_loss,
-                ROUND(
-                    CASE 
-                        WHEN COUNT(*) FILTER (WHERE b.status IN ('won', 'lost')) > 0 THEN
-                            (COUNT(*) FILTER (WHERE b.status = 'won')::numeric / 
-                             COUNT(*) FILTER (WHERE b.status IN ('won', 'lost')) * 100)
-                        ELSE 0
-                    END,
-                1) as win_rate
-            FROM bets b
-            LEFT JOIN bankroll_accounts ba ON b.account_id = ba.account_id
-            WHERE {where_clause}
-            GROUP BY ba.bookmaker_name
-            ORDER BY profit_loss DESC
-        """, params)
-        
-        by_bookmaker = cursor.fetchall()
-        
-        # Get summary by market
-        cursor.execute(f"""
-            SELECT 
-                b.market_key,
-                COUNT(*) as total_bets,
-                COUNT(*) FILTER (WHERE b.status = 'won') as won_bets,
-                COALESCE(SUM(b.profit_loss), 0) as profit_loss,
-                ROUND(
-                    CASE 
-                        WHEN COUNT(*) FILTER (WHERE b.status IN ('won', 'lost')) > 0 THEN
-                            (COUNT(*) FILTER (WHERE b.status = 'won')::numeric / 
-                             COUNT(*) FILTER (WHERE b.status IN ('won', 'lost')) * 100)
-                        ELSE 0
-                    END,
-                1) as win_rate
-            FROM bets b
-            WHERE {where_clause}
-            AND b.market_key IS NOT NULL
-            GROUP BY b.market_key
-            ORDER BY profit_loss DESC
-        """, params)
-        
-        by_market = cursor.fetchall()
-        
-        if cursor:
-            cursor.close()
+        params, mask = _filter_params(user_id, {
+            "start_date": start_date,
+            "end_date": end_date,
+            "bookmaker": bookmaker,
+            "market": market,
+            "status": status
+        })
+        
+        with conn.cursor() as cursor:
+            # Get summary by bookmaker
+            execute_statement(
+                cursor,
+                f"export_excel_by_bookmaker_{mask}",
+                _export_sql(EXCEL_BY_BOOKMAKER_SQL, mask),
+                params,
+                BET_FILTER_TYPES
+            )
+            
+            by_bookmaker = cursor.fetchall()
+            
+            # Get summary by market
+            execute_statement(
+                cursor,
+                f"export_excel_by_market_{mask}",
+                _export_sql(EXCEL_BY_MARKET_SQL, mask),
+                params,
+                BET_FILTER_TYPES
+            )
+            
+            by_market = cursor.fetchall()
         
-        # Create Excel workbook
-        wb = Workbook()
+
+        # Create Excel workbook (write-only: rows stream to disk, no Cell objects)
+        wb = Workbook(write_only=True)
         
         # ===== SHEET 1: All Bets =====
-        ws_bets = wb.active
-        ws_bets.title = "All Bets"
+        ws_bets = wb.create_sheet("All Bets")
         
         # Header styling
         header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
@@ -750,114 +1088,124 @@ async def export_excel(
                    'Side', 'Line', 'Odds', 'Stake', 'Potential', 'Status', 
                    'Payout', 'Profit/Loss', 'Settled', 'Notes']
         
-        for col_num, header in enumerate(headers, 1):
-            cell = ws_bets.cell(row=1, column=col_num)
-            cell.value = header
-            cell.fill = header_fill
-            cell.font = header_font
-            cell.alignment = Alignment(horizontal='center')
+        # Column widths: free-text columns fit their longest value (max 50)
+        widths = list(BETS_COLUMN_WIDTHS)
+        measured = {
+            3: max((len(bm['bookmaker_name'] or 'N/A') for bm in by_bookmaker), default=0),
+            4: max((bm['bet_type_len'] or 0 for bm in by_bookmaker), default=0),
+            5: max((bm['sport_len'] or 0 for bm in by_bookmaker), default=0),
+            6: max((bm['market_len'] or 0 for bm in by_bookmaker), default=0),
+            7: max((bm['side_len'] or 0 for bm in by_bookmaker), default=0),
+            16: max((bm['notes_len'] or 0 for bm in by_bookmaker), default=0),
+        }
+        for col_num, length in measured.items():
+            widths[col_num - 1] = min(max(length, len(headers[col_num - 1])) + 2, 50)
+        for col_num, width in enumerate(widths, 1):
+            ws_bets.column_dimensions[get_column_letter(col_num)].width = width
         
-        # Data
-        for row_num, bet in enumerate(bets, 2):
-            ws_bets.cell(row=row_num, column=1, value=bet['bet_id'])
-            ws_bets.cell(row=row_num, column=2, value=bet['placed_at'])
-            ws_bets.cell(row=row_num, column=3, value=bet['bookmaker_name'] or 'N/A')
-            ws_bets.cell(row=row_num, column=4, value=bet['bet_type'])
-            ws_bets.cell(row=row_num, column=5, value=bet['sport'])
-            ws_bets.cell(row=row_num, column=6, value=bet['market_key'])
-            ws_bets.cell(row=row_num, column=7, value=bet['bet_side'])
-            ws_bets.cell(row=row_num, column=8, value=float(bet['line_value']) if bet['line_value'] else '')
-            ws_bets.cell(row=row_num, column=9, value=bet['odds_american'])
-            ws_bets.cell(row=row_num, column=10, value=float(bet['stake_amount']) if bet['stake_amount'] else 0)
-            ws_bets.cell(row=row_num, column=11, value=float(bet['potential_payout']) if bet['potential_payout'] else 0)
-            ws_bets.cell(row=row_num, column=12, value=bet['status'])
-            ws_bets.cell(row=row_num, column=13, value=float(bet['actual_payout']) if bet['actual_payout'] else 0)
-            ws_bets.cell(row=row_num, column=14, value=float(bet['profit_loss']) if bet['profit_loss'] else 0)
-            ws_bets.cell(row=row_num, column=15, value=bet['settled_at'])
-            ws_bets.cell(row=row_num, column=16, value=bet['notes'])
+        ws_bets.append(header_cells(
+            ws_bets, headers, header_fill, header_font, Alignment(horizontal='center')
+        ))
         
-        # Auto-adjust column widths
-        for column in ws_bets.columns:
-            max_length = 0
-            column_letter = get_column_letter(column[0].column)
-            for cell in column:
-                try:
-                    if len(str(cell.value)) > max_length:
-                        max_length = len(str(cell.value))
-                except:
-                    pass
-            adjusted_width = min(max_length + 2, 50)
-            ws_bets.column_dimensions[column_letter].width = adjusted_width
+        # Data: streamed through a server-side cursor instead of fetchall(),
+        # as plain tuple rows so there is no per-row dict in the hot loop
+        with conn.cursor(
+            name="export_excel_bets",
+            cursor_factory=psycopg2.extensions.cursor
+        ) as bets_cursor:
+            bets_cursor.itersize = 5000
+            psycopg2.extensions.register_type(DEC2FLOAT, bets_cursor)
+            bets_cursor.execute(_export_sql(EXCEL_BETS_SQL, mask), params)
+            
+            for (
+                bet_id, placed_at, bookmaker_name, bet_type, sport, market_key,
+                bet_side, line_value, odds_american, stake_amount, potential_payout,
+                bet_status, actual_payout, profit_loss, settled_at, notes
+            ) in bets_cursor:
+                ws_bets.append([
+                    bet_id,
+                    placed_at,
+                    bookmaker_name or 'N/A',
+                    bet_type,
+                    sport,
+                    market_key,
+                    bet_side,
+                    line_value if line_value is not None else '',
+                    odds_american,
+                    stake_amount or 0,
+                    potential_payout or 0,
+                    bet_status,
+                    actual_payout or 0,
+                    profit_loss or 0,
+                    settled_at,
+                    notes
+                ])
         
         # ===== SHEET 2: Summary =====
         ws_summary = wb.create_sheet("Summary")
         
         # Title
-        ws_summary['A1'] = 'BETTING SUMMARY'
-        ws_summary['A1'].font = Font(size=16, bold=True)
-        
-        # Summary stats
-        total_bets = len(bets)
-        won_bets = len([b for b in bets if b['status'] == 'won'])
-        lost_bets = len([b for b in bets if b['status'] == 'lost'])
-        total_staked = sum(float(b['stake_amount'] or 0) for b in bets)
-        total_profit = sum(float(b['profit_loss'] or 0) for b in bets)
+        title_cell = WriteOnlyCell(ws_summary, value='BETTING SUMMARY')
+        title_cell.font = Font(size=16, bold=True)
+        ws_summary.append([title_cell])
+        ws_summary.append([])
+        
+        # Summary stats: totals of the per-bookmaker aggregates
+        total_bets = sum(bm['total_bets'] for bm in by_bookmaker)
+        won_bets = sum(bm['won_bets'] for bm in by_bookmaker)
+        lost_bets = sum(bm['lost_bets'] for bm in by_bookmaker)
+        total_staked = sum(bm['total_staked'] for bm in by_bookmaker)
+        total_profit = sum(bm['profit_loss'] for bm in by_bookmaker)
         win_rate = (won_bets / total_bets * 100) if total_bets > 0 else 0
         
-        ws_summary['A3'] = 'Total Bets:'
-        ws_summary['B3'] = total_bets
-        ws_summary['A4'] = 'Winning Bets:'
-        ws_summary['B4'] = won_bets
-        ws_summary['A5'] = 'Losing Bets:'
-        ws_summary['B5'] = lost_bets
-        ws_summary['A6'] = 'Win Rate:'
-        ws_summary['B6'] = f"{win_rate:.1f}%"
-        ws_summary['A7'] = 'Total Staked:'
-        ws_summary['B7'] = total_staked
-        ws_summary['B7'].number_format = '$#,##0.00'
-        ws_summary['A8'] = 'Total Profit/Loss:'
-        ws_summary['B8'] = total_profit
-        ws_summary['B8'].number_format = '$#,##0.00'
-        
-        # Style
-        for row in range(3, 9):
-            ws_summary[f'A{row}'].font = Font(bold=True)
+        label_font = Font(bold=True)
+        for label, value, number_format in (
+            ('Total Bets:', total_bets, None),
+            ('Winning Bets:', won_bets, None),
+            ('Losing Bets:', lost_bets, None),
+            ('Win Rate:', round(win_rate, 1), PERCENT_FORMAT),
+            ('Total Staked:', total_staked, MONEY_FORMAT),
+            ('Total Profit/Loss:', total_profit, MONEY_FORMAT),
+        ):
+            label_cell = WriteOnlyCell(ws_summary, value=label)
+            label_cell.font = label_font
+            if number_format:
+                value_cell = number_cell(ws_summary, value, number_format)
+            else:
+                value_cell = value
+            ws_summary.append([label_cell, value_cell])
         
         # ===== SHEET 3: By Bookmaker =====
         ws_bookmaker = wb.create_sheet("By Bookmaker")
         
-        headers_bm = ['Bookmaker', 'Total Bets', 'Won', 'Lost', 'Staked', 'Profit/Loss', 'Win Rate %']
-        for col_num, header in enumerate(headers_bm, 1):
-            cell = ws_bookmaker.cell(row=1, column=col_num)
-            cell.value = header
-            cell.fill = header_fill
-            cell.font = header_font
-        
-        for row_num, bm in enumerate(by_bookmaker, 2):
-            ws_bookmaker.cell(row=row_num, column=1, value=bm['bookmaker_name'] or 'Unknown')
-            ws_bookmaker.cell(row=row_num, column=2, value=bm['total_bets'])
-            ws_bookmaker.cell(row=row_num, column=3, value=bm['won_bets'])
-            ws_bookmaker.cell(row=row_num, column=4, value=bm['lost_bets'])
-            ws_bookmaker.cell(row=row_num, column=5, value=float(bm['total_staked']))
-            ws_bookmaker.cell(row=row_num, column=6, value=float(bm['profit_loss']))
-            ws_bookmaker.cell(row=row_num, column=7, value=float(bm['win_rate']))
+        headers_bm = ['Bookmaker', 'Total Bets', 'Won', 'Lost', 'Staked', 'Profit/Loss', 'Win Rate']
+        ws_bookmaker.append(header_cells(ws_bookmaker, headers_bm, header_fill, header_font))
+        
+        for bm in by_bookmaker:
+            ws_bookmaker.append([
+                bm['bookmaker_name'] or 'Unknown',
+                bm['total_bets'],
+                bm['won_bets'],
+                bm['lost_bets'],
+                number_cell(ws_bookmaker, bm['total_staked'], MONEY_FORMAT),
+                number_cell(ws_bookmaker, bm['profit_loss'], MONEY_FORMAT),
+                number_cell(ws_bookmaker, bm['win_rate'], PERCENT_FORMAT)
+            ])
         
         # ===== SHEET 4: By Market =====
         ws_market = wb.create_sheet("By Market")
         
-        headers_mk = ['Market', 'Total Bets', 'Won', 'Profit/Loss', 'Win Rate %']
-        for col_num, header in enumerate(headers_mk, 1):
-            cell = ws_market.cell(row=1, column=col_num)
-            cell.value = header
-            cell.fill = header_fill
-            cell.font = header_font
+        headers_mk = ['Market', 'Total Bets', 'Won', 'Profit/Loss', 'Win Rate']
+        ws_market.append(header_cells(ws_market, headers_mk, header_fill, header_font))
         
-        for row_num, mk in enumerate(by_market, 2):
-            ws_market.cell(row=row_num, column=1, value=mk['market_key'])
-            ws_market.cell(row=row_num, column=2, value=mk['total_bets'])
-            ws_market.cell(row=row_num, column=3, value=mk['won_bets'])
-            ws_market.cell(row=row_num, column=4, value=float(mk['profit_loss']))
-            ws_market.cell(row=row_num, column=5, value=float(mk['win_rate']))
+        for mk in by_market:
+            ws_market.append([
+                mk['market_key'],
+                mk['total_bets'],
+                mk['won_bets'],
+                number_cell(ws_market, mk['profit_loss'], MONEY_FORMAT),
+                number_cell(ws_market, mk['win_rate'], PERCENT_FORMAT)
+            ])
         
         # Save to BytesIO
         output = BytesIO()
@@ -866,8 +1214,10 @@ async def export_excel(
         
         filename = f"bets_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
         
+        # .xlsx is already a deflated zip, so it isn't gzipped again; send it
+        # in fixed-size chunks rather than BytesIO's newline-split iteration
         return StreamingResponse(
-            output,
+            iter_chunks(output),
             media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
             headers={
                 "Content-Disposition": f"attachment; filename={filename}"
@@ -875,20 +1225,47 @@ async def export_excel(
         )
         
     except Exception as e:
-        print(f"❌ Excel Export Error: {str(e)}")
-        traceback.print_exc()
-        if cursor:
-            try:
-                cursor.close()
-            except:
-                pass
+        logger.exception("Excel export failed for user %s", user_id)
         raise HTTPException(status_code=500, detail=f"Excel export failed: {str(e)}")
 
+
+# /pdf-report summary (the grand-total grouping set) plus by-bookmaker rows
+# in one pass over the daily roll-up (sql/migrations/003)
+PDF_SUMMARY_SQL = """
+    SELECT 
+        GROUPING(ba.bookmaker_name) = 1 as is_total,
+        ba.bookmaker_name,
+        COALESCE(SUM(s.n), 0)::bigint as total_bets,
+        COALESCE(SUM(s.n) FILTER (WHERE s.status = 'won'), 0)::bigint as won_bets,
+        COALESCE(SUM(s.n) FILTER (WHERE s.status = 'lost'), 0)::bigint as lost_bets,
+        COALESCE(SUM(s.n) FILTER (WHERE s.status = 'push'), 0)::bigint as push_bets,
+        COALESCE(SUM(s.n) FILTER (WHERE s.status = 'pending'), 0)::bigint as pending_bets,
+        COALESCE(SUM(s.stake_sum), 0)::float8 as total_staked,
+        COALESCE(SUM(s.pl_sum) FILTER (WHERE s.status IN ('won', 'lost', 'push')), 0)::float8 as total_profit,
+        COALESCE(SUM(s.pl_sum), 0)::float8 as profit_loss,
+        ROUND(
+            CASE 
+                WHEN SUM(s.n) FILTER (WHERE s.status IN ('won', 'lost')) > 0 THEN
+                    (COALESCE(SUM(s.n) FILTER (WHERE s.status = 'won'), 0)::numeric / 
+                     SUM(s.n) FILTER (WHERE s.status IN ('won', 'lost')) * 100)
+                ELSE 0
+            END,
+        1)::float8 as win_rate,
+        MIN(s.day) as earliest_bet,
+        MAX(s.day) as latest_bet
+    FROM mv_bet_summary_daily s
+    LEFT JOIN bankroll_accounts ba ON s.account_id = ba.account_id
+    {where}
+    GROUP BY GROUPING SETS ((ba.bookmaker_name), ())
+    ORDER BY is_total DESC, profit_loss DESC
+"""
+
+
 @router.get("/pdf-report")
-async def export_pdf_report(
+def export_pdf_report(
     user_id: int = Query(default=1),
-    start_date: Optional[str] = Query(default=None),
-    end_date: Optional[str] = Query(default=None),
+    start_date: Optional[date] = Query(default=None),
+    end_date: Optional[date] = Query(default=None),
     report_type: str = Query(default="summary"),  # 'summary', 'detailed', 'tax'
     conn = Depends(get_db)
 ):
@@ -898,91 +1275,29 @@ async def export_pdf_report(
     **Use Case:** Professional formatted reports
     **Returns:** PDF file download
     """
-    cursor = None
     try:
-        cursor = conn.cursor()
-        
-        # Build WHERE clause
-        where_clauses = ["b.user_id = %s"]
-        params = [user_id]
-        
-        if start_date:
-            where_clauses.append("DATE(b.placed_at) >= %s")
-            params.append(start_date)
-        
-        if end_date:
-            where_clauses.append("DATE(b.placed_at) <= %s")
-            params.append(end_date)
-        
-        where_clause = " AND ".join(where_clauses)
-        
-        # Get summary data
-        cursor.execute(f"""
-            SELECT 
-                COUNT(*) as total_bets,
-                COUNT(*) FILTER (WHERE status = 'won') as won_bets,
-                COUNT(*) FILTER (WHERE status = 'lost') as lost_bets,
-                COUNT(*) FILTER (WHERE status = 'push') as push_bets,
-                COUNT(*) FILTER (WHERE status = 'pending') as pending_bets,
-                COALESCE(SUM(stake_amount), 0) as total_staked,
-                COALESCE(SUM(profit_loss) FILTER (WHERE status IN ('won', 'lost', 'push')), 0) as total_profit,
-                ROUND(
-                    CASE 
-                        WHEN COUNT(*) FILTER (WHERE status IN ('won', 'lost')) > 0 THEN
-                            (COUNT(*) FILTER (WHERE status = 'won')::numeric / 
-                             COUNT(*) FILTER (WHERE status IN ('won', 'lost')) * 100)
-                        ELSE 0
-                    END,
-                1) as win_rate,
-                MIN(DATE(placed_at)) as earliest_bet,
-                MAX(DATE(placed_at)) as latest_bet
-            FROM bets b
-            WHERE {where_clause}
-        """, params)
-        
-        summary = cursor.fetchone()
-        
-        # Get by bookmaker
-        cursor.execute(f"""
-            SELECT 
-                ba.bookmaker_name,
-                COUNT(*) as bets,
-                COALESCE(SUM(b.profit_loss), 0) as profit_loss,
-                ROUND(
-                    CASE 
-                        WHEN COUNT(*) FILTER (WHERE b.status IN ('won', 'lost')) > 0 THEN
-                            (COUNT(*) FILTER (WHERE b.status = 'won')::numeric / 
-                             COUNT(*) FILTER (WHERE b.status IN ('won', 'lost')) * 100)
-                        ELSE 0
-                    END,
-                1) as win_rate
-            FROM bets b
-            LEFT JOIN bankroll_accounts ba ON b.account_id = ba.account_id
-            WHERE {where_clause}
-            GROUP BY ba.bookmaker_name
-            ORDER BY profit_loss DESC
-        """, params)
-        
-        by_bookmaker = cursor.fetchall()
+        # Aggregates only, so read the daily roll-up (sql/migrations/003)
+        # rather than scanning bets
+        params, mask = _filter_params(
+            user_id,
+            {"start_date": start_date, "end_date": end_date},
+            SUMMARY_FILTERS
+        )
         
-        if cursor:
-            cursor.close()
+        with conn.cursor() as cursor:
+            traced_execute(
+                cursor,
+                _export_sql(PDF_SUMMARY_SQL, mask, SUMMARY_FILTERS, "s.user_id"),
+                params
+            )
+            
+            # The grand total always comes back, even when nothing matches
+            summary, *by_bookmaker = cursor.fetchall()
         
         # Create PDF
         output = BytesIO()
         doc = SimpleDocTemplate(output, pagesize=letter)
         story = []
-        styles = getSampleStyleSheet()
-        
-        # Title
-        title_style = ParagraphStyle(
-            'CustomTitle',
-            parent=styles['Heading1'],
-            fontSize=24,
-            textColor=colors.HexColor('#1e40af'),
-            spaceAfter=30,
-            alignment=TA_CENTER
-        )
         
         date_range = ""
         if start_date and end_date:
@@ -994,12 +1309,12 @@ async def export_pdf_report(
         else:
             date_range = "All Time"
         
-        story.append(Paragraph("Betting Performance Report", title_style))
-        story.append(Paragraph(f"<i>{date_range}</i>", styles['Normal']))
+        story.append(Paragraph("Betting Performance Report", PDF_TITLE_STYLE))
+        story.append(Paragraph(f"<i>{date_range}</i>", PDF_STYLES['Normal']))
         story.append(Spacer(1, 0.5*inch))
         
         # Summary Section
-        story.append(Paragraph("<b>Summary Statistics</b>", styles['Heading2']))
+        story.append(Paragraph("<b>Summary Statistics</b>", PDF_STYLES['Heading2']))
         story.append(Spacer(1, 0.2*inch))
         
         summary_data = [
@@ -1010,67 +1325,46 @@ async def export_pdf_report(
             ['Push Bets', str(summary['push_bets'])],
             ['Pending Bets', str(summary['pending_bets'])],
             ['Win Rate', f"{summary['win_rate']}%"],
-            ['Total Staked', f"${float(summary['total_staked']):,.2f}"],
-            ['Total Profit/Loss', f"${float(summary['total_profit']):,.2f}"],
+            ['Total Staked', f"${summary['total_staked']:,.2f}"],
+            ['Total Profit/Loss', f"${summary['total_profit']:,.2f}"],
         ]
         
         summary_table = Table(summary_data, colWidths=[3*inch, 2*inch])
-        summary_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#3b82f6')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 12),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black),
-            ('FONTNAME', (0, 1), (0, -1), 'Helvetica-Bold'),
-        ]))
+        summary_table.setStyle(PDF_SUMMARY_TABLE_STYLE)
         
         story.append(summary_table)
         story.append(Spacer(1, 0.5*inch))
         
         # Performance by Bookmaker
         if by_bookmaker:
-            story.append(Paragraph("<b>Performance by Bookmaker</b>", styles['Heading2']))
+            story.append(Paragraph("<b>Performance by Bookmaker</b>", PDF_STYLES['Heading2']))
             story.append(Spacer(1, 0.2*inch))
             
             bookmaker_data = [['Bookmaker', 'Bets', 'Win Rate', 'Profit/Loss']]
             for bm in by_bookmaker:
                 bookmaker_data.append([
                     bm['bookmaker_name'] or 'Unknown',
-                    str(bm['bets']),
+                    str(bm['total_bets']),
                     f"{bm['win_rate']}%",
-                    f"${float(bm['profit_loss']):,.2f}"
+                    f"${bm['profit_loss']:,.2f}"
                 ])
             
-            bookmaker_table = Table(bookmaker_data, colWidths=[2*inch, 1*inch, 1*inch, 1.5*inch])
-            bookmaker_table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#3b82f6')),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (1, 0), (-1, -1), 'CENTER'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, 0), 11),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                ('GRID', (0, 0), (-1, -1), 1, colors.black),
-                ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.lightgrey]),
-            ]))
+            # LongTable: lays out row by row and repeats the header across pages
+            bookmaker_table = LongTable(
+                bookmaker_data,
+                colWidths=[2*inch, 1*inch, 1*inch, 1.5*inch],
+                repeatRows=1
+            )
+            bookmaker_table.setStyle(PDF_BOOKMAKER_TABLE_STYLE)
             
             story.append(bookmaker_table)
         
         # Footer
         story.append(Spacer(1, 1*inch))
-        footer_style = ParagraphStyle(
-            'Footer',
-            parent=styles['Normal'],
-            fontSize=8,
-            textColor=colors.grey,
-            alignment=TA_CENTER
-        )
         story.append(Paragraph(
             f"Generated on {datetime.now().strftime('%B %d, %Y at %I:%M %p')}<br/>"
             "SmartLine Bankroll Manager",
-            footer_style
+            PDF_FOOTER_STYLE
         ))
         
         # Build PDF
@@ -1080,7 +1374,7 @@ async def export_pdf_report(
         filename = f"betting_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
         
         return StreamingResponse(
-            output,
+            iter_chunks(output),
             media_type="application/pdf",
             headers={
                 "Content-Disposition": f"attachment; filename={filename}"
@@ -1088,11 +1382,5 @@ async def export_pdf_report(
         )
         
     except Exception as e:
-        print(f"❌ PDF Export Error: {str(e)}")
-        traceback.print_exc()
-        if cursor:
-            try:
-                cursor.close()
-            except:
-                pass
+        logger.exception("PDF export failed for user %s", user_id)
         raise HTTPException(status_code=500, detail=f"PDF export failed: {str(e)}")
@@ -10,33 +10,44 @@ Endpoints:
 - GET /statistics/players/{player_id}/rankings - Get player's season rankings (NEW)
 """
 
+from contextlib import contextmanager
 from typing import Optional, List
 from datetime import datetime
 import psycopg2
 from fastapi import APIRouter, HTTPException, Query, Path
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
-import os
+from app.database import get_connection, release_connection
+from app.cache import cache_get, cache_set
 
 # Initialize router
-router = APIRouter(prefix="/statistics", tags=["Game Player Statistics"])
+# orjson serializes the nested stat payloads (datetimes included) in C
+router = APIRouter(
+    prefix="/statistics",
+    tags=["Game Player Statistics"],
+    default_response_class=ORJSONResponse
+)
 
 
 # ==================== Database Connection ====================
 
+@contextmanager
 def get_conn():
-    """Get database connection"""
-    return psycopg2.connect(
-        host=os.environ["PGHOST"],
-        dbname=os.environ["PGDATABASE"],
-        user=os.environ["PGUSER"],
-        password=os.environ["PGPASSWORD"],
-        port=os.environ.get("PGPORT", 5432)
-    )
+    """Borrow a pooled connection; commits or rolls back, then returns it"""
+    conn = get_connection()
+    try:
+        with conn:
+            yield conn
+    finally:
+        release_connection(conn)
 
 
 # =========================================================
 # Response Models
 # =========================================================
+# Handlers build these with model_construct(): the fields come straight
+# from typed SQL columns, and FastAPI validates the response_model on the
+# way out anyway, so validating on construction too is wasted work.
 
 class PlayerGameStat(BaseModel):
     """Model for a single player statistic."""
@@ -103,131 +114,100 @@ class PlayerRankingsResponse(BaseModel):
 # Endpoints
 # =========================================================
 
-@router.get(
-    "/players/{player_id}/games",
-    response_model=PlayerGameStatsResponse,
-    summary="Get Game-by-Game Statistics for a Player"
-)
-async def get_player_game_statistics(
-    player_id: int = Path(..., description="Player ID"),
-    season: Optional[int] = Query(None, description="Filter by season year"),
-    stat_group: Optional[str] = Query(
-        None,
-        description="Filter by stat group (Passing, Rushing, etc.)"
-    ),
-    limit: int = Query(20, ge=1, le=100, description="Maximum games to return")
-):
-    """
-    Get game-by-game statistics for a specific player.
-    
-    Optionally filter by season and/or stat group.
-    """
-    query = """
-        WITH recent_games AS (
-            SELECT
-                g.game_id,
-                g.game_datetime_utc
+# One row per request: the player plus their recent games, each with its
+# stat groups already nested as JSON, so the handler does no grouping
+PLAYER_GAMES_SQL = """
+    WITH recent_games AS (
+        SELECT
+            pg.game_id,
+            g.week,
+            pg.game_datetime_utc,
+            pg.season_year AS season,
+            g.home_team_id,
+            g.away_team_id
+        FROM (
+            SELECT DISTINCT gps.game_id, gps.game_datetime_utc, gps.season_year
             FROM game_player_statistics gps
-            JOIN game g ON gps.game_id = g.game_id
-            JOIN season s ON g.season_id = s.season_id
-            WHERE gps.player_id = %s
-            AND s.year = %s
-            GROUP BY g.game_id, g.game_datetime_utc
-            ORDER BY g.game_datetime_utc DESC
-            LIMIT %s
-        )
+            WHERE gps.player_id = %(player_id)s
+            {season_filter}
+            {stat_group_filter}
+            {before_filter}
+            ORDER BY gps.game_datetime_utc DESC
+            LIMIT %(limit)s
+        ) pg
+        JOIN game g ON pg.game_id = g.game_id
+    ),
+    game_stat_groups AS (
         SELECT
             gps.game_id,
-            g.week,
-            g.game_datetime_utc,
-            s.year AS season,
+            gps.team_id,
             gps.stat_group,
-            gps.metric_name,
-            gps.metric_value,
+            json_agg(
+                json_build_object(
+                    'metric_name', gps.metric_name,
+                    'metric_value', gps.metric_value
+                ) ORDER BY gps.metric_name
+            ) AS metrics
+        FROM game_player_statistics gps
+        JOIN recent_games rg ON gps.game_id = rg.game_id
+        WHERE gps.player_id = %(player_id)s
+        {stat_group_filter}
+        GROUP BY gps.game_id, gps.team_id, gps.stat_group
+    ),
+    games AS (
+        SELECT
+            rg.game_id,
+            rg.week,
+            rg.game_datetime_utc AS game_date,
+            rg.season,
             t.name AS team_name,
             t.abbrev AS team_abbrev,
             CASE
-                WHEN gps.team_id = g.home_team_id THEN at.name
+                WHEN gsg.team_id = rg.home_team_id THEN at.name
                 ELSE ht.name
-            END AS opponent_name,
+            END AS opponent,
             CASE
-                WHEN gps.team_id = g.home_team_id THEN at.abbrev
+                WHEN gsg.team_id = rg.home_team_id THEN at.abbrev
                 ELSE ht.abbrev
             END AS opponent_abbrev,
-            p.full_name AS player_name,
-            p.position
-        FROM game_player_statistics gps
-        JOIN recent_games rg ON gps.game_id = rg.game_id
-        JOIN game g ON gps.game_id = g.game_id
-        JOIN season s ON g.season_id = s.season_id
-        JOIN player p ON gps.player_id = p.player_id
-        JOIN team t ON gps.team_id = t.team_id
-        JOIN team ht ON g.home_team_id = ht.team_id
-        JOIN team at ON g.away_team_id = at.team_id
-        WHERE gps.player_id = %s          -- 🔥 THIS WAS MISSING
-        ORDER BY rg.game_datetime_utc DESC;
-    """
-    
-    params = [player_id, season, limit, player_id]
-    
-    try:
-        with get_conn() as conn:
-            with conn.cursor() as cur:
-                cur.execute(query, tuple(params))
-                rows = cur.fetchall()
-                
-                if not rows:
-                    raise HTTPException(
-                        status_code=404,
-                        detail=f"No statistics found for player {player_id}"
-                    )
-                
-                columns = [desc[0] for desc in cur.description]
-                stats = [dict(zip(columns, row)) for row in rows]
-                
-                # Group by game
-                games_dict = {}
-                player_name = stats[0]['player_name']
-                position = stats[0]['position']
-                
-                for stat in stats:
-                    game_id = stat['game_id']
-                    if game_id not in games_dict:
-                        games_dict[game_id] = {
-                            'game_id': game_id,
-                            'week': stat['week'],
-                            'game_date': stat['game_datetime_utc'],
-                            'season': stat['season'],
-                            'team_name': stat['team_name'],
-                            'team_abbrev': stat['team_abbrev'],
-                            'opponent': stat['opponent_name'],
-                            'opponent_abbrev': stat['opponent_abbrev'],
-                            'stat_groups': {}
-                        }
-                    
-                    stat_group = stat['stat_group']
-                    if stat_group not in games_dict[game_id]['stat_groups']:
-                        games_dict[game_id]['stat_groups'][stat_group] = []
-                    
-                    games_dict[game_id]['stat_groups'][stat_group].append({
-                        'metric_name': stat['metric_name'],
-                        'metric_value': stat['metric_value']
-                    })
-                
-                return PlayerGameStatsResponse(
-                    player_id=player_id,
-                    player_name=player_name,
-                    position=position,
-                    season=season,
-                    game_count=len(games_dict),
-                    games=list(games_dict.values())
-                )
-                
-    except psycopg2.Error as e:
-        raise HTTPException(
-            status_code=500,
-            detail=f"Database error: {str(e)}"
-        )
+            json_object_agg(gsg.stat_group, gsg.metrics ORDER BY gsg.stat_group) AS stat_groups
+        FROM game_stat_groups gsg
+        JOIN recent_games rg ON gsg.game_id = rg.game_id
+        JOIN team t ON gsg.team_id = t.team_id
+        JOIN team ht ON rg.home_team_id = ht.team_id
+        JOIN team at ON rg.away_team_id = at.team_id
+        GROUP BY
+            rg.game_id, rg.week, rg.game_datetime_utc, rg.season,
+            rg.home_team_id, gsg.team_id, t.name, t.abbrev,
+            ht.name, ht.abbrev, at.name, at.abbrev
+    )
+    SELECT
+        p.full_name AS player_name,
+        p.position,
+        COUNT(*) AS game_count,
+        json_agg(gm ORDER BY gm.game_date DESC) AS games
+    FROM player p
+    CROSS JOIN games gm
+    WHERE p.player_id = %(player_id)s
+    GROUP BY p.player_id, p.full_name, p.position
+"""
+
+# Filters are spliced in once at import: one fixed SQL text per combination
+SEASON_FILTER = "AND gps.season_year = %(season)s"
+STAT_GROUP_FILTER = "AND gps.stat_group = %(stat_group)s"
+
+BEFORE_FILTER = "AND gps.game_datetime_utc < %(before)s"
+
+PLAYER_GAMES_QUERIES = {
+    (has_season, has_stat_group, has_before): PLAYER_GAMES_SQL.format(
+        season_filter=SEASON_FILTER if has_season else "",
+        stat_group_filter=STAT_GROUP_FILTER if has_stat_group else "",
+        before_filter=BEFORE_FILTER if has_before else ""
+    )
+    for has_season in (False, True)
+    for has_stat_group in (False, True)
+    for has_before in (False, True)
+}
 
 
 @router.get(
@@ -235,125 +215,61 @@ async def get_player_game_statistics(
     response_model=PlayerGameStatsResponse,
     summary="Get Game-by-Game Statistics for a Player"
 )
-async def get_player_game_statistics(
+def get_player_game_statistics(
     player_id: int = Path(..., description="Player ID"),
     season: Optional[int] = Query(None, description="Filter by season year"),
     stat_group: Optional[str] = Query(
         None,
         description="Filter by stat group (Passing, Rushing, etc.)"
     ),
-    limit: int = Query(20, ge=1, le=100, description="Maximum games to return")
+    limit: int = Query(20, ge=1, le=100, description="Maximum games to return"),
+    before: Optional[datetime] = Query(
+        None,
+        description="Only games before this kickoff (the last game_date of the previous page)"
+    )
 ):
     """
     Get game-by-game statistics for a specific player.
     
-    Optionally filter by season and/or stat group.
+    Optionally filter by season and/or stat group. Pages go newest first;
+    pass the last game's game_date as `before` to fetch the next page.
     """
-    # Build the base query
-    base_query = """
-        SELECT 
-            gps.game_id,
-            g.week,
-            g.game_datetime_utc,
-            s.year as season,
-            gps.stat_group,
-            gps.metric_name,
-            gps.metric_value,
-            t.name as team_name,
-            t.abbrev as team_abbrev,
-            CASE 
-                WHEN gps.team_id = g.home_team_id THEN at.name
-                ELSE ht.name
-            END as opponent_name,
-            CASE 
-                WHEN gps.team_id = g.home_team_id THEN at.abbrev
-                ELSE ht.abbrev
-            END as opponent_abbrev,
-            p.full_name as player_name,
-            p.position
-        FROM game_player_statistics gps
-        JOIN game g ON gps.game_id = g.game_id
-        JOIN season s ON g.season_id = s.season_id
-        JOIN player p ON gps.player_id = p.player_id
-        JOIN team t ON gps.team_id = t.team_id
-        LEFT JOIN team ht ON g.home_team_id = ht.team_id
-        LEFT JOIN team at ON g.away_team_id = at.team_id
-        WHERE gps.player_id = %s
-    """
-    
-    params = [player_id]
-    filters = []
-    
-    if season:
-        filters.append("s.year = %s")
-        params.append(season)
-    
-    if stat_group:
-        filters.append("gps.stat_group = %s")
-        params.append(stat_group)
+    cache_key = (player_id, season, stat_group, limit, before)
+    cached = cache_get("player_games", cache_key)
+    if cached is not None:
+        return cached
     
-    if filters:
-        base_query += " AND " + " AND ".join(filters)
-    
-    base_query += """
-        ORDER BY g.game_datetime_utc DESC, gps.stat_group, gps.metric_name
-        LIMIT %s
-    """
-    params.append(limit)
+    query = PLAYER_GAMES_QUERIES[bool(season), bool(stat_group), before is not None]
+    params = {
+        "player_id": player_id,
+        "season": season,
+        "stat_group": stat_group,
+        "limit": limit,
+        "before": before
+    }
     
     try:
         with get_conn() as conn:
             with conn.cursor() as cur:
-                cur.execute(base_query, tuple(params))
-                rows = cur.fetchall()
+                cur.execute(query, params)
+                row = cur.fetchone()
                 
-                if not rows:
+                if not row:
                     raise HTTPException(
                         status_code=404,
                         detail=f"No statistics found for player {player_id}"
                     )
                 
-                columns = [desc[0] for desc in cur.description]
-                stats = [dict(zip(columns, row)) for row in rows]
-                
-                # Extract player info
-                player_name = stats[0]['player_name']
-                position = stats[0]['position']
-                
-                # Group by game
-                games_dict = {}
-                for stat in stats:
-                    game_id = stat['game_id']
-                    if game_id not in games_dict:
-                        games_dict[game_id] = {
-                            'game_id': game_id,
-                            'week': stat['week'],
-                            'game_date': stat['game_datetime_utc'],
-                            'season': stat['season'],
-                            'team_name': stat['team_name'],
-                            'team_abbrev': stat['team_abbrev'],
-                            'opponent': stat['opponent_name'],
-                            'opponent_abbrev': stat['opponent_abbrev'],
-                            'stat_groups': {}
-                        }
-                    
-                    stat_group = stat['stat_group']
-                    if stat_group not in games_dict[game_id]['stat_groups']:
-                        games_dict[game_id]['stat_groups'][stat_group] = []
-                    
-                    games_dict[game_id]['stat_groups'][stat_group].append({
-                        'metric_name': stat['metric_name'],
-                        'metric_value': stat['metric_value']
-                    })
-                
-                return PlayerGameStatsResponse(
+                response = PlayerGameStatsResponse.model_construct(
                     player_id=player_id,
-                    player_name=player_name,
-                    position=position,
+                    player_name=row['player_name'],
+                    position=row['position'],
                     season=season,
-                    game_count=len(games_dict),
-                    games=list(games_dict.values())
+                    game_count=row['game_count'],
+                    games=row['games']
                 )
+                cache_set("player_games", cache_key, response)
+                return response
                 
     except psycopg2.Error as e:
         raise HTTPException(
@@ -362,12 +278,94 @@ async def get_player_game_statistics(
         )
 
 
+# Relevant stat groups and metrics by position
+POSITION_METRICS = {
+    'QB': {
+        'Passing': ['yards', 'passing touch downs', 'rating', 'interceptions', 'comp att']
+    },
+    'RB': {
+        'Rushing': ['yards', 'rushing touch downs', 'average', 'total rushes'],
+        'Receiving': ['yards', 'receiving touch downs', 'receptions']
+    },
+    'WR': {
+        'Receiving': ['yards', 'receiving touch downs', 'receptions', 'targets']
+    },
+    'TE': {
+        'Receiving': ['yards', 'receiving touch downs', 'receptions', 'targets']
+    },
+    'K': {
+        'Kicking': ['field goals made', 'field goal pct', 'extra points made']
+    },
+    'P': {
+        'Punting': ['average', 'gross avg', 'inside 20']
+    },
+    'DB': {
+        'Defense': ['tackles', 'interceptions', 'passes defended']
+    },
+    'CB': {
+        'Defense': ['tackles', 'interceptions', 'passes defended']
+    },
+    'S': {
+        'Defense': ['tackles', 'interceptions', 'passes defended']
+    },
+    'LB': {
+        'Defense': ['tackles', 'sacks', 'tfl']
+    },
+    'DL': {
+        'Defense': ['tackles', 'sacks', 'tfl']
+    },
+    'DE': {
+        'Defense': ['tackles', 'sacks', 'tfl', 'qb hts']
+    },
+    'DT': {
+        'Defense': ['tackles', 'sacks', 'tfl']
+    }
+}
+
+# Season totals (sql/migrations/012), ranked within each
+# (stat_group, metric_name) pair passed in as parallel arrays; ties on rank
+# keep the POSITION_METRICS order via the arrays' ordinality
+RANKINGS_SQL = """
+    WITH ranked_players AS (
+        SELECT 
+            f.metric_order,
+            t.stat_group,
+            t.metric_name,
+            t.player_id,
+            t.total_value,
+            RANK() OVER (
+                PARTITION BY t.stat_group, t.metric_name
+                ORDER BY t.total_value DESC
+            ) as rank,
+            COUNT(*) OVER (PARTITION BY t.stat_group, t.metric_name) as total_players
+        FROM UNNEST(%(stat_groups)s::text[], %(metric_names)s::text[])
+            WITH ORDINALITY AS f(stat_group, metric_name, metric_order)
+        JOIN mv_player_season_totals t
+            ON t.stat_group = f.stat_group
+           AND t.metric_name = f.metric_name
+        WHERE t.season_year = %(season)s
+          AND t.position = %(position)s
+          AND t.total_value > 0
+    )
+    SELECT 
+        stat_group,
+        metric_name,
+        total_value,
+        rank,
+        total_players
+    FROM ranked_players
+    WHERE player_id = %(player_id)s
+      AND rank <= 10
+    ORDER BY rank, metric_order
+"""
+
+
 @router.get(
     "/players/{player_id}/rankings",
     response_model=PlayerRankingsResponse,
     summary="Get Player Season Rankings by Position"
 )
-async def get_player_season_rankings(
+def get_player_season_rankings(
     player_id: int = Path(..., description="Player ID"),
     season: int = Query(..., description="Season year"),
     position: Optional[str] = Query(None, description="Override position for comparison")
@@ -383,6 +381,11 @@ async def get_player_season_rankings(
     - /statistics/players/1349/rankings?season=2023&position=QB
     """
     
+    cache_key = (player_id, season, position)
+    cached = cache_get("player_rankings", cache_key)
+    if cached is not None:
+        return cached
+    
     # First, get the player's position
     try:
         with get_conn() as conn:
@@ -399,8 +402,8 @@ async def get_player_season_rankings(
                         detail=f"Player {player_id} not found"
                     )
                 
-                player_name = player_row[0]
-                player_position = position or player_row[1]
+                player_name = player_row['full_name']
+                player_position = position or player_row['position']
                 
                 if not player_position:
                     raise HTTPException(
@@ -408,55 +411,11 @@ async def get_player_season_rankings(
                         detail="Player position is required"
                     )
                 
-                # Define relevant stat groups and metrics by position
-                position_metrics = {
-                    'QB': {
-                        'Passing': ['yards', 'passing touch downs', 'rating', 'interceptions', 'comp att']
-                    },
-                    'RB': {
-                        'Rushing': ['yards', 'rushing touch downs', 'average', 'total rushes'],
-                        'Receiving': ['yards', 'receiving touch downs', 'receptions']
-                    },
-                    'WR': {
-                        'Receiving': ['yards', 'receiving touch downs', 'receptions', 'targets']
-                    },
-                    'TE': {
-                        'Receiving': ['yards', 'receiving touch downs', 'receptions', 'targets']
-                    },
-                    'K': {
-                        'Kicking': ['field goals made', 'field goal pct', 'extra points made']
-                    },
-                    'P': {
-                        'Punting': ['average', 'gross avg', 'inside 20']
-                    },
-                    'DB': {
-                        'Defense': ['tackles', 'interceptions', 'passes defended']
-                    },
-                    'CB': {
-                        'Defense': ['tackles', 'interceptions', 'passes defended']
-                    },
-                    'S': {
-                        'Defense': ['tackles', 'interceptions', 'passes defended']
-                    },
-                    'LB': {
-                        'Defense': ['tackles', 'sacks', 'tfl']
-                    },
-                    'DL': {
-                        'Defense': ['tackles', 'sacks', 'tfl']
-                    },
-                    'DE': {
-                        'Defense': ['tackles', 'sacks', 'tfl', 'qb hts']
-                    },
-                    'DT': {
-                        'Defense': ['tackles', 'sacks', 'tfl']
-                    }
-                }
-                
                 # Get metrics for this position
-                metrics_to_check = position_metrics.get(player_position, {})
+                metrics_to_check = POSITION_METRICS.get(player_position, {})
                 
                 if not metrics_to_check:
-                    return PlayerRankingsResponse(
+                    return PlayerRankingsResponse.model_construct(
                         player_id=player_id,
                         player_name=player_name,
                         position=player_position,
@@ -464,101 +423,46 @@ async def get_player_season_rankings(
                         rankings=[]
                     )
                 
-                rankings = []
-                
-                # For each stat group and metric, calculate rankings
-                for stat_group, metrics in metrics_to_check.items():
-                    for metric_name in metrics:
-                        # Query to calculate season totals and rank players
-                        ranking_query = """
-                            WITH player_totals AS (
-                                SELECT 
-                                    gps.player_id,
-                                    p.full_name,
-                                    p.position,
-                                    SUM(
-                                        CASE 
-                                            WHEN gps.metric_value ~ '^[0-9]+(\.[0-9]+)?$' 
-                                            THEN CAST(gps.metric_value AS NUMERIC)
-                                            WHEN gps.metric_value ~ '^[0-9]+/'
-                                            THEN CAST(SPLIT_PART(gps.metric_value, '/', 1) AS NUMERIC)
-                                            WHEN gps.metric_value ~ '^[0-9]+-'
-                                            THEN CAST(SPLIT_PART(gps.metric_value, '-', 1) AS NUMERIC)
-                                            ELSE 0
-                                        END
-                                    ) as total_value,
-                                    COUNT(DISTINCT gps.game_id) as game_count
-                                FROM game_player_statistics gps
-                                JOIN player p ON gps.player_id = p.player_id
-                                JOIN game g ON gps.game_id = g.game_id
-                                JOIN season s ON g.season_id = s.season_id
-                                WHERE s.year = %s
-                                  AND p.position = %s
-                                  AND gps.stat_group = %s
-                                  AND gps.metric_name = %s
-                                  AND gps.metric_value IS NOT NULL
-                                GROUP BY gps.player_id, p.full_name, p.position
-                                HAVING SUM(
-                                    CASE 
-                                        WHEN gps.metric_value ~ '^[0-9]+(\.[0-9]+)?$' 
-                                        THEN CAST(gps.metric_value AS NUMERIC)
-                                        WHEN gps.metric_value ~ '^[0-9]+/'
-                                        THEN CAST(SPLIT_PART(gps.metric_value, '/', 1) AS NUMERIC)
-                                        WHEN gps.metric_value ~ '^[0-9]+-'
-                                        THEN CAST(SPLIT_PART(gps.metric_value, '-', 1) AS NUMERIC)
-                                        ELSE 0
-                                    END
-                                ) > 0
-                            ),
-                            ranked_players AS (
-                                SELECT 
-                                    player_id,
-                                    full_name,
-                                    position,
-                                    total_value,
-                                    game_count,
-                                    RANK() OVER (ORDER BY total_value DESC) as rank,
-                                    COUNT(*) OVER () as total_players
-                                FROM player_totals
-                            )
-                            SELECT 
-                                player_id,
-                                full_name,
-                                position,
-                                total_value,
-                                rank,
-                                total_players
-                            FROM ranked_players
-                            WHERE player_id = %s
-                        """
-                        
-                        cur.execute(
-                            ranking_query,
-                            (season, player_position, stat_group, metric_name, player_id)
-                        )
-                        
-                        result = cur.fetchone()
-                        
-                        if result and result[4] <= 10:  # Only include top 10 rankings
-                            rankings.append(PlayerRankingItem(
-                                metric_name=metric_name,
-                                stat_group=stat_group,
-                                total_value=float(result[3]),
-                                rank=int(result[4]),
-                                total_players=int(result[5]),
-                                percentile=round((1 - (result[4] / result[5])) * 100, 1)
-                            ))
-                
-                # Sort by rank (best rankings first)
-                rankings.sort(key=lambda x: x.rank)
+                # One pass ranks every (stat_group, metric) pair for the position
+                params = {
+                    "season": season,
+                    "position": player_position,
+                    "stat_groups": [
+                        stat_group
+                        for stat_group, metrics in metrics_to_check.items()
+                        for _ in metrics
+                    ],
+                    "metric_names": [
+                        metric_name
+                        for metrics in metrics_to_check.values()
+                        for metric_name in metrics
+                    ],
+                    "player_id": player_id
+                }
+                cur.execute(RANKINGS_SQL, params)
+                
+                # Only top 10 rankings come back, best first
+                rankings = [
+                    PlayerRankingItem.model_construct(
+                        metric_name=result['metric_name'],
+                        stat_group=result['stat_group'],
+                        total_value=float(result['total_value']),
+                        rank=int(result['rank']),
+                        total_players=int(result['total_players']),
+                        percentile=round((1 - (result['rank'] / result['total_players'])) * 100, 1)
+                    )
+                    for result in cur
+                ]
                 
-                return PlayerRankingsResponse(
+                response = PlayerRankingsResponse.model_construct(
                     player_id=player_id,
                     player_name=player_name,
                     position=player_position,
                     season=season,
                     rankings=rankings
                 )
+                cache_set("player_rankings", cache_key, response)
+                return response
                 
     except psycopg2.Error as e:
         raise HTTPException(
@@ -567,12 +471,43 @@ async def get_player_season_rankings(
         )
 
 
+# Top-N off the pre-joined leaderboard (sql/migrations/009), which keeps
+# only numeric values (metric_numeric, sql/migrations/011)
+LEADERS_SQL = """
+    SELECT
+        player_id,
+        player_name,
+        position,
+        team_name,
+        team_abbrev,
+        game_id,
+        week,
+        game_date,
+        metric_value
+    FROM mv_stat_leaders
+    WHERE stat_group = %(stat_group)s
+      AND metric_name = %(metric_name)s
+      {season_filter}
+    ORDER BY metric_numeric DESC
+    LIMIT %(limit)s
+"""
+
+LEADERS_QUERIES = {
+    has_season: LEADERS_SQL.format(
+        season_filter="AND season = %(season)s" if has_season else ""
+    )
+    for has_season in (False, True)
+}
+
+
 @router.get(
     "/players/leaders/{stat_group}/{metric_name}",
-    response_model=List[StatLeaderItem],
+    # Documented, not enforced: the handler returns mv_stat_leaders rows
+    # (trusted, already in this shape) directly as an ORJSONResponse
+    responses={200: {"model": List[StatLeaderItem]}},
     summary="Get Statistical Leaders"
 )
-async def get_player_stat_leaders(
+def get_player_stat_leaders(
     stat_group: str = Path(
         ...,
         description="Stat group (Passing, Rushing, Receiving, Defense, etc.)"
@@ -592,56 +527,29 @@ async def get_player_stat_leaders(
     - /players/leaders/Rushing/touchdowns?season=2023
     - /players/leaders/Receiving/receptions
     """
-    query = """
-        SELECT 
-            gps.player_id,
-            p.full_name as player_name,
-            p.position,
-            t.name as team_name,
-            t.abbrev as team_abbrev,
-            gps.game_id,
-            g.week,
-            g.game_datetime_utc as game_date,
-            gps.metric_value
-        FROM game_player_statistics gps
-        JOIN player p ON gps.player_id = p.player_id
-        JOIN team t ON gps.team_id = t.team_id
-        JOIN game g ON gps.game_id = g.game_id
-        {season_filter}
-        WHERE gps.stat_group = %s
-          AND gps.metric_name = %s
-          AND gps.metric_value IS NOT NULL
-          AND gps.metric_value ~ '^[0-9]+(\.[0-9]+)?$'
-        ORDER BY CAST(gps.metric_value AS NUMERIC) DESC
-        LIMIT %s
-    """
-    
-    params = []
-    season_filter = ""
-    
-    if season:
-        season_filter = "JOIN season s ON g.season_id = s.season_id WHERE s.year = %s AND"
-        params.append(season)
-    else:
-        season_filter = "WHERE"
+    cache_key = (stat_group, metric_name, season, limit)
+    cached = cache_get("stat_leaders", cache_key)
+    if cached is not None:
+        return ORJSONResponse(cached)
     
-    params.extend([stat_group, metric_name, limit])
-    
-    query = query.format(season_filter=season_filter)
+    query = LEADERS_QUERIES[bool(season)]
+    params = {
+        "stat_group": stat_group,
+        "metric_name": metric_name,
+        "season": season,
+        "limit": limit
+    }
     
     try:
         with get_conn() as conn:
             with conn.cursor() as cur:
-                cur.execute(query, tuple(params))
-                rows = cur.fetchall()
-                
-                if not rows:
-                    return []
+                cur.execute(query, params)
+                # Rows already match StatLeaderItem; returning a Response
+                # skips building and re-validating one model per leader
+                leaders = cur.fetchall()
                 
-                columns = [desc[0] for desc in cur.description]
-                leaders = [dict(zip(columns, row)) for row in rows]
-                
-                return [StatLeaderItem(**leader) for leader in leaders]
+                cache_set("stat_leaders", cache_key, leaders)
+                return ORJSONResponse(leaders)
                 
     except psycopg2.Error as e:
         raise HTTPException(
@@ -650,11 +558,55 @@ async def get_player_stat_leaders(
         )
 
 
+# Player header: their team is the one from their latest stat row
+SUMMARY_HEADER_SQL = """
+    SELECT 
+        p.full_name as player_name,
+        p.position,
+        t.name as team_name,
+        t.abbrev as team_abbrev
+    FROM player p
+    JOIN LATERAL (
+        SELECT gps.team_id
+        FROM game_player_statistics gps
+        WHERE gps.player_id = p.player_id
+        {season_filter}
+        ORDER BY gps.game_datetime_utc DESC
+        LIMIT 1
+    ) latest ON true
+    JOIN team t ON latest.team_id = t.team_id
+    WHERE p.player_id = %(player_id)s
+"""
+
+# Per-metric rows carry only the metric columns, from the stats table alone
+SUMMARY_SQL = """
+    SELECT 
+        gps.season_year as season,
+        gps.stat_group,
+        gps.metric_name,
+        COUNT(*) as game_count,
+        (ARRAY_AGG(gps.metric_value ORDER BY gps.game_datetime_utc DESC))[1:5] as recent_values
+    FROM game_player_statistics gps
+    WHERE gps.player_id = %(player_id)s
+    {season_filter}
+    GROUP BY gps.season_year, gps.stat_group, gps.metric_name
+    ORDER BY gps.season_year DESC, gps.stat_group, gps.metric_name
+"""
+
+SUMMARY_QUERIES = {
+    has_season: (
+        SUMMARY_HEADER_SQL.format(season_filter=SEASON_FILTER if has_season else ""),
+        SUMMARY_SQL.format(season_filter=SEASON_FILTER if has_season else "")
+    )
+    for has_season in (False, True)
+}
+
+
 @router.get(
     "/players/{player_id}/summary",
     summary="Get Player Statistics Summary"
 )
-async def get_player_statistics_summary(
+def get_player_statistics_summary(
     player_id: int = Path(..., description="Player ID"),
     season: Optional[int] = Query(None, description="Filter by season")
 ):
@@ -663,78 +615,42 @@ async def get_player_statistics_summary(
     
     Groups all stats by stat_group and provides key metrics.
     """
-    query = """
-        SELECT 
-            p.full_name as player_name,
-            p.position,
-            t.name as team_name,
-            t.abbrev as team_abbrev,
-            s.year as season,
-            gps.stat_group,
-            gps.metric_name,
-            COUNT(*) as game_count,
-            ARRAY_AGG(gps.metric_value ORDER BY g.game_datetime_utc DESC) as values
-        FROM game_player_statistics gps
-        JOIN player p ON gps.player_id = p.player_id
-        JOIN team t ON gps.team_id = t.team_id
-        JOIN game g ON gps.game_id = g.game_id
-        JOIN season s ON g.season_id = s.season_id
-        WHERE gps.player_id = %s
-        {season_filter}
-        GROUP BY 
-            p.full_name, p.position, t.name, t.abbrev, 
-            s.year, gps.stat_group, gps.metric_name
-        ORDER BY s.year DESC, gps.stat_group, gps.metric_name
-    """
-    
-    params = [player_id]
-    season_filter = ""
+    cache_key = (player_id, season)
+    cached = cache_get("player_summary", cache_key)
+    if cached is not None:
+        return cached
     
-    if season:
-        season_filter = "AND s.year = %s"
-        params.append(season)
-    
-    query = query.format(season_filter=season_filter)
+    header_query, query = SUMMARY_QUERIES[bool(season)]
+    params = {"player_id": player_id, "season": season}
     
     try:
         with get_conn() as conn:
             with conn.cursor() as cur:
-                cur.execute(query, tuple(params))
-                rows = cur.fetchall()
+                cur.execute(header_query, params)
+                header = cur.fetchone()
                 
-                if not rows:
+                if not header:
                     raise HTTPException(
                         status_code=404,
                         detail=f"No statistics found for player {player_id}"
                     )
                 
-                columns = [desc[0] for desc in cur.description]
-                stats = [dict(zip(columns, row)) for row in rows]
-                
                 # Group by season and stat_group
-                result = {
-                    'player_name': stats[0]['player_name'],
-                    'position': stats[0]['position'],
-                    'team_name': stats[0]['team_name'],
-                    'team_abbrev': stats[0]['team_abbrev'],
-                    'seasons': {}
-                }
-                
-                for stat in stats:
-                    season_key = stat['season']
-                    if season_key not in result['seasons']:
-                        result['seasons'][season_key] = {}
-                    
-                    stat_group = stat['stat_group']
-                    if stat_group not in result['seasons'][season_key]:
-                        result['seasons'][season_key][stat_group] = []
-                    
-                    result['seasons'][season_key][stat_group].append({
+                result = dict(header, seasons={})
+                
+                # Rows are turned into dicts one at a time as the loop
+                # consumes the cursor, not all up front by fetchall()
+                cur.execute(query, params)
+                seasons = result['seasons']
+                for stat in cur:
+                    groups = seasons.setdefault(stat['season'], {})
+                    groups.setdefault(stat['stat_group'], []).append({
                         'metric_name': stat['metric_name'],
                         'game_count': stat['game_count'],
-                        'recent_values': stat['values'][:5]  # Last 5 games
+                        'recent_values': stat['recent_values']  # Last 5 games
                     })
                 
+                cache_set("player_summary", cache_key, result)
                 return result
                 
     except psycopg2.Error as e:
@@ -749,25 +665,26 @@ async def get_player_statistics_summary(
 # =========================================================
 
 @router.get("/games/player-stats/health", summary="Health Check")
-async def health_check():
+def health_check():
     """Check if the game player statistics endpoints are operational."""
     try:
         with get_conn() as conn:
             with conn.cursor() as cur:
-                cur.execute("SELECT COUNT(*) FROM game_player_statistics")
-                count = cur.fetchone()[0]
-                
-                cur.execute("SELECT COUNT(DISTINCT game_id) FROM game_player_statistics")
-                game_count = cur.fetchone()[0]
-                
-                cur.execute("SELECT COUNT(DISTINCT player_id) FROM game_player_statistics")
-                player_count = cur.fetchone()[0]
+                # All three counts in one scan and one round trip
+                cur.execute("""
+                    SELECT
+                        COUNT(*) AS total_stat_records,
+                        COUNT(DISTINCT game_id) AS games_with_stats,
+                        COUNT(DISTINCT player_id) AS players_with_stats
+                    FROM game_player_statistics
+                """)
+                counts = cur.fetchone()
                 
                 return {
                     "status": "healthy",
-                    "total_stat_records": count,
-                    "games_with_stats": game_count,
-                    "players_with_stats": player_count
+                    "total_stat_records": counts['total_stat_records'],
+                    "games_with_stats": counts['games_with_stats'],
+                    "players_with_stats": counts['players_with_stats']
                 }
     except Exception as e:
         raise HTTPException(
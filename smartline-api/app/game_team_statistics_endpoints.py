@@ -9,12 +9,13 @@ Endpoints:
 - GET /statistics/teams/leaders - Get statistical leaders across all games
 """
 
+from contextlib import contextmanager
 from typing import Optional, List
 from datetime import datetime
 import psycopg2
 from fastapi import APIRouter, HTTPException, Query, Path
 from pydantic import BaseModel
-import os
+from app.database import get_connection, release_connection
 
 # Initialize router
 router = APIRouter(prefix="/statistics", tags=["Game Team Statistics"])
@@ -22,15 +23,15 @@ router = APIRouter(prefix="/statistics", tags=["Game Team Statistics"])
 
 # ==================== Database Connection ====================
 
+@contextmanager
 def get_conn():
-    """Get database connection"""
-    return psycopg2.connect(
-        host=os.environ["PGHOST"],
-        dbname=os.environ["PGDATABASE"],
-        user=os.environ["PGUSER"],
-        password=os.environ["PGPASSWORD"],
-        port=os.environ.get("PGPORT", 5432)
-    )
+    """Borrow a pooled connection; commits or rolls back, then returns it"""
+    conn = get_connection()
+    try:
+        with conn:
+            yield conn
+    finally:
+        release_connection(conn)
 
 
 # =========================================================
@@ -135,7 +136,7 @@ class StatLeader(BaseModel):
     response_model=GameTeamStatisticsResponse,
     summary="Get Team Statistics for a Game"
 )
-async def get_game_team_statistics(
+def get_game_team_statistics(
     game_id: int = Path(..., description="Game ID")
 ):
     """
@@ -164,17 +165,14 @@ async def get_game_team_statistics(
         with get_conn() as conn:
             with conn.cursor() as cur:
                 cur.execute(query, (game_id,))
-                rows = cur.fetchall()
+                stats = cur.fetchall()
                 
-                if not rows:
+                if not stats:
                     raise HTTPException(
                         status_code=404,
                         detail=f"Statistics not found for game {game_id}"
                     )
                 
-                columns = [desc[0] for desc in cur.description]
-                stats = [dict(zip(columns, row)) for row in rows]
-                
                 if len(stats) != 2:
                     raise HTTPException(
                         status_code=500,
@@ -204,7 +202,7 @@ async def get_game_team_statistics(
     response_model=TeamGameStatsResponse,
     summary="Get Game-by-Game Statistics for a Team"
 )
-async def get_team_game_statistics(
+def get_team_game_statistics(
     team_id: int = Path(..., description="Team ID"),
     season: Optional[int] = Query(None, description="Filter by season year"),
     limit: int = Query(20, ge=1, le=100, description="Maximum games to return")
@@ -257,17 +255,14 @@ async def get_team_game_statistics(
         with get_conn() as conn:
             with conn.cursor() as cur:
                 cur.execute(query, tuple(params))
-                rows = cur.fetchall()
+                games_data = cur.fetchall()
                 
-                if not rows:
+                if not games_data:
                     raise HTTPException(
                         status_code=404,
                         detail=f"No statistics found for team {team_id}"
                     )
                 
-                columns = [desc[0] for desc in cur.description]
-                games_data = [dict(zip(columns, row)) for row in rows]
-                
                 # Format response
                 team_name = games_data[0]['team_name']
                 season_year = games_data[0]['season'] if season else None
@@ -336,7 +331,7 @@ from fastapi import APIRouter, HTTPException, Query, Path
     "/teams/leaders/points",
     summary="Get Points Scored Leaders"
 )
-async def get_team_points_leaders(
+def get_team_points_leaders(
     season: Optional[int] = Query(None, description="Filter by season"),
     limit: int = Query(10, ge=1, le=50, description="Number of leaders to return")
 ):
@@ -433,12 +428,7 @@ async def get_team_points_leaders(
         with get_conn() as conn:
             with conn.cursor() as cur:
                 cur.execute(query, params)
-                rows = cur.fetchall()
-                
-                columns = [desc[0] for desc in cur.description]
-                leaders = [dict(zip(columns, row)) for row in rows]
-                
-                return leaders
+                return cur.fetchall()
                 
     except psycopg2.Error as e:
         raise HTTPException(
@@ -451,7 +441,7 @@ async def get_team_points_leaders(
     "/teams/leaders/points_allowed",
     summary="Get Points Allowed Leaders"
 )
-async def get_team_points_allowed_leaders(
+def get_team_points_allowed_leaders(
     season: Optional[int] = Query(None, description="Filter by season"),
     limit: int = Query(10, ge=1, le=50, description="Number of leaders to return")
 ):
@@ -548,12 +538,7 @@ async def get_team_points_allowed_leaders(
         with get_conn() as conn:
             with conn.cursor() as cur:
                 cur.execute(query, params)
-                rows = cur.fetchall()
-                
-                columns = [desc[0] for desc in cur.description]
-                leaders = [dict(zip(columns, row)) for row in rows]
-                
-                return leaders
+                return cur.fetchall()
                 
     except psycopg2.Error as e:
         raise HTTPException(
@@ -566,7 +551,7 @@ async def get_team_points_allowed_leaders(
     response_model=List[StatLeader],
     summary="Get Statistical Leaders"
 )
-async def get_stat_leaders(
+def get_stat_leaders(
     stat_category: str = Path(
         ...,
         description="Stat category (e.g., 'yards_total', 'passing_yards', 'rushing_yards', 'sacks_total')"
@@ -655,12 +640,7 @@ async def get_stat_leaders(
         with get_conn() as conn:
             with conn.cursor() as cur:
                 cur.execute(query, tuple(params))
-                rows = cur.fetchall()
-                
-                columns = [desc[0] for desc in cur.description]
-                leaders = [dict(zip(columns, row)) for row in rows]
-                
-                return [StatLeader(**leader) for leader in leaders]
+                return [StatLeader(**leader) for leader in cur.fetchall()]
                 
     except psycopg2.Error as e:
         raise HTTPException(
@@ -698,7 +678,7 @@ def get_team_conference_division(team_abbrev: str) -> tuple:
     "/teams/{team_id}/standings",
     summary="Get Team Conference and Division Rankings"
 )
-async def get_team_standings(
+def get_team_standings(
     team_id: int = Path(..., description="Team ID"),
     season: int = Query(..., description="Season year")
 ):
@@ -720,7 +700,7 @@ async def get_team_standings(
                 if not team_row:
                     raise HTTPException(status_code=404, detail="Team not found")
                 
-                team_name, team_abbrev = team_row
+                team_name, team_abbrev = team_row['name'], team_row['abbrev']
                 conference, division = get_team_conference_division(team_abbrev)
                 
                 # Calculate standings using game_result table
@@ -776,8 +756,8 @@ async def get_team_standings(
                 division_teams = []
                 
                 for row in all_standings:
-                    tid, name, abbrev, wins, losses, ties, gp, win_pct = row
-                    team_conf, team_div = get_team_conference_division(abbrev)
+                    tid, win_pct = row['team_id'], row['win_pct']
+                    team_conf, team_div = get_team_conference_division(row['abbrev'])
                     
                     if team_conf == conference:
                         conference_teams.append((tid, float(win_pct or 0)))
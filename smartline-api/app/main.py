@@ -1,5 +1,12 @@
+import atexit
+import logging
+import logging.handlers
+import os
+import queue
+import psycopg2
 from fastapi import FastAPI, Query
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 from app.player_endpoints import router as player_router
 from app.team_endpoints import router as team_router
 from app.player_statistics_endpoints import router as player_statistics_router
@@ -10,10 +17,26 @@ from app.bankroll_endpoints import router as bankroll_router
 from app.settings_endpoints import router as settings_router
 from app.export_endpoints import router as export_router
 from app.models import StrategyRequest
-from app.crud import backtest_strategy
-from app.database import get_connection
+from app.crud import backtest_strategy_summary, backtest_strategy_rows
+from app.database import get_connection, release_connection, warm_pool, close_pool, QUERY_TRACES
+from app.cache import CACHE_STATS
 from typing import Optional
 
+# Handlers only enqueue records; a listener thread does the stdout writes
+log_queue = queue.SimpleQueue()
+log_output = logging.StreamHandler()
+log_output.setFormatter(logging.Formatter(
+    '[%(asctime)s] %(levelname)s %(name)s: %(message)s',
+    datefmt='%Y-%m-%d %H:%M:%S'
+))
+log_listener = logging.handlers.QueueListener(log_queue, log_output)
+logging.basicConfig(
+    level=logging.INFO,
+    handlers=[logging.handlers.QueueHandler(log_queue)]
+)
+log_listener.start()
+atexit.register(log_listener.stop)
+
 app = FastAPI(title="SmartLine NFL Betting Intelligence")
 app.add_middleware(
     CORSMiddleware,
@@ -37,13 +60,35 @@ app.include_router(bankroll_router)
 app.include_router(settings_router)
 app.include_router(export_router)
 
+@app.on_event("startup")
+def warm_db_pool():
+    """Pre-open pooled connections so the first request skips the handshake."""
+    try:
+        warm_pool()
+    except psycopg2.Error:
+        logging.getLogger(__name__).exception("DB pool warm-up failed")
+
+@app.on_event("shutdown")
+def close_db_pool():
+    """Close pooled connections so the server sees a clean disconnect."""
+    close_pool()
+
 @app.post("/backtest")
-def backtest(strategy: StrategyRequest):
-    rows = backtest_strategy(strategy)
+def backtest(
+    strategy: StrategyRequest,
+    limit: int = Query(default=100, ge=1, le=1000),
+    offset: int = Query(default=0, ge=0),
+    fields: Optional[str] = Query(default=None)
+):
+    summary = backtest_strategy_summary(strategy)
+    rows = backtest_strategy_rows(
+        strategy, limit, offset,
+        fields=[f.strip() for f in fields.split(",")] if fields else None
+    )
 
-    bets = len(rows)
-    wins = sum(1 for r in rows if r["profit"] > 0)
-    total_profit = sum(r["profit"] for r in rows)
+    bets = summary["bets"]
+    wins = summary["wins"]
+    total_profit = float(summary["total_profit"])
 
     roi = (total_profit / (bets * strategy.stake) * 100) if bets > 0 else 0
 
@@ -54,6 +99,8 @@ def backtest(strategy: StrategyRequest):
         "win_pct": round((wins / bets) * 100, 2) if bets else 0,
         "total_profit": round(total_profit, 2),
         "roi_pct": round(roi, 2),
+        "limit": limit,
+        "offset": offset,
         "results": rows
     }
 
@@ -61,25 +108,79 @@ def backtest(strategy: StrategyRequest):
 def health():
     return {"status": "ok"}
 
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    """Cache hit/miss counters in Prometheus text format."""
+    lines = ["# TYPE smartline_cache_requests_total counter"]
+    for name, stats in CACHE_STATS.items():
+        for result, count in stats.items():
+            lines.append(f'smartline_cache_requests_total{{cache="{name}",result="{result}"}} {count}')
+    return "\n".join(lines) + "\n"
+
+# Query text and traced statements carry user ids and search strings;
+# /debug/* is only registered when explicitly enabled
+DEBUG_ENDPOINTS = os.getenv("ENABLE_DEBUG_ENDPOINTS", "0") == "1"
+
+def debug_slow(limit: int = Query(default=10, ge=1, le=100)):
+    """Top statements by mean time (pg_stat_statements) plus recent traced plans."""
+    statements = []
+    error = None
+    conn = get_connection()
+    try:
+        cur = conn.cursor()
+        cur.execute("""
+            SELECT
+                query,
+                calls,
+                ROUND(total_exec_time::numeric, 2) AS total_ms,
+                ROUND(mean_exec_time::numeric, 2) AS mean_ms,
+                rows
+            FROM pg_stat_statements
+            ORDER BY mean_exec_time DESC
+            LIMIT %s
+        """, [limit])
+        statements = cur.fetchall()
+        cur.close()
+    except psycopg2.Error as e:
+        error = str(e)
+    finally:
+        release_connection(conn)
+
+    return {
+        "statements": statements,
+        "statements_error": error,
+        "traced": list(QUERY_TRACES)[-limit:]
+    }
+
+if DEBUG_ENDPOINTS:
+    app.add_api_route("/debug/slow", debug_slow, methods=["GET"])
+
 @app.get("/health/db")
 def health_db():
     conn = get_connection()
-    conn.close()
+    try:
+        cur = conn.cursor()
+        cur.execute("SELECT 1")
+        cur.close()
+    finally:
+        release_connection(conn)
     return {"db": "ok"}
 
 @app.get("/db/verify")
 def db_verify():
     conn = get_connection()
-    cur = conn.cursor()
-    cur.execute("""
-        SELECT table_name
-        FROM information_schema.tables
-        WHERE table_schema = 'public'
-        ORDER BY table_name;
-    """)
-    rows = cur.fetchall()
-    cur.close()
-    conn.close()
+    try:
+        cur = conn.cursor()
+        cur.execute("""
+            SELECT table_name
+            FROM information_schema.tables
+            WHERE table_schema = 'public'
+            ORDER BY table_name;
+        """)
+        rows = cur.fetchall()
+        cur.close()
+    finally:
+        release_connection(conn)
     return rows
 
 @app.get("/games")
@@ -88,60 +189,62 @@ def get_games(
     week: int = Query(...)
 ):
     conn = get_connection()
-    cur = conn.cursor()
-
-    cur.execute("""
-        SELECT
-            g.game_id,
-            g.game_datetime_utc AS kickoff_utc,
-            g.status,
-
-            ht.team_id AS home_team_id,
-            ht.name AS home_team_name,
-            ht.abbrev AS home_team_abbrev,
-
-            at.team_id AS away_team_id,
-            at.name AS away_team_name,
-            at.abbrev AS away_team_abbrev,
-
-            v.name AS venue_name,
-            v.city AS venue_city,
-            v.state AS venue_state,
-            v.is_dome,
-
-            r.home_score,
-            r.away_score,
-            r.home_win,
-
-            w.temp_f,
-            w.wind_mph,
-            w.precip_prob,
-            w.precip_mm,
-            w.weather_severity_score,
-            w.is_cold,
-            w.is_windy,
-            w.is_heavy_wind,
-            w.is_rain_risk,
-            w.is_storm_risk,
-            w.source AS weather_source
-
-        FROM game g
-        JOIN season s ON g.season_id = s.season_id
-        JOIN team ht ON g.home_team_id = ht.team_id
-        JOIN team at ON g.away_team_id = at.team_id
-        LEFT JOIN venue v ON g.venue_id = v.venue_id
-        LEFT JOIN game_result r ON r.game_id = g.game_id
-        LEFT JOIN weather_observation w ON w.game_id = g.game_id
-
-        WHERE s.year = %s
-          AND g.week = %s
-
-        ORDER BY g.game_datetime_utc;
-    """, (season, week))
-
-    rows = cur.fetchall()
-    cur.close()
-    conn.close()
+    try:
+        cur = conn.cursor()
+
+        cur.execute("""
+            SELECT
+                g.game_id,
+                g.game_datetime_utc AS kickoff_utc,
+                g.status,
+
+                ht.team_id AS home_team_id,
+                ht.name AS home_team_name,
+                ht.abbrev AS home_team_abbrev,
+
+                at.team_id AS away_team_id,
+                at.name AS away_team_name,
+                at.abbrev AS away_team_abbrev,
+
+                v.name AS venue_name,
+                v.city AS venue_city,
+                v.state AS venue_state,
+                v.is_dome,
+
+                r.home_score,
+                r.away_score,
+                r.home_win,
+
+                w.temp_f,
+                w.wind_mph,
+                w.precip_prob,
+                w.precip_mm,
+                w.weather_severity_score,
+                w.is_cold,
+                w.is_windy,
+                w.is_heavy_wind,
+                w.is_rain_risk,
+                w.is_storm_risk,
+                w.source AS weather_source
+
+            FROM game g
+            JOIN season s ON g.season_id = s.season_id
+            JOIN team ht ON g.home_team_id = ht.team_id
+            JOIN team at ON g.away_team_id = at.team_id
+            LEFT JOIN venue v ON g.venue_id = v.venue_id
+            LEFT JOIN game_result r ON r.game_id = g.game_id
+            LEFT JOIN weather_observation w ON w.game_id = g.game_id
+
+            WHERE s.year = %s
+              AND g.week = %s
+
+            ORDER BY g.game_datetime_utc;
+        """, (season, week))
+
+        rows = cur.fetchall()
+        cur.close()
+    finally:
+        release_connection(conn)
 
     games = []
 
@@ -203,55 +306,57 @@ def get_games(
 @app.get("/games/{game_id}")
 def get_game_detail(game_id: int):
     conn = get_connection()
-    cur = conn.cursor()
-
-    cur.execute("""
-        SELECT
-            g.game_id,
-            g.game_datetime_utc AS kickoff_utc,
-            g.status,
-
-            ht.team_id AS home_team_id,
-            ht.name AS home_team_name,
-            ht.abbrev AS home_team_abbrev,
-
-            at.team_id AS away_team_id,
-            at.name AS away_team_name,
-            at.abbrev AS away_team_abbrev,
-
-            v.name AS venue_name,
-            v.city AS venue_city,
-            v.state AS venue_state,
-            v.is_dome,
-
-            r.home_score,
-            r.away_score,
-            r.home_win,
-
-            w.temp_f,
-            w.wind_mph,
-            w.precip_prob,
-            w.precip_mm,
-            w.weather_severity_score,
-            w.is_cold,
-            w.is_windy,
-            w.is_heavy_wind,
-            w.is_rain_risk,
-            w.is_storm_risk,
-            w.source AS weather_source
-
-        FROM game g
-        JOIN team ht ON g.home_team_id = ht.team_id
-        JOIN team at ON g.away_team_id = at.team_id
-        LEFT JOIN venue v ON g.venue_id = v.venue_id
-        LEFT JOIN game_result r ON r.game_id = g.game_id
-        LEFT JOIN weather_observation w ON w.game_id = g.game_id
-        WHERE g.game_id = %s;
-    """, (game_id,))
-
-    row = cur.fetchone()
-    cur.close()
-    conn.close()
+    try:
+        cur = conn.cursor()
+
+        cur.execute("""
+            SELECT
+                g.game_id,
+                g.game_datetime_utc AS kickoff_utc,
+                g.status,
+
+                ht.team_id AS home_team_id,
+                ht.name AS home_team_name,
+                ht.abbrev AS home_team_abbrev,
+
+                at.team_id AS away_team_id,
+                at.name AS away_team_name,
+                at.abbrev AS away_team_abbrev,
+
+                v.name AS venue_name,
+                v.city AS venue_city,
+                v.state AS venue_state,
+                v.is_dome,
+
+                r.home_score,
+                r.away_score,
+                r.home_win,
+
+                w.temp_f,
+                w.wind_mph,
+                w.precip_prob,
+                w.precip_mm,
+                w.weather_severity_score,
+                w.is_cold,
+                w.is_windy,
+                w.is_heavy_wind,
+                w.is_rain_risk,
+                w.is_storm_risk,
+                w.source AS weather_source
+
+            FROM game g
+            JOIN team ht ON g.home_team_id = ht.team_id
+            JOIN team at ON g.away_team_id = at.team_id
+            LEFT JOIN venue v ON g.venue_id = v.venue_id
+            LEFT JOIN game_result r ON r.game_id = g.game_id
+            LEFT JOIN weather_observation w ON w.game_id = g.game_id
+            WHERE g.game_id = %s;
+        """, (game_id,))
+
+        row = cur.fetchone()
+        cur.close()
+    finally:
+        release_connection(conn)
 
     if not row:
         return {"error": "Game not found"}
@@ -311,60 +416,62 @@ def get_odds(
     Can filter by season, week, or specific game
     """
     conn = get_connection()
-    cur = conn.cursor()
+    try:
+        cur = conn.cursor()
     
-    # Build WHERE clause based on filters
-    where_clauses = ["s.year = %s"]
-    params = [season]
+        # Build WHERE clause based on filters
+        where_clauses = ["s.year = %s"]
+        params = [season]
     
-    if week:
-        where_clauses.append("g.week = %s")
-        params.append(week)
+        if week:
+            where_clauses.append("g.week = %s")
+            params.append(week)
     
-    if game_id:
-        where_clauses.append("g.game_id = %s")
-        params.append(game_id)
+        if game_id:
+            where_clauses.append("g.game_id = %s")
+            params.append(game_id)
     
-    where_sql = " AND ".join(where_clauses)
+        where_sql = " AND ".join(where_clauses)
     
-    cur.execute(f"""
-        SELECT
-            g.game_id,
-            g.week,
-            g.game_datetime_utc,
+        cur.execute(f"""
+            SELECT
+                g.game_id,
+                g.week,
+                g.game_datetime_utc,
             
-            ht.abbrev AS home_team,
-            at.abbrev AS away_team,
+                ht.abbrev AS home_team,
+                at.abbrev AS away_team,
             
-            b.name AS book,
-            ol.market,
-            ol.side,
-            ol.line_value,
-            ol.price_american,
-            ol.pulled_at_utc,
+                b.name AS book,
+                ol.market,
+                ol.side,
+                ol.line_value,
+                ol.price_american,
+                ol.pulled_at_utc,
             
-            -- Determine if this is opening or closing
-            CASE 
-                WHEN ol.pulled_at_utc = MIN(ol.pulled_at_utc) OVER (PARTITION BY ol.game_id, ol.book_id, ol.market)
-                THEN 'opening'
-                ELSE 'closing'
-            END as line_type
+                -- Determine if this is opening or closing
+                CASE 
+                    WHEN ol.pulled_at_utc = MIN(ol.pulled_at_utc) OVER (PARTITION BY ol.game_id, ol.book_id, ol.market)
+                    THEN 'opening'
+                    ELSE 'closing'
+                END as line_type
             
-        FROM odds_line ol
-        JOIN game g ON g.game_id = ol.game_id
-        JOIN season s ON s.season_id = g.season_id
-        JOIN team ht ON g.home_team_id = ht.team_id
-        JOIN team at ON g.away_team_id = at.team_id
-        JOIN book b ON b.book_id = ol.book_id
+            FROM odds_line ol
+            JOIN game g ON g.game_id = ol.game_id
+            JOIN season s ON s.season_id = g.season_id
+            JOIN team ht ON g.home_team_id = ht.team_id
+            JOIN team at ON g.away_team_id = at.team_id
+            JOIN book b ON b.book_id = ol.book_id
         
-        WHERE {where_sql}
+            WHERE {where_sql}
         
-        ORDER BY g.game_datetime_utc, b.name, ol.market, ol.pulled_at_utc;
-    """, params)
+            ORDER BY g.game_datetime_utc, b.name, ol.market, ol.pulled_at_utc;
+        """, params)
     
-    rows = cur.fetchall()
-    cur.close()
-    conn.close()
+        rows = cur.fetchall()
+        cur.close()
+    finally:
+        release_connection(conn)
     
     # Organize by game
     games_odds = {}
@@ -413,38 +520,40 @@ def get_game_odds(game_id: int):
     Get all odds for a specific game with line movement
     """
     conn = get_connection()
-    cur = conn.cursor()
+    try:
+        cur = conn.cursor()
     
-    cur.execute("""
-        SELECT
-            g.game_id,
-            g.week,
-            g.game_datetime_utc,
+        cur.execute("""
+            SELECT
+                g.game_id,
+                g.week,
+                g.game_datetime_utc,
             
-            ht.abbrev AS home_team,
-            at.abbrev AS away_team,
+                ht.abbrev AS home_team,
+                at.abbrev AS away_team,
             
-            b.name AS book,
-            ol.market,
-            ol.side,
-            ol.line_value,
-            ol.price_american,
-            ol.pulled_at_utc
+                b.name AS book,
+                ol.market,
+                ol.side,
+                ol.line_value,
+                ol.price_american,
+                ol.pulled_at_utc
             
-        FROM odds_line ol
-        JOIN game g ON g.game_id = ol.game_id
-        JOIN team ht ON g.home_team_id = ht.team_id
-        JOIN team at ON g.away_team_id = at.team_id
-        JOIN book b ON b.book_id = ol.book_id
+            FROM odds_line ol
+            JOIN game g ON g.game_id = ol.game_id
+            JOIN team ht ON g.home_team_id = ht.team_id
+            JOIN team at ON g.away_team_id = at.team_id
+            JOIN book b ON b.book_id = ol.book_id
         
-        WHERE g.game_id = %s
+            WHERE g.game_id = %s
         
-        ORDER BY b.name, ol.market, ol.pulled_at_utc;
-    """, (game_id,))
+            ORDER BY b.name, ol.market, ol.pulled_at_utc;
+        """, (game_id,))
     
-    rows = cur.fetchall()
-    cur.close()
-    conn.close()
+        rows = cur.fetchall()
+        cur.close()
+    finally:
+        release_connection(conn)
     
     if not rows:
         return {"error": "No odds found for this game"}
@@ -489,74 +598,76 @@ def get_line_movement(
     Shows opening vs closing and movement magnitude
     """
     conn = get_connection()
-    cur = conn.cursor()
+    try:
+        cur = conn.cursor()
     
-    where_clauses = ["s.year = %s", "ol.market = %s"]
-    params = [season, market]
+        where_clauses = ["s.year = %s", "ol.market = %s"]
+        params = [season, market]
     
-    if week:
-        where_clauses.append("g.week = %s")
-        params.append(week)
+        if week:
+            where_clauses.append("g.week = %s")
+            params.append(week)
     
-    where_sql = " AND ".join(where_clauses)
+        where_sql = " AND ".join(where_clauses)
     
-    cur.execute(f"""
-        WITH game_odds AS (
+        cur.execute(f"""
+            WITH game_odds AS (
+                SELECT
+                    g.game_id,
+                    g.week,
+                    g.game_datetime_utc,
+                    ht.abbrev AS home_team,
+                    at.abbrev AS away_team,
+                    b.name AS book,
+                    ol.market,
+                    ol.side,
+                    ol.line_value,
+                    ol.pulled_at_utc,
+                    ROW_NUMBER() OVER (
+                        PARTITION BY ol.game_id, ol.book_id, ol.market, ol.side 
+                        ORDER BY ol.pulled_at_utc ASC
+                    ) as rn_asc,
+                    ROW_NUMBER() OVER (
+                        PARTITION BY ol.game_id, ol.book_id, ol.market, ol.side 
+                        ORDER BY ol.pulled_at_utc DESC
+                    ) as rn_desc
+                FROM odds_line ol
+                JOIN game g ON g.game_id = ol.game_id
+                JOIN season s ON s.season_id = g.season_id
+                JOIN team ht ON g.home_team_id = ht.team_id
+                JOIN team at ON g.away_team_id = at.team_id
+                JOIN book b ON b.book_id = ol.book_id
+                WHERE {where_sql}
+            )
             SELECT
-                g.game_id,
-                g.week,
-                g.game_datetime_utc,
-                ht.abbrev AS home_team,
-                at.abbrev AS away_team,
-                b.name AS book,
-                ol.market,
-                ol.side,
-                ol.line_value,
-                ol.pulled_at_utc,
-                ROW_NUMBER() OVER (
-                    PARTITION BY ol.game_id, ol.book_id, ol.market, ol.side 
-                    ORDER BY ol.pulled_at_utc ASC
-                ) as rn_asc,
-                ROW_NUMBER() OVER (
-                    PARTITION BY ol.game_id, ol.book_id, ol.market, ol.side 
-                    ORDER BY ol.pulled_at_utc DESC
-                ) as rn_desc
-            FROM odds_line ol
-            JOIN game g ON g.game_id = ol.game_id
-            JOIN season s ON s.season_id = g.season_id
-            JOIN team ht ON g.home_team_id = ht.team_id
-            JOIN team at ON g.away_team_id = at.team_id
-            JOIN book b ON b.book_id = ol.book_id
-            WHERE {where_sql}
-        )
-        SELECT
-            opening.game_id,
-            opening.week,
-            opening.game_datetime_utc,
-            opening.home_team,
-            opening.away_team,
-            opening.book,
-            opening.market,
-            opening.side,
-            opening.line_value as opening_line,
-            closing.line_value as closing_line,
-            closing.line_value - opening.line_value as movement,
-            opening.pulled_at_utc as opening_time,
-            closing.pulled_at_utc as closing_time
-        FROM game_odds opening
-        JOIN game_odds closing ON 
-            closing.game_id = opening.game_id 
-            AND closing.book = opening.book
-            AND closing.market = opening.market
-            AND closing.side = opening.side
-            AND closing.rn_desc = 1
-        WHERE opening.rn_asc = 1
-        ORDER BY ABS(closing.line_value - opening.line_value) DESC;
-    """, params)
+                opening.game_id,
+                opening.week,
+                opening.game_datetime_utc,
+                opening.home_team,
+                opening.away_team,
+                opening.book,
+                opening.market,
+                opening.side,
+                opening.line_value as opening_line,
+                closing.line_value as closing_line,
+                closing.line_value - opening.line_value as movement,
+                opening.pulled_at_utc as opening_time,
+                closing.pulled_at_utc as closing_time
+            FROM game_odds opening
+            JOIN game_odds closing ON 
+                closing.game_id = opening.game_id 
+                AND closing.book = opening.book
+                AND closing.market = opening.market
+                AND closing.side = opening.side
+                AND closing.rn_desc = 1
+            WHERE opening.rn_asc = 1
+            ORDER BY ABS(closing.line_value - opening.line_value) DESC;
+        """, params)
     
-    rows = cur.fetchall()
-    cur.close()
-    conn.close()
+        rows = cur.fetchall()
+        cur.close()
+    finally:
+        release_connection(conn)
     
     movements = []
     for row in rows:
@@ -589,35 +700,37 @@ def compare_odds(game_id: int, market: str = Query("spread")):
     Shows best available lines
     """
     conn = get_connection()
-    cur = conn.cursor()
+    try:
+        cur = conn.cursor()
     
-    cur.execute("""
-        WITH latest_odds AS (
+        cur.execute("""
+            WITH latest_odds AS (
+                SELECT
+                    ol.*,
+                    b.name as book_name,
+                    ROW_NUMBER() OVER (
+                        PARTITION BY ol.book_id, ol.market, ol.side 
+                        ORDER BY ol.pulled_at_utc DESC
+                    ) as rn
+                FROM odds_line ol
+                JOIN book b ON b.book_id = ol.book_id
+                WHERE ol.game_id = %s AND ol.market = %s
+            )
             SELECT
-                ol.*,
-                b.name as book_name,
-                ROW_NUMBER() OVER (
-                    PARTITION BY ol.book_id, ol.market, ol.side 
-                    ORDER BY ol.pulled_at_utc DESC
-                ) as rn
-            FROM odds_line ol
-            JOIN book b ON b.book_id = ol.book_id
-            WHERE ol.game_id = %s AND ol.market = %s
-        )
-        SELECT
-            book_name,
-            side,
-            line_value,
-            price_american,
-            pulled_at_utc
-        FROM latest_odds
-        WHERE rn = 1
-        ORDER BY book_name, side;
-    """, (game_id, market))
+                book_name,
+                side,
+                line_value,
+                price_american,
+                pulled_at_utc
+            FROM latest_odds
+            WHERE rn = 1
+            ORDER BY book_name, side;
+        """, (game_id, market))
     
-    rows = cur.fetchall()
-    cur.close()
-    conn.close()
+        rows = cur.fetchall()
+        cur.close()
+    finally:
+        release_connection(conn)
     
     # Find best lines
     comparison = {
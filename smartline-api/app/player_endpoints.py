@@ -6,26 +6,14 @@ Add these to your main.py FastAPI application
 
 from fastapi import APIRouter, HTTPException, Query
 from typing import Optional, List
-import psycopg2
-from psycopg2.extras import RealDictCursor
-import os
-
-# Database connection helper
-def get_conn():
-    return psycopg2.connect(
-        host=os.environ["PGHOST"],
-        dbname=os.environ["PGDATABASE"],
-        user=os.environ["PGUSER"],
-        password=os.environ["PGPASSWORD"],
-        port=os.environ.get("PGPORT", 5432)
-    )
+from app.database import get_connection, release_connection
 
 # Create router
 router = APIRouter(prefix="/players", tags=["players"])
 
 
 @router.get("/search")
-async def search_players(
+def search_players(
     q: str = Query(..., min_length=1, description="Search query"),
     limit: int = Query(10, ge=1, le=50, description="Maximum results")
 ):
@@ -37,9 +25,9 @@ async def search_players(
     
     Example: GET /players/search?q=mahomes&limit=10
     """
+    conn = get_connection()
     try:
-        conn = get_conn()
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
+        cursor = conn.cursor()
         
         # Search query - case-insensitive partial match
         query = """
@@ -70,7 +58,6 @@ async def search_players(
         results = cursor.fetchall()
         
         cursor.close()
-        conn.close()
         
         return {
             "query": q,
@@ -80,10 +67,12 @@ async def search_players(
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Search failed: {str(e)}")
+    finally:
+        release_connection(conn)
 
 
 @router.get("/{player_id}")
-async def get_player_detail(player_id: int):
+def get_player_detail(player_id: int):
     """
     Get detailed information about a specific player
     
@@ -91,9 +80,9 @@ async def get_player_detail(player_id: int):
     
     Example: GET /players/123
     """
+    conn = get_connection()
     try:
-        conn = get_conn()
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
+        cursor = conn.cursor()
         
         query = """
             SELECT 
@@ -125,7 +114,6 @@ async def get_player_detail(player_id: int):
         player = cursor.fetchone()
         
         cursor.close()
-        conn.close()
         
         if not player:
             raise HTTPException(status_code=404, detail="Player not found")
@@ -136,10 +124,12 @@ async def get_player_detail(player_id: int):
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch player: {str(e)}")
+    finally:
+        release_connection(conn)
 
 
 @router.get("/")
-async def list_players(
+def list_players(
     team_id: Optional[int] = Query(None, description="Filter by team ID"),
     position: Optional[str] = Query(None, description="Filter by position"),
     page: int = Query(1, ge=1, description="Page number"),
@@ -155,9 +145,9 @@ async def list_players(
     - GET /players?team_id=5&page=1
     - GET /players?position=QB
     """
+    conn = get_connection()
     try:
-        conn = get_conn()
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
+        cursor = conn.cursor()
         
         # Build WHERE clause
         where_conditions = []
@@ -209,7 +199,6 @@ async def list_players(
         players = cursor.fetchall()
         
         cursor.close()
-        conn.close()
         
         return {
             "total": total,
@@ -221,10 +210,12 @@ async def list_players(
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to list players: {str(e)}")
+    finally:
+        release_connection(conn)
 
 
 @router.get("/stats/summary")
-async def get_player_stats_summary():
+def get_player_stats_summary():
     """
     Get summary statistics about players
     
@@ -232,9 +223,9 @@ async def get_player_stats_summary():
     
     Example: GET /players/stats/summary
     """
+    conn = get_connection()
     try:
-        conn = get_conn()
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
+        cursor = conn.cursor()
         
         # Total players
         cursor.execute("SELECT COUNT(*) as total FROM player")
@@ -273,7 +264,6 @@ async def get_player_stats_summary():
         team_assignment = cursor.fetchone()
         
         cursor.close()
-        conn.close()
         
         return {
             "total_players": total_players,
@@ -283,4 +273,6 @@ async def get_player_stats_summary():
         }
         
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to get stats: {str(e)}")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"Failed to get stats: {str(e)}")
+    finally:
+        release_connection(conn)
@@ -23,8 +23,7 @@ from typing import Optional, List, Literal
 from pydantic import BaseModel, Field
 from datetime import datetime
 from enum import Enum
-import psycopg2
-from psycopg2.extras import RealDictCursor
+from app.database import get_connection, release_connection
 
 # Initialize router
 router = APIRouter(prefix="/player-odds", tags=["Player Odds"])
@@ -194,27 +193,19 @@ class GamePropsAvailability(BaseModel):
 # =========================================================
 
 def get_db():
-    """Database connection dependency."""
-    import os
-    conn = psycopg2.connect(
-        host=os.environ["PGHOST"],
-        dbname=os.environ["PGDATABASE"],
-        user=os.environ["PGUSER"],
-        password=os.environ["PGPASSWORD"],
-        port=os.environ.get("PGPORT", 5432),
-        cursor_factory=RealDictCursor
-    )
+    """Database connection dependency (borrowed from the shared pool)."""
+    conn = get_connection()
     try:
         yield conn
     finally:
-        conn.close()
+        release_connection(conn)
 
 # =========================================================
 # ENDPOINT 1: GET PROPS FOR A GAME
 # =========================================================
 
 @router.get("/game/{game_id}", response_model=List[PlayerOddsDetailed])
-async def get_game_player_odds(
+def get_game_player_odds(
     game_id: int,
     market_key: Optional[MarketKey] = None,
     player_id: Optional[int] = None,
@@ -281,7 +272,7 @@ async def get_game_player_odds(
 # =========================================================
 
 @router.get("/player/{player_id}/history", response_model=List[PlayerPropHistory])
-async def get_player_prop_history(
+def get_player_prop_history(
     player_id: int,
     season_year: int,
     market_key: Optional[MarketKey] = None,
@@ -332,7 +323,7 @@ async def get_player_prop_history(
 # =========================================================
 
 @router.get("/player/{player_id}/record", response_model=List[OverUnderRecord])
-async def get_player_over_under_record(
+def get_player_over_under_record(
     player_id: int,
     season_year: Optional[int] = None,
     market_key: Optional[MarketKey] = None,
@@ -387,7 +378,7 @@ async def get_player_over_under_record(
 # =========================================================
 
 @router.get("/best-odds", response_model=List[BestOdds])
-async def get_best_odds(
+def get_best_odds(
     game_id: Optional[int] = None,
     player_id: Optional[int] = None,
     market_key: Optional[MarketKey] = None,
@@ -463,7 +454,7 @@ async def get_best_odds(
 # =========================================================
 
 @router.get("/consensus", response_model=List[ConsensusOdds])
-async def get_consensus_odds(
+def get_consensus_odds(
     game_id: Optional[int] = None,
     player_id: Optional[int] = None,
     market_key: Optional[MarketKey] = None,
@@ -537,7 +528,7 @@ async def get_consensus_odds(
 # =========================================================
 
 @router.get("/sharp-movement", response_model=List[SharpMovement])
-async def get_sharp_line_movement(
+def get_sharp_line_movement(
     game_id: Optional[int] = None,
     movement_magnitude: Optional[Literal["major", "significant", "moderate", "minor"]] = None,
     season_year: Optional[int] = None,
@@ -619,7 +610,7 @@ async def get_sharp_line_movement(
 # =========================================================
 
 @router.get("/bookmakers", response_model=List[BookmakerComparison])
-async def get_bookmaker_comparison(
+def get_bookmaker_comparison(
     season_year: int,
     market_key: Optional[MarketKey] = None,
     min_best_odds_pct: float = Query(default=0, ge=0, le=100),
@@ -671,7 +662,7 @@ async def get_bookmaker_comparison(
 # =========================================================
 
 @router.get("/streaks", response_model=List[PlayerStreak])
-async def get_player_streaks(
+def get_player_streaks(
     season_year: int,
     streak_type: Optional[Literal["over", "under", "push"]] = None,
     min_streak_length: int = Query(default=3, ge=1),
@@ -727,7 +718,7 @@ async def get_player_streaks(
 # =========================================================
 
 @router.get("/home-away-splits", response_model=List[HomeAwaySplit])
-async def get_home_away_splits(
+def get_home_away_splits(
     season_year: int,
     player_id: Optional[int] = None,
     market_key: Optional[MarketKey] = None,
@@ -782,7 +773,7 @@ async def get_home_away_splits(
 # =========================================================
 
 @router.get("/games", response_model=List[GamePropsAvailability])
-async def get_games_with_props(
+def get_games_with_props(
     season_year: int,
     week: Optional[int] = None,
     min_players: int = Query(default=10, ge=0),
@@ -856,7 +847,7 @@ class PlayerAnalysis(BaseModel):
     recent_games: Optional[List[PlayerPropHistory]]
 
 @router.get("/player/{player_id}/analysis", response_model=PlayerAnalysis)
-async def get_player_complete_analysis(
+def get_player_complete_analysis(
     player_id: int,
     season_year: int,
     market_key: MarketKey,
@@ -16,21 +16,8 @@ Date: 2024-12-22
 
 from fastapi import APIRouter, HTTPException, Query
 from typing import Optional, List
-import psycopg2
-from psycopg2.extras import RealDictCursor
-import os
+from app.database import get_connection, release_connection
 
-# Database connection helper
-def get_conn():
-    return psycopg2.connect(
-        host=os.environ["PGHOST"],
-        dbname=os.environ["PGDATABASE"],
-        user=os.environ["PGUSER"],
-        password=os.environ["PGPASSWORD"],
-        port=os.environ.get("PGPORT", 5432),
-        cursor_factory=RealDictCursor
-    )
-    
 router = APIRouter(prefix="/statistics", tags=["Player Statistics"])
 
 
@@ -39,7 +26,7 @@ router = APIRouter(prefix="/statistics", tags=["Player Statistics"])
 # =========================================================
 
 @router.get("/players/{player_id}/statistics")
-async def get_player_all_statistics(
+def get_player_all_statistics(
     player_id: int,
     season: Optional[int] = None
 ):
@@ -75,7 +62,7 @@ async def get_player_all_statistics(
     - With season: GET /statistics/players/123/statistics?season=2023
       Returns only 2023 season
     """
-    conn = get_conn()
+    conn = get_connection()
     
     try:
         with conn.cursor() as cur:
@@ -156,11 +143,11 @@ async def get_player_all_statistics(
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch statistics: {e}")
     finally:
-        conn.close()
+        release_connection(conn)
 
 
 @router.get("/leaders/{stat_group}/{metric_name}")
-async def get_statistical_leaders(
+def get_statistical_leaders(
     stat_group: str,
     metric_name: str,
     season: int = Query(..., description="Season year"),
@@ -171,7 +158,7 @@ async def get_statistical_leaders(
     
     Example: /leaders/Passing/yards?season=2023&limit=10
     """
-    conn = get_conn()
+    conn = get_connection()
     
     try:
         with conn.cursor() as cur:
@@ -223,11 +210,11 @@ async def get_statistical_leaders(
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch leaders: {e}")
     finally:
-        conn.close()
+        release_connection(conn)
 
 
 @router.get("/compare")
-async def compare_players(
+def compare_players(
     player_ids: str = Query(..., description="Comma-separated player IDs"),
     season: int = Query(..., description="Season year"),
     stat_group: Optional[str] = Query(None, description="Optional stat group filter")
@@ -243,7 +230,7 @@ async def compare_players(
     if len(player_id_list) > 10:
         raise HTTPException(status_code=400, detail="Maximum 10 players allowed")
     
-    conn = get_conn()
+    conn = get_connection()
     
     try:
         with conn.cursor() as cur:
@@ -311,13 +298,13 @@ async def compare_players(
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to compare players: {e}")
     finally:
-        conn.close()
+        release_connection(conn)
 
 
 @router.get("/season-summary/{season}")
-async def get_season_summary(season: int):
+def get_season_summary(season: int):
     """Get summary statistics for a season using the materialized view"""
-    conn = get_conn()
+    conn = get_connection()
     
     try:
         with conn.cursor() as cur:
@@ -343,4 +330,4 @@ async def get_season_summary(season: int):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch season summary: {e}")
     finally:
-        conn.close()
\ No newline at end of file
+        release_connection(conn)
\ No newline at end of file
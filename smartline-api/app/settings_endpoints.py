@@ -13,8 +13,7 @@ from fastapi import APIRouter, HTTPException, Query, Depends
 from typing import Optional
 from pydantic import BaseModel, Field
 from decimal import Decimal
-import psycopg2
-from psycopg2.extras import RealDictCursor
+from app.database import get_connection, release_connection
 
 # This can be added to bankroll_endpoints.py or kept separate
 # For now, showing as separate for clarity
@@ -75,20 +74,12 @@ class SettingsUpdate(BaseModel):
 # =========================================================
 
 def get_db():
-    """Database connection dependency."""
-    import os
-    conn = psycopg2.connect(
-        host=os.environ["PGHOST"],
-        dbname=os.environ["PGDATABASE"],
-        user=os.environ["PGUSER"],
-        password=os.environ["PGPASSWORD"],
-        port=os.environ.get("PGPORT", 5432),
-        cursor_factory=RealDictCursor
-    )
+    """Database connection dependency (borrowed from the shared pool)."""
+    conn = get_connection()
     try:
         yield conn
     finally:
-        conn.close()
+        release_connection(conn)
 
 # =========================================================
 # SETTINGS ENDPOINTS
@@ -122,7 +113,7 @@ def create_default_settings(user_id: int, conn):
 
 # Add this to your router:
 @router.get("/settings")
-async def get_settings(
+def get_settings(
     user_id: int = Query(default=1),
     conn = Depends(get_db)
 ):
@@ -149,7 +140,7 @@ async def get_settings(
     return settings
 
 @router.put("/settings")
-async def update_settings(
+def update_settings(
     settings_update: SettingsUpdate,
     user_id: int = Query(default=1),
     conn = Depends(get_db)
@@ -215,7 +206,7 @@ async def update_settings(
         raise HTTPException(status_code=500, detail=f"Failed to update settings: {str(e)}")
 
 @router.post("/settings/reset")
-async def reset_settings(
+def reset_settings(
     user_id: int = Query(default=1),
     conn = Depends(get_db)
 ):
@@ -256,7 +247,7 @@ async def reset_settings(
 
 """
 @router.get("/settings/check-limits")
-async def check_betting_limits(
+def check_betting_limits(
     stake_amount: Decimal,
     user_id: int = Query(default=1),
     conn = Depends(get_db)
@@ -356,7 +347,7 @@ async def check_betting_limits(
     }
 
 @router.get("/settings/recommended-unit")
-async def get_recommended_unit(
+def get_recommended_unit(
     user_id: int = Query(default=1),
     conn = Depends(get_db)
 ):
@@ -6,26 +6,14 @@ Add these to your main.py FastAPI application
 
 from fastapi import APIRouter, HTTPException, Query
 from typing import Optional
-import psycopg2
-from psycopg2.extras import RealDictCursor
-import os
-
-# Database connection helper
-def get_conn():
-    return psycopg2.connect(
-        host=os.environ["PGHOST"],
-        dbname=os.environ["PGDATABASE"],
-        user=os.environ["PGUSER"],
-        password=os.environ["PGPASSWORD"],
-        port=os.environ.get("PGPORT", 5432)
-    )
+from app.database import get_connection, release_connection
 
 # Create router
 router = APIRouter(prefix="/teams", tags=["teams"])
 
 
 @router.get("/search")
-async def search_teams(
+def search_teams(
     q: str = Query(..., min_length=1, description="Search query"),
     limit: int = Query(10, ge=1, le=50, description="Maximum results")
 ):
@@ -37,9 +25,9 @@ async def search_teams(
     
     Example: GET /teams/search?q=chiefs&limit=10
     """
+    conn = get_connection()
     try:
-        conn = get_conn()
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
+        cursor = conn.cursor()
         
         # Search query - case-insensitive partial match on name or abbrev
         query = """
@@ -74,7 +62,6 @@ async def search_teams(
         results = cursor.fetchall()
         
         cursor.close()
-        conn.close()
         
         return {
             "query": q,
@@ -84,10 +71,12 @@ async def search_teams(
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Search failed: {str(e)}")
+    finally:
+        release_connection(conn)
 
 
 @router.get("/{team_id}")
-async def get_team_detail(team_id: int):
+def get_team_detail(team_id: int):
     """
     Get detailed information about a specific team
     
@@ -95,9 +84,9 @@ async def get_team_detail(team_id: int):
     
     Example: GET /teams/17
     """
+    conn = get_connection()
     try:
-        conn = get_conn()
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
+        cursor = conn.cursor()
         
         query = """
             SELECT 
@@ -130,7 +119,6 @@ async def get_team_detail(team_id: int):
         team = cursor.fetchone()
         
         cursor.close()
-        conn.close()
         
         if not team:
             raise HTTPException(status_code=404, detail="Team not found")
@@ -141,10 +129,12 @@ async def get_team_detail(team_id: int):
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch team: {str(e)}")
+    finally:
+        release_connection(conn)
 
 
 @router.get("/{team_id}/roster")
-async def get_team_roster(team_id: int):
+def get_team_roster(team_id: int):
     """
     Get roster for a specific team
     
@@ -152,9 +142,9 @@ async def get_team_roster(team_id: int):
     
     Example: GET /teams/17/roster
     """
+    conn = get_connection()
     try:
-        conn = get_conn()
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
+        cursor = conn.cursor()
         
         # First verify team exists
         cursor.execute("SELECT team_id, name FROM team WHERE team_id = %s", (team_id,))
@@ -194,7 +184,6 @@ async def get_team_roster(team_id: int):
         players = cursor.fetchall()
         
         cursor.close()
-        conn.close()
         
         return {
             "team_id": team_id,
@@ -207,10 +196,12 @@ async def get_team_roster(team_id: int):
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch roster: {str(e)}")
+    finally:
+        release_connection(conn)
 
 
 @router.get("/{team_id}/games")
-async def get_team_games(
+def get_team_games(
     team_id: int,
     season: Optional[int] = Query(None, description="Filter by season year"),
     limit: int = Query(10, ge=1, le=100, description="Maximum games to return")
@@ -222,9 +213,9 @@ async def get_team_games(
     
     Example: GET /teams/17/games?season=2023&limit=10
     """
+    conn = get_connection()
     try:
-        conn = get_conn()
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
+        cursor = conn.cursor()
         
         # Verify team exists
         cursor.execute("SELECT team_id, name FROM team WHERE team_id = %s", (team_id,))
@@ -277,7 +268,6 @@ async def get_team_games(
         games = cursor.fetchall()
         
         cursor.close()
-        conn.close()
         
         return {
             "team_id": team_id,
@@ -290,10 +280,12 @@ async def get_team_games(
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch games: {str(e)}")
+    finally:
+        release_connection(conn)
 
 
 @router.get("/")
-async def list_teams(
+def list_teams(
     page: int = Query(1, ge=1, description="Page number"),
     limit: int = Query(32, ge=1, le=100, description="Results per page")
 ):
@@ -304,9 +296,9 @@ async def list_teams(
     
     Example: GET /teams?page=1&limit=32
     """
+    conn = get_connection()
     try:
-        conn = get_conn()
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
+        cursor = conn.cursor()
         
         # Count total
         cursor.execute("SELECT COUNT(*) as total FROM team")
@@ -335,7 +327,6 @@ async def list_teams(
         teams = cursor.fetchall()
         
         cursor.close()
-        conn.close()
         
         return {
             "total": total,
@@ -347,6 +338,8 @@ async def list_teams(
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to list teams: {str(e)}")
+    finally:
+        release_connection(conn)
 
 
 # Integration instructions for main.py:
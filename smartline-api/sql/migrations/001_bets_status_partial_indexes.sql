@@ -0,0 +1,22 @@
+--
+-- Partial indexes for the bankroll analytics queries
+--
+-- The analytics endpoints aggregate a user's bets over a placed_at window with
+-- FILTER (WHERE status IN ('won', 'lost', 'push')) / status = 'pending'.
+-- These indexes cover the settled subset (with the aggregated columns
+-- INCLUDEd for index-only scans) and the small pending subset.
+--
+-- Run outside a transaction block (CONCURRENTLY). Verify with:
+--   EXPLAIN (ANALYZE, BUFFERS) <market-deep-dive query>
+--
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_bets_settled_won_lost
+    ON public.bets USING btree (user_id, placed_at DESC)
+    INCLUDE (profit_loss, stake_amount, market_key)
+    WHERE status IN ('won', 'lost', 'push');
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_bets_user_pending
+    ON public.bets USING btree (user_id)
+    WHERE status = 'pending';
+
+ANALYZE public.bets;
@@ -0,0 +1,20 @@
+--
+-- Indexes for the export endpoints' dynamic WHERE on bets
+--
+-- /bankroll/export/csv and /summary filter on user_id plus
+-- DATE(placed_at) ranges, status and market_key. DATE() on a plain
+-- timestamp column is immutable, so an expression index keeps those
+-- predicates sargable; keep the query text as DATE(b.placed_at).
+--
+-- Run outside a transaction block (CONCURRENTLY).
+--
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS bets_user_day_idx
+    ON public.bets USING btree (user_id, DATE(placed_at) DESC)
+    INCLUDE (status, market_key, profit_loss, stake_amount);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS bets_user_status_idx
+    ON public.bets USING btree (user_id, status)
+    INCLUDE (profit_loss, stake_amount);
+
+ANALYZE public.bets;
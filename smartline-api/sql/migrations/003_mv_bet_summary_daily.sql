@@ -0,0 +1,32 @@
+--
+-- Daily bet roll-up backing /bankroll/export/summary and /pdf-report
+--
+-- One row per (user, day, account, market, status). The summary endpoint
+-- aggregates over days instead of individual bets. The unique index
+-- (NULLS NOT DISTINCT, PG15+) is required for REFRESH ... CONCURRENTLY.
+--
+
+CREATE MATERIALIZED VIEW IF NOT EXISTS public.mv_bet_summary_daily AS
+SELECT
+    user_id,
+    DATE(placed_at) AS day,
+    account_id,
+    market_key,
+    status,
+    COUNT(*) AS n,
+    COALESCE(SUM(stake_amount), 0) AS stake_sum,
+    COALESCE(SUM(profit_loss), 0) AS pl_sum
+FROM public.bets
+GROUP BY user_id, DATE(placed_at), account_id, market_key, status;
+
+CREATE UNIQUE INDEX IF NOT EXISTS mv_bet_summary_daily_key
+    ON public.mv_bet_summary_daily
+    USING btree (user_id, day, account_id, market_key, status)
+    NULLS NOT DISTINCT;
+
+-- Refresh every minute (requires the pg_cron extension)
+SELECT cron.schedule(
+    'refresh_mv_bet_summary_daily',
+    '* * * * *',
+    'REFRESH MATERIALIZED VIEW CONCURRENTLY public.mv_bet_summary_daily'
+);
@@ -0,0 +1,74 @@
+--
+-- Lookup table backing /bankroll/export/filter-options
+--
+-- Keeps the distinct bookmakers, markets and sports per user so the
+-- endpoint reads a few dozen rows instead of running DISTINCT over bets.
+-- Values are only ever added; a value whose last bet is deleted remains
+-- listed (filtering on it just returns no rows).
+--
+
+CREATE TABLE IF NOT EXISTS public.bet_filter_values (
+    user_id integer NOT NULL,
+    kind text NOT NULL,
+    value text NOT NULL,
+    PRIMARY KEY (user_id, kind, value)
+);
+
+CREATE OR REPLACE FUNCTION public.add_bet_filter_values() RETURNS trigger
+    LANGUAGE plpgsql
+    AS $$
+BEGIN
+    IF NEW.market_key IS NOT NULL THEN
+        INSERT INTO public.bet_filter_values (user_id, kind, value)
+        VALUES (NEW.user_id, 'market', NEW.market_key)
+        ON CONFLICT DO NOTHING;
+    END IF;
+
+    IF NEW.sport IS NOT NULL THEN
+        INSERT INTO public.bet_filter_values (user_id, kind, value)
+        VALUES (NEW.user_id, 'sport', NEW.sport)
+        ON CONFLICT DO NOTHING;
+    END IF;
+
+    RETURN NULL;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION public.add_bookmaker_filter_value() RETURNS trigger
+    LANGUAGE plpgsql
+    AS $$
+BEGIN
+    IF NEW.bookmaker_name IS NOT NULL THEN
+        INSERT INTO public.bet_filter_values (user_id, kind, value)
+        VALUES (NEW.user_id, 'bookmaker', NEW.bookmaker_name)
+        ON CONFLICT DO NOTHING;
+    END IF;
+
+    RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS bets_filter_values_trigger ON public.bets;
+CREATE TRIGGER bets_filter_values_trigger
+    AFTER INSERT OR UPDATE OF market_key, sport ON public.bets
+    FOR EACH ROW EXECUTE FUNCTION public.add_bet_filter_values();
+
+DROP TRIGGER IF EXISTS bankroll_accounts_filter_values_trigger ON public.bankroll_accounts;
+CREATE TRIGGER bankroll_accounts_filter_values_trigger
+    AFTER INSERT OR UPDATE OF bookmaker_name ON public.bankroll_accounts
+    FOR EACH ROW EXECUTE FUNCTION public.add_bookmaker_filter_value();
+
+-- Backfill from existing rows
+INSERT INTO public.bet_filter_values (user_id, kind, value)
+SELECT DISTINCT user_id, 'bookmaker', bookmaker_name
+FROM public.bankroll_accounts
+WHERE bookmaker_name IS NOT NULL
+UNION
+SELECT DISTINCT user_id, 'market', market_key
+FROM public.bets
+WHERE market_key IS NOT NULL
+UNION
+SELECT DISTINCT user_id, 'sport', sport
+FROM public.bets
+WHERE sport IS NOT NULL
+ON CONFLICT DO NOTHING;
@@ -0,0 +1,8 @@
+--
+-- Statement statistics for /debug/slow
+--
+-- pg_stat_statements must also be listed in shared_preload_libraries
+-- (enabled by default on Supabase).
+--
+
+CREATE EXTENSION IF NOT EXISTS pg_stat_statements;
@@ -0,0 +1,26 @@
+--
+-- Composite (user_id, placed_at) indexes on bets
+--
+-- bets_user_placed_idx serves the bankroll analytics windows
+-- (b.user_id = %s AND b.placed_at >= %s, see window_start()) and the
+-- ORDER BY placed_at DESC of the CSV/Excel exports; the INCLUDE list covers
+-- the columns those aggregates read, so they can run as index-only scans.
+--
+-- bets_user_status_placed_idx serves the status-filtered exports and the
+-- pending/settled lookups that add a placed_at range. It has
+-- bets_user_status_idx (002) as a prefix, so that one is dropped.
+--
+-- Run outside a transaction block (CONCURRENTLY).
+--
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS bets_user_placed_idx
+    ON public.bets USING btree (user_id, placed_at DESC)
+    INCLUDE (status, stake_amount, profit_loss, actual_payout, market_key, sport, account_id);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS bets_user_status_placed_idx
+    ON public.bets USING btree (user_id, status, placed_at)
+    INCLUDE (profit_loss, stake_amount);
+
+DROP INDEX CONCURRENTLY IF EXISTS public.bets_user_status_idx;
+
+ANALYZE public.bets;
@@ -0,0 +1,62 @@
+--
+-- Denormalised bookmaker_name on bets
+--
+-- The export queries joined bankroll_accounts only to read bookmaker_name.
+-- bets.bookmaker_name is kept in sync by triggers: set from the account on
+-- insert / account change, and rewritten when an account is renamed.
+-- mv_bet_summary_daily (003) is still keyed by account_id and joins
+-- bankroll_accounts over its much smaller row count.
+--
+-- The index is built CONCURRENTLY: run that statement outside a
+-- transaction block.
+--
+
+ALTER TABLE public.bets ADD COLUMN IF NOT EXISTS bookmaker_name text;
+
+CREATE OR REPLACE FUNCTION public.set_bet_bookmaker_name() RETURNS trigger
+    LANGUAGE plpgsql
+    AS $$
+BEGIN
+    SELECT bookmaker_name INTO NEW.bookmaker_name
+    FROM public.bankroll_accounts
+    WHERE account_id = NEW.account_id;
+
+    RETURN NEW;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION public.sync_bets_bookmaker_name() RETURNS trigger
+    LANGUAGE plpgsql
+    AS $$
+BEGIN
+    UPDATE public.bets
+    SET bookmaker_name = NEW.bookmaker_name
+    WHERE account_id = NEW.account_id;
+
+    RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS bets_bookmaker_name_trigger ON public.bets;
+CREATE TRIGGER bets_bookmaker_name_trigger
+    BEFORE INSERT OR UPDATE OF account_id ON public.bets
+    FOR EACH ROW EXECUTE FUNCTION public.set_bet_bookmaker_name();
+
+DROP TRIGGER IF EXISTS bankroll_accounts_bets_bookmaker_trigger ON public.bankroll_accounts;
+CREATE TRIGGER bankroll_accounts_bets_bookmaker_trigger
+    AFTER UPDATE OF bookmaker_name ON public.bankroll_accounts
+    FOR EACH ROW
+    WHEN (OLD.bookmaker_name IS DISTINCT FROM NEW.bookmaker_name)
+    EXECUTE FUNCTION public.sync_bets_bookmaker_name();
+
+-- Backfill from existing rows
+UPDATE public.bets b
+SET bookmaker_name = ba.bookmaker_name
+FROM public.bankroll_accounts ba
+WHERE b.account_id = ba.account_id
+AND b.bookmaker_name IS DISTINCT FROM ba.bookmaker_name;
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS bets_user_bookmaker_placed_idx
+    ON public.bets USING btree (user_id, bookmaker_name, placed_at DESC);
+
+ANALYZE public.bets;
@@ -0,0 +1,22 @@
+--
+-- Generated status flags on bets
+--
+-- The export aggregates (Excel by bookmaker / by market, tax report) read
+-- is_won / is_lost / is_settled in their FILTER clauses instead of
+-- comparing the status text on every row.
+--
+-- Adding STORED generated columns rewrites the table under an ACCESS
+-- EXCLUSIVE lock: run in a maintenance window. No new index: the settled
+-- subset is already covered by idx_bets_settled_won_lost (001), and these
+-- columns are only read inside aggregates, never in a WHERE clause.
+--
+
+ALTER TABLE public.bets
+    ADD COLUMN IF NOT EXISTS is_won boolean
+        GENERATED ALWAYS AS (status = 'won') STORED,
+    ADD COLUMN IF NOT EXISTS is_lost boolean
+        GENERATED ALWAYS AS (status = 'lost') STORED,
+    ADD COLUMN IF NOT EXISTS is_settled boolean
+        GENERATED ALWAYS AS (status IN ('won', 'lost', 'push')) STORED;
+
+ANALYZE public.bets;
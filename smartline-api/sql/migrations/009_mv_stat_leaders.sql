@@ -0,0 +1,51 @@
+--
+-- Per-game stat leaderboard backing /statistics/players/leaders
+--
+-- One row per numeric game_player_statistics value, with the player, team,
+-- game and season columns the endpoint returns already joined in, and the
+-- text metric_value parsed once into metric_numeric. The endpoint reads a
+-- top-N off the (stat_group, metric_name[, season], metric_numeric DESC)
+-- indexes. The unique index on stat_id is required for REFRESH ...
+-- CONCURRENTLY.
+--
+
+CREATE MATERIALIZED VIEW IF NOT EXISTS public.mv_stat_leaders AS
+SELECT
+    gps.stat_id,
+    s.year AS season,
+    gps.stat_group,
+    gps.metric_name,
+    gps.player_id,
+    p.full_name AS player_name,
+    p.position,
+    t.name AS team_name,
+    t.abbrev AS team_abbrev,
+    gps.game_id,
+    g.week,
+    g.game_datetime_utc AS game_date,
+    gps.metric_value,
+    gps.metric_value::numeric AS metric_numeric
+FROM public.game_player_statistics gps
+JOIN public.player p ON gps.player_id = p.player_id
+JOIN public.team t ON gps.team_id = t.team_id
+JOIN public.game g ON gps.game_id = g.game_id
+JOIN public.season s ON g.season_id = s.season_id
+WHERE gps.metric_value ~ '^[0-9]+(\.[0-9]+)?$';
+
+CREATE UNIQUE INDEX IF NOT EXISTS mv_stat_leaders_key
+    ON public.mv_stat_leaders USING btree (stat_id);
+
+CREATE INDEX IF NOT EXISTS mv_stat_leaders_metric_idx
+    ON public.mv_stat_leaders
+    USING btree (stat_group, metric_name, metric_numeric DESC);
+
+CREATE INDEX IF NOT EXISTS mv_stat_leaders_season_metric_idx
+    ON public.mv_stat_leaders
+    USING btree (season, stat_group, metric_name, metric_numeric DESC);
+
+-- Stats are ingested after games finish; refresh hourly (requires pg_cron)
+SELECT cron.schedule(
+    'refresh_mv_stat_leaders',
+    '17 * * * *',
+    'REFRESH MATERIALIZED VIEW CONCURRENTLY public.mv_stat_leaders'
+);
@@ -0,0 +1,75 @@
+--
+-- Denormalised game columns on game_player_statistics
+--
+-- The player statistics endpoints joined game and season only to filter on
+-- the season year and to order by kickoff. game_player_statistics now
+-- carries season_year and game_datetime_utc, kept in sync by triggers:
+-- set from the game on insert / game change, and rewritten when a game is
+-- rescheduled or moved to another season.
+--
+-- The index is built CONCURRENTLY: run that statement outside a
+-- transaction block.
+--
+
+ALTER TABLE public.game_player_statistics
+    ADD COLUMN IF NOT EXISTS season_year integer,
+    ADD COLUMN IF NOT EXISTS game_datetime_utc timestamp with time zone;
+
+CREATE OR REPLACE FUNCTION public.set_gps_game_columns() RETURNS trigger
+    LANGUAGE plpgsql
+    AS $$
+BEGIN
+    SELECT s.year, g.game_datetime_utc
+    INTO NEW.season_year, NEW.game_datetime_utc
+    FROM public.game g
+    JOIN public.season s ON g.season_id = s.season_id
+    WHERE g.game_id = NEW.game_id;
+
+    RETURN NEW;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION public.sync_gps_game_columns() RETURNS trigger
+    LANGUAGE plpgsql
+    AS $$
+BEGIN
+    UPDATE public.game_player_statistics gps
+    SET season_year = s.year,
+        game_datetime_utc = NEW.game_datetime_utc
+    FROM public.season s
+    WHERE gps.game_id = NEW.game_id
+    AND s.season_id = NEW.season_id;
+
+    RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS gps_game_columns_trigger ON public.game_player_statistics;
+CREATE TRIGGER gps_game_columns_trigger
+    BEFORE INSERT OR UPDATE OF game_id ON public.game_player_statistics
+    FOR EACH ROW EXECUTE FUNCTION public.set_gps_game_columns();
+
+DROP TRIGGER IF EXISTS game_gps_columns_trigger ON public.game;
+CREATE TRIGGER game_gps_columns_trigger
+    AFTER UPDATE OF game_datetime_utc, season_id ON public.game
+    FOR EACH ROW
+    WHEN (OLD.game_datetime_utc IS DISTINCT FROM NEW.game_datetime_utc
+          OR OLD.season_id IS DISTINCT FROM NEW.season_id)
+    EXECUTE FUNCTION public.sync_gps_game_columns();
+
+-- Backfill from existing rows
+UPDATE public.game_player_statistics gps
+SET season_year = s.year,
+    game_datetime_utc = g.game_datetime_utc
+FROM public.game g
+JOIN public.season s ON g.season_id = s.season_id
+WHERE gps.game_id = g.game_id
+AND (gps.season_year IS DISTINCT FROM s.year
+     OR gps.game_datetime_utc IS DISTINCT FROM g.game_datetime_utc);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS gps_player_game_datetime_idx
+    ON public.game_player_statistics
+    USING btree (player_id, game_datetime_utc DESC)
+    INCLUDE (season_year, stat_group);
+
+ANALYZE public.game_player_statistics;
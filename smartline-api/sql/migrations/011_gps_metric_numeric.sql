@@ -0,0 +1,56 @@
+--
+-- Numeric metric values on game_player_statistics
+--
+-- metric_value is text (ratios like '6/12' share the column), so every
+-- numeric read re-ran a regex and a cast. metric_numeric parses plain
+-- numbers once, on write; it is NULL for anything else.
+--
+-- mv_stat_leaders (009) is rebuilt on top of it. The leaders top-N is
+-- served by that view's indexes, so no leaderboard index is added on the
+-- base table. Adding a STORED generated column rewrites the table under
+-- an ACCESS EXCLUSIVE lock: run in a maintenance window.
+--
+
+ALTER TABLE public.game_player_statistics
+    ADD COLUMN IF NOT EXISTS metric_numeric double precision
+        GENERATED ALWAYS AS (
+            CASE
+                WHEN metric_value ~ '^-?[0-9]+(\.[0-9]+)?$'
+                THEN metric_value::double precision
+            END
+        ) STORED;
+
+DROP MATERIALIZED VIEW IF EXISTS public.mv_stat_leaders;
+
+CREATE MATERIALIZED VIEW public.mv_stat_leaders AS
+SELECT
+    gps.stat_id,
+    gps.season_year AS season,
+    gps.stat_group,
+    gps.metric_name,
+    gps.player_id,
+    p.full_name AS player_name,
+    p.position,
+    t.name AS team_name,
+    t.abbrev AS team_abbrev,
+    gps.game_id,
+    g.week,
+    gps.game_datetime_utc AS game_date,
+    gps.metric_value,
+    gps.metric_numeric
+FROM public.game_player_statistics gps
+JOIN public.player p ON gps.player_id = p.player_id
+JOIN public.team t ON gps.team_id = t.team_id
+JOIN public.game g ON gps.game_id = g.game_id
+WHERE gps.metric_numeric IS NOT NULL;
+
+CREATE UNIQUE INDEX IF NOT EXISTS mv_stat_leaders_key
+    ON public.mv_stat_leaders USING btree (stat_id);
+
+CREATE INDEX IF NOT EXISTS mv_stat_leaders_metric_idx
+    ON public.mv_stat_leaders
+    USING btree (stat_group, metric_name, metric_numeric DESC);
+
+CREATE INDEX IF NOT EXISTS mv_stat_leaders_season_metric_idx
+    ON public.mv_stat_leaders
+    USING btree (season, stat_group, metric_name, metric_numeric DESC);
@@ -0,0 +1,48 @@
+--
+-- Per-player season totals backing /statistics/players/{player_id}/rankings
+--
+-- One row per (player, season, stat_group, metric_name) with the text
+-- metric_value parsed and summed once per refresh instead of per request
+-- ('6/12' and '6-12' count their leading number). position is the player's
+-- current one, as the endpoint compares. The unique index is required for
+-- REFRESH ... CONCURRENTLY.
+--
+
+CREATE MATERIALIZED VIEW IF NOT EXISTS public.mv_player_season_totals AS
+SELECT
+    gps.player_id,
+    p.position,
+    gps.season_year,
+    gps.stat_group,
+    gps.metric_name,
+    SUM(
+        CASE
+            WHEN gps.metric_value ~ '^[0-9]+(\.[0-9]+)?$'
+            THEN CAST(gps.metric_value AS NUMERIC)
+            WHEN gps.metric_value ~ '^[0-9]+/'
+            THEN CAST(SPLIT_PART(gps.metric_value, '/', 1) AS NUMERIC)
+            WHEN gps.metric_value ~ '^[0-9]+-'
+            THEN CAST(SPLIT_PART(gps.metric_value, '-', 1) AS NUMERIC)
+            ELSE 0
+        END
+    ) AS total_value,
+    COUNT(DISTINCT gps.game_id) AS game_count
+FROM public.game_player_statistics gps
+JOIN public.player p ON gps.player_id = p.player_id
+WHERE gps.metric_value IS NOT NULL
+GROUP BY gps.player_id, p.position, gps.season_year, gps.stat_group, gps.metric_name;
+
+CREATE UNIQUE INDEX IF NOT EXISTS mv_player_season_totals_key
+    ON public.mv_player_season_totals
+    USING btree (player_id, season_year, stat_group, metric_name);
+
+CREATE INDEX IF NOT EXISTS mv_player_season_totals_position_idx
+    ON public.mv_player_season_totals
+    USING btree (season_year, position, stat_group, metric_name, total_value DESC);
+
+-- Same cadence as mv_stat_leaders (requires pg_cron)
+SELECT cron.schedule(
+    'refresh_mv_player_season_totals',
+    '17 * * * *',
+    'REFRESH MATERIALIZED VIEW CONCURRENTLY public.mv_player_season_totals'
+);
@@ -0,0 +1,49 @@
+--
+-- Parsed metric totals on game_player_statistics
+--
+-- metric_numeric (011) only covers plain numbers. Season totals also count
+-- the leading number of ratio values ('6/12', '6-12'), which meant a regex
+-- and SPLIT_PART per row on every refresh. metric_value_numeric stores that
+-- parse once, on write; it is NULL for anything else.
+--
+-- mv_player_season_totals (012) is rebuilt on top of it. Adding a STORED
+-- generated column rewrites the table under an ACCESS EXCLUSIVE lock: run
+-- in a maintenance window.
+--
+
+ALTER TABLE public.game_player_statistics
+    ADD COLUMN IF NOT EXISTS metric_value_numeric numeric
+        GENERATED ALWAYS AS (
+            CASE
+                WHEN metric_value ~ '^[0-9]+(\.[0-9]+)?$'
+                THEN metric_value::numeric
+                WHEN metric_value ~ '^[0-9]+/'
+                THEN SPLIT_PART(metric_value, '/', 1)::numeric
+                WHEN metric_value ~ '^[0-9]+-'
+                THEN SPLIT_PART(metric_value, '-', 1)::numeric
+            END
+        ) STORED;
+
+DROP MATERIALIZED VIEW IF EXISTS public.mv_player_season_totals;
+
+CREATE MATERIALIZED VIEW public.mv_player_season_totals AS
+SELECT
+    gps.player_id,
+    p.position,
+    gps.season_year,
+    gps.stat_group,
+    gps.metric_name,
+    COALESCE(SUM(gps.metric_value_numeric), 0) AS total_value,
+    COUNT(DISTINCT gps.game_id) AS game_count
+FROM public.game_player_statistics gps
+JOIN public.player p ON gps.player_id = p.player_id
+WHERE gps.metric_value IS NOT NULL
+GROUP BY gps.player_id, p.position, gps.season_year, gps.stat_group, gps.metric_name;
+
+CREATE UNIQUE INDEX IF NOT EXISTS mv_player_season_totals_key
+    ON public.mv_player_season_totals
+    USING btree (player_id, season_year, stat_group, metric_name);
+
+CREATE INDEX IF NOT EXISTS mv_player_season_totals_position_idx
+    ON public.mv_player_season_totals
+    USING btree (season_year, position, stat_group, metric_name, total_value DESC);